@@ -0,0 +1,60 @@
+"""
+Export time, reload time and file size of CSV vs Parquet vs Arrow IPC
+
+Usage:
+    python benchmarks/bench_export.py [--rows 500000]
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+import pandas as pd
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+
+from benchmarks.corpus import make_reviews
+from src.services.review_io import read_reviews, write_reviews
+from src.services.scraper_service import compact_review_frame
+
+
+def _timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=500000)
+    args = parser.parse_args()
+
+    reviews_df = compact_review_frame(make_reviews(args.rows))
+    reviews_df['sentiment'] = 0.0
+    analysis = {'total_reviews': len(reviews_df)}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {fmt: Path(tmp) / f'reviews.{fmt}' for fmt in ('csv', 'parquet', 'arrow')}
+        writers = {
+            'csv': lambda: paths['csv'].write_text(reviews_df.to_csv(index=False)),
+            'parquet': lambda: write_reviews(reviews_df, paths['parquet'], analysis=analysis),
+            'arrow': lambda: write_reviews(reviews_df, paths['arrow'], analysis=analysis),
+        }
+        readers = {
+            'csv': lambda: pd.read_csv(paths['csv'], parse_dates=['at']),
+            'parquet': lambda: read_reviews(paths['parquet']),
+            'arrow': lambda: read_reviews(paths['arrow']),
+        }
+
+        print(f"{'format':>8} {'rows':>8} {'export':>8} {'reload':>8} {'size MB':>8}")
+        for fmt, path in paths.items():
+            _, export_seconds = _timed(writers[fmt])
+            loaded, reload_seconds = _timed(readers[fmt])
+            assert len(loaded) == len(reviews_df)
+            size_mb = path.stat().st_size / 1024 / 1024
+            print(f"{fmt:>8} {len(loaded):>8} {export_seconds:>7.2f}s {reload_seconds:>7.2f}s {size_mb:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
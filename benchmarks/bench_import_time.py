@@ -0,0 +1,132 @@
+"""
+Cold-start import time of each entry point, checked against a stored baseline
+
+Each module is imported in fresh interpreters under ``python -X importtime``
+and the median cumulative time is compared with
+benchmarks/import_time_baseline.json. The script exits with status 1 when an
+entry point got slower than the baseline by more than the tolerance.
+
+Import times depend on the machine and its disk, so a standard-library
+reference module is timed the same way in every run, and the baseline
+stores its time from the run that recorded it. Baseline times are scaled by
+the ratio of the two reference times before comparing. Dependency versions
+are not corrected for: record a local baseline (--update-baseline) before
+relying on the comparison on a new machine.
+
+Usage:
+    python benchmarks/bench_import_time.py [--runs 5] [--tolerance 0.5] [--update-baseline]
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+root_dir = Path(__file__).resolve().parent.parent
+BASELINE_PATH = Path(__file__).resolve().parent / 'import_time_baseline.json'
+
+ENTRY_POINTS = (
+    'src.services.scraper_service',
+    'src.services.analyzer_service',
+    'src.services.report_generator_service',
+    'src.services.review_io',
+    'src.main',
+    'src.ui.app',
+)
+# Pure-Python standard-library package timed as the machine's yardstick
+REFERENCE_MODULE = 'asyncio'
+# Dependencies that should only load when a feature actually needs them
+HEAVY_MODULES = (
+    'pandas', 'numpy', 'pyarrow', 'textblob', 'nltk', 'wordcloud',
+    'matplotlib', 'PIL', 'fpdf', 'google_play_scraper', 'streamlit',
+)
+
+
+def measure(module: str) -> Tuple[float, List[str]]:
+    """
+    Import a module once in a fresh interpreter
+
+    Returns:
+        Tuple of (cumulative import time in ms, heavy modules it loaded)
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=root_dir, capture_output=True, text=True, check=True
+    )
+    cumulative_us = None
+    loaded = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        _, cumulative, name = line.split('|')
+        name = name.strip()
+        if name.split('.')[0] in HEAVY_MODULES:
+            loaded.add(name.split('.')[0])
+        if name == module:
+            cumulative_us = int(cumulative)
+    if cumulative_us is None:
+        raise RuntimeError(f"No importtime entry for {module}:\n{result.stderr[-2000:]}")
+    return cumulative_us / 1000, sorted(loaded)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--tolerance', type=float, default=0.5,
+                        help='Allowed slowdown over the baseline, as a fraction (default: 0.5)')
+    parser.add_argument('--min-delta-ms', type=float, default=20.0,
+                        help='Slowdowns smaller than this are treated as noise (default: 20)')
+    parser.add_argument('--update-baseline', action='store_true')
+    args = parser.parse_args()
+
+    baseline: Dict[str, float] = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else {}
+    current: Dict[str, float] = {}
+    regressions = []
+
+    measure(REFERENCE_MODULE)
+    # Twice the runs: every comparison depends on this one median
+    reference_ms = statistics.median(measure(REFERENCE_MODULE)[0] for _ in range(2 * args.runs))
+    current['reference_ms'] = round(reference_ms, 1)
+    if 'reference_ms' in baseline:
+        # Baseline times as they would be on this machine
+        scale = reference_ms / baseline['reference_ms']
+        print(f"Reference import ({REFERENCE_MODULE}): {reference_ms:.1f}ms, {scale:.2f}x the baseline machine's")
+    else:
+        scale = 1.0
+        if baseline:
+            print("Baseline has no reference time; comparing raw times (rerun with --update-baseline)")
+
+    print(f"{'entry point':<40} {'median':>9} {'baseline':>9}  heavy modules loaded")
+    for module in ENTRY_POINTS:
+        measure(module)  # warm the filesystem and bytecode caches
+        timings = [measure(module) for _ in range(args.runs)]
+        median_ms = statistics.median(ms for ms, _ in timings)
+        loaded = timings[-1][1]
+        current[module] = round(median_ms, 1)
+
+        reference = baseline[module] * scale if module in baseline else None
+        regressed = (
+            reference is not None
+            and median_ms > reference * (1 + args.tolerance)
+            and median_ms - reference > args.min_delta_ms
+        )
+        if regressed:
+            regressions.append(module)
+        reference_text = f"{reference:>7.1f}ms" if reference is not None else f"{'-':>9}"
+        print(
+            f"{module:<40} {median_ms:>7.1f}ms {reference_text}  "
+            f"{', '.join(loaded) or '-'}{'  REGRESSION' if regressed else ''}"
+        )
+
+    if args.update_baseline:
+        BASELINE_PATH.write_text(json.dumps(current, indent=2) + '\n')
+        print(f"Baseline written to {BASELINE_PATH}")
+    elif regressions:
+        print(f"Import time regressed for: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""
+Time per-app report generation for a batch of apps, serial vs worker processes
+
+Every app gets its own report data (summary, sentiment distribution, issue
+counts and per-app insights, built from the seeded corpus with per-app
+noise). The legacy variant is the old generator: a pandas DataFrame per CSV
+and one PDF cell per issue, given only the rating, review count and issues.
+
+Usage:
+    python benchmarks/bench_reports.py [--apps 500] [--issues 200] [--jobs 4] [--wordcloud]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+import numpy as np
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+
+from benchmarks.corpus import make_reviews
+from src.services.report_generator_service import ReportGenerator, build_report_data
+from src.services.sentiment_aggregator import SentimentAggregator
+from src.services.text_normalizer import TextNormalizer
+
+
+def legacy_reports(data, output_path: Path):
+    """The old generator: DataFrame-backed CSV and one PDF cell per issue"""
+    import pandas as pd
+    from fpdf import FPDF
+
+    pd.DataFrame({
+        'Metric': ['Average Rating', 'Total Reviews'] + list(data['common_issues'].keys()),
+        'Value': [data['average_rating'], data['total_reviews']] + list(data['common_issues'].values())
+    }).to_csv(output_path / 'analysis_report.csv', index=False)
+
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font('Arial', 'B', 16)
+    pdf.cell(0, 10, 'Review Analysis Report', ln=True, align='C')
+    pdf.set_font('Arial', '', 12)
+    pdf.cell(0, 10, f"Average Rating: {data['average_rating']:.2f}", ln=True)
+    pdf.cell(0, 10, f"Total Reviews: {data['total_reviews']}", ln=True)
+    pdf.set_font('Arial', 'B', 14)
+    pdf.cell(0, 10, 'Common Issues:', ln=True)
+    pdf.set_font('Arial', '', 12)
+    for issue, count in data['common_issues'].items():
+        pdf.cell(0, 10, f"- {issue}: {count}", ln=True)
+    pdf.output(str(output_path / 'analysis_report.pdf'))
+
+
+def app_reports(apps: int, issues: int, reviews_per_app: int, wordcloud: bool):
+    """One report data dict per app; setup, not timed"""
+    reviews = make_reviews(reviews_per_app)
+    words = TextNormalizer(set()).count_texts(reviews['content'].tolist())
+    # Pad the vocabulary so every app has `issues` distinct issue words
+    vocabulary = list(words) + [f'issue{i}' for i in range(max(0, issues - len(words)))]
+    rng = np.random.default_rng(42)
+    ratings = reviews['score'].to_numpy(dtype=float)
+
+    reports = []
+    for i in range(apps):
+        counts = rng.integers(1, 500, size=len(vocabulary))
+        app_words = dict(zip(vocabulary, counts.tolist()))
+        sentiments = np.clip(rng.normal(0.1, 0.4, size=reviews_per_app), -1, 1)
+        aggregator = SentimentAggregator().update(sentiments, ratings, app_words)
+        insight = {
+            'app_id': f'com.example.app{i}', 'app_name': f'Example App {i}',
+            'reviews_analyzed': reviews_per_app, 'app_rating': 4.1,
+            'average_rating': aggregator.result(0)['average_rating'],
+            'negative_reviews': aggregator.negative_reviews,
+        }
+        reports.append(build_report_data(
+            aggregator.result(top_words=issues), [insight],
+            word_frequencies=dict(aggregator.common_words.most_common(100)) if wordcloud else None
+        ))
+    return reports
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--apps', type=int, default=500)
+    parser.add_argument('--issues', type=int, default=200, help='Issue words per app')
+    parser.add_argument('--reviews-per-app', type=int, default=1000)
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--wordcloud', action='store_true',
+                        help='Render a word cloud per app in the report workers')
+    args = parser.parse_args()
+
+    reports = app_reports(args.apps, args.issues, args.reviews_per_app, args.wordcloud)
+    generator = ReportGenerator()
+
+    def run(variant):
+        output_root = Path(tempfile.mkdtemp())
+        paths = [output_root / f'app{i}' for i in range(len(reports))]
+        start = time.perf_counter()
+        if variant == 'legacy':
+            for data, path in zip(reports, paths):
+                path.mkdir()
+                legacy_reports(data, path)
+        else:
+            jobs = 1 if variant == 'serial' else args.jobs
+            generator.generate_batch(list(zip(reports, paths)), n_jobs=jobs)
+        seconds = time.perf_counter() - start
+        size = sum(f.stat().st_size for f in output_root.rglob('*') if f.is_file())
+        return seconds, size
+
+    print(f"{args.apps} apps, {args.issues} issues each, {args.jobs} worker processes")
+    print(f"{'variant':>9} {'seconds':>8} {'apps/s':>8} {'MB written':>11}")
+    for variant in ('legacy', 'serial', 'parallel'):
+        seconds, size = run(variant)
+        print(f"{variant:>9} {seconds:>8.2f} {args.apps / seconds:>8.1f} {size / 1e6:>11.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Peak RSS of analyze_sentiment with full vs compact results
+
+Each mode runs in a fresh interpreter so peak RSS is not shared.
+
+Usage:
+    python benchmarks/bench_result_memory.py [--rows 200000]
+"""
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_mode(mode: str, rows: int):
+    """Analyze the synthetic corpus in this process and print peak RSS as JSON"""
+    from benchmarks.corpus import make_reviews
+    from src.services.analyzer_service import SentimentAnalyzer
+
+    analyzer = SentimentAnalyzer(compact_results=(mode == 'compact'))
+    reviews_df = make_reviews(rows)
+    baseline = _peak_rss_mb()
+
+    start = time.perf_counter()
+    analysis = analyzer.analyze_sentiment(reviews_df)
+    elapsed = time.perf_counter() - start
+
+    print(json.dumps({
+        'mode': mode,
+        'baseline_mb': baseline,
+        'peak_mb': _peak_rss_mb(),
+        'seconds': elapsed,
+        'reviews_data': len(analysis['reviews_data']),
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--mode', choices=['full', 'compact'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args.mode, args.rows)
+        return
+
+    print(f"{'mode':>8} {'data MB':>8} {'peak MB':>8} {'analysis MB':>12} {'time':>7}")
+    for mode in ('full', 'compact'):
+        output = subprocess.run(
+            [sys.executable, __file__, '--rows', str(args.rows), '--mode', mode],
+            check=True, capture_output=True, text=True
+        ).stdout
+        stats = json.loads(output.strip().splitlines()[-1])
+        print(
+            f"{mode:>8} {stats['baseline_mb']:>8.0f} {stats['peak_mb']:>8.0f} "
+            f"{stats['peak_mb'] - stats['baseline_mb']:>12.0f} {stats['seconds']:>6.1f}s"
+        )
+
+
+if __name__ == '__main__':
+    main()
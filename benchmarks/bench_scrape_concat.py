@@ -0,0 +1,91 @@
+"""
+Compare scrape_reviews' single combine step with the old per-URL pd.concat loop
+
+Each variant runs in a fresh interpreter and reports time, peak RSS and the
+size of the resulting DataFrame.
+
+Usage:
+    python benchmarks/bench_scrape_concat.py [--apps 50] [--reviews-per-app 5000]
+"""
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+
+
+def legacy_scrape(backend, urls, scraper):
+    """The old accumulation: concat onto the growing frame for every app"""
+    import pandas as pd
+
+    all_reviews = pd.DataFrame()
+    for url in urls:
+        app_id = scraper._extract_app_id(url)
+        app_info = backend.app(app_id)
+        df = pd.DataFrame(backend.reviews_all(app_id))
+        df['app_id'] = app_id
+        df['app_url'] = url
+        df['app_name'] = app_info.get('title', '')
+        all_reviews = pd.concat([all_reviews, df], ignore_index=True)
+    return all_reviews
+
+
+def run_variant(variant: str, apps: int, reviews_per_app: int):
+    """Scrape the synthetic backend in this process and print stats as JSON"""
+    import contextlib
+    import io
+    from benchmarks.corpus import SyntheticPlayBackend
+    from src.services.scraper_service import GooglePlayScraper
+
+    backend = SyntheticPlayBackend(reviews_per_app)
+    scraper = GooglePlayScraper(backend=backend)
+    urls = [f"https://play.google.com/store/apps/details?id=com.example.app{i}" for i in range(apps)]
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        if variant == 'legacy':
+            reviews_df = legacy_scrape(backend, urls, scraper)
+        else:
+            reviews_df, _ = scraper.scrape_reviews(urls)
+    elapsed = time.perf_counter() - start
+
+    print(json.dumps({
+        'rows': len(reviews_df),
+        'seconds': elapsed,
+        'peak_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        'frame_mb': reviews_df.memory_usage(deep=True).sum() / 2 ** 20,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--apps', type=int, default=50)
+    parser.add_argument('--reviews-per-app', type=int, default=5000)
+    parser.add_argument('--variant', choices=['legacy', 'combined'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.variant:
+        run_variant(args.variant, args.apps, args.reviews_per_app)
+        return
+
+    print(f"{'variant':>9} {'rows':>8} {'time':>7} {'peak MB':>8} {'frame MB':>9}")
+    for variant in ('legacy', 'combined'):
+        output = subprocess.run(
+            [sys.executable, __file__, '--apps', str(args.apps),
+             '--reviews-per-app', str(args.reviews_per_app), '--variant', variant],
+            check=True, capture_output=True, text=True
+        ).stdout
+        stats = json.loads(output.strip().splitlines()[-1])
+        print(
+            f"{variant:>9} {stats['rows']:>8} {stats['seconds']:>6.1f}s "
+            f"{stats['peak_mb']:>8.0f} {stats['frame_mb']:>9.0f}"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""
+Compare the batched PolarityScorer against the per-row TextBlob loop
+
+Usage:
+    python benchmarks/bench_sentiment.py [--sizes 1000 10000 100000]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+
+from textblob import TextBlob
+from benchmarks.corpus import make_reviews
+from src.services.polarity_scorer import PolarityScorer
+
+
+def textblob_loop(reviews_df):
+    """The original analyze_sentiment scoring loop"""
+    return [TextBlob(str(row['content'])).sentiment.polarity for _, row in reviews_df.iterrows()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    args = parser.parse_args()
+
+    scorer = PolarityScorer()
+    print(f"{'rows':>8} {'iterrows+TextBlob':>18} {'PolarityScorer':>15} {'speedup':>8}")
+    for size in args.sizes:
+        # Distinct texts, so per-text dedup inside the scorer cannot hide scoring cost
+        reviews_df = make_reviews(size, distinct=True)
+
+        start = time.perf_counter()
+        expected = textblob_loop(reviews_df)
+        loop_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        scores = scorer.score([str(content) for content in reviews_df['content']])
+        batch_time = time.perf_counter() - start
+
+        assert scores.tolist() == expected, "batched scores differ from TextBlob"
+        print(f"{size:>8} {loop_time:>17.2f}s {batch_time:>14.2f}s {loop_time / batch_time:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
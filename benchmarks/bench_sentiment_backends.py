@@ -0,0 +1,60 @@
+"""
+Throughput and agreement of the registered sentiment backends vs TextBlob
+
+Every review in the seeded corpus is made distinct, so per-text dedup does
+not inflate throughput. Agreement is measured against the 'textblob'
+backend, which is bit-exact with TextBlob.
+
+Usage:
+    python benchmarks/bench_sentiment_backends.py [--rows 100000]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+import numpy as np
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+
+from benchmarks.corpus import make_reviews
+from src.services.sentiment_aggregator import SENTIMENT_BUCKETS
+from src.services.sentiment_backends import available_backends, create_backend
+
+BASELINE_BACKEND = 'textblob'
+
+
+def _buckets(scores: np.ndarray) -> np.ndarray:
+    edges = np.array([low for _, low, _ in SENTIMENT_BUCKETS[1:]])
+    return np.searchsorted(edges, scores, side='right')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100000)
+    args = parser.parse_args()
+
+    texts = [f"{text} #{i}" for i, text in enumerate(make_reviews(args.rows)['content'])]
+
+    results = {}
+    for name in available_backends():
+        backend = create_backend(name)  # lexicon loading is not timed
+        start = time.perf_counter()
+        scores = backend.score(texts)
+        results[name] = (scores, time.perf_counter() - start)
+
+    baseline, baseline_seconds = results[BASELINE_BACKEND]
+    print(f"{'backend':>10} {'reviews/s':>11} {'speedup':>8} {'same bucket':>12} {'same sign':>10} {'MAE':>7} {'corr':>6}")
+    for name, (scores, seconds) in results.items():
+        same_bucket = np.mean(_buckets(scores) == _buckets(baseline))
+        same_sign = np.mean(np.sign(scores) == np.sign(baseline))
+        mae = np.abs(scores - baseline).mean()
+        corr = np.corrcoef(scores, baseline)[0, 1]
+        print(
+            f"{name:>10} {len(texts) / seconds:>11,.0f} {baseline_seconds / seconds:>7.1f}x "
+            f"{same_bucket:>11.1%} {same_sign:>9.1%} {mae:>7.3f} {corr:>6.3f}"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""
+Compare the single-pass TextNormalizer with the old clean/join/split pipeline
+
+Usage:
+    python benchmarks/bench_text_normalizer.py [--sizes 10000 100000]
+"""
+import argparse
+import re
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+
+from benchmarks.corpus import make_reviews
+from src.services.analyzer_service import SentimentAnalyzer
+
+
+def legacy_pipeline(contents, stop_words):
+    """Per-review re.sub/split/join, re-split for the counter, joined for the word cloud"""
+    common_words = Counter()
+    cleaned_texts = []
+    for content in contents:
+        text = re.sub(r'[^a-zA-Z\s]', '', content.lower())
+        cleaned_text = ' '.join(word for word in text.split() if word not in stop_words)
+        cleaned_texts.append(cleaned_text)
+        common_words.update(cleaned_text.split())
+    wordcloud_text = ' '.join(cleaned_texts)
+    return common_words, wordcloud_text
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    normalizer = SentimentAnalyzer().normalizer
+    print(f"{'rows':>8} {'legacy':>9} {'normalizer':>11} {'speedup':>8}")
+    for size in args.sizes:
+        contents = make_reviews(size)['content'].tolist()
+
+        legacy_time = min(
+            _timed(legacy_pipeline, contents, normalizer.stop_words) for _ in range(args.repeat)
+        )
+        new_time = min(
+            _timed(normalizer.count_texts, contents) for _ in range(args.repeat)
+        )
+
+        expected, _ = legacy_pipeline(contents, normalizer.stop_words)
+        assert normalizer.count_texts(contents) == expected
+        print(f"{size:>8} {legacy_time:>8.3f}s {new_time:>10.3f}s {legacy_time / new_time:>7.1f}x")
+
+
+def _timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""Seeded synthetic review corpus shared by the benchmark scripts"""
+import numpy as np
+import pandas as pd
+
+PHRASES = [
+    "This app is great", "Really love it", "Not good at all", "Crashes every time I open it",
+    "Very slow after the last update", "Login doesn't work", "Battery drain is terrible",
+    "Best app ever!", "It's okay I guess", "Would not recommend", "Dark mode please",
+    "Works fine on my phone", "Too many ads", "Amazing support team :)", "Never loads",
+    "Customer service is awful", "Simple and useful", "I can't sign in", "Great",
+    "Good", "Terrible experience, uninstalled", "Not bad", "Perfect for my needs",
+]
+
+
+# Developer replies attached to a share of the reviews
+REPLIES = [
+    "Thanks for the feedback!", "Sorry about that, please contact support.",
+    "We fixed this in the latest update.", "Glad you like it!",
+]
+REPLY_RATE = 0.1
+
+
+def make_reviews(n: int, seed: int = 42, distinct: bool = False) -> pd.DataFrame:
+    """
+    Build n synthetic reviews with the columns google_play_scraper returns
+
+    Vectorized with NumPy so corpora of a million reviews build in seconds.
+    Each review joins one to three phrases; one in ten has a developer reply.
+
+    Args:
+        n: Number of reviews
+        seed: Seed of the generators
+        distinct: Tag every text with its review number, so no two texts
+            repeat and per-text dedup cannot hide scoring cost
+    """
+    rng = np.random.default_rng(seed)
+    # Separate stream for the metadata columns keeps content/score stable
+    extra = np.random.default_rng(seed + 1)
+    phrases = np.array(PHRASES, dtype=object)
+
+    # One to three phrases per review, consecutive picks never repeat
+    first = rng.integers(0, len(PHRASES), n)
+    second = (first + rng.integers(1, len(PHRASES), n)) % len(PHRASES)
+    third = (second + rng.integers(1, len(PHRASES), n)) % len(PHRASES)
+    phrase_count = rng.integers(1, 4, n)
+    content = phrases[first]
+    two_or_more = phrase_count >= 2
+    content[two_or_more] = content[two_or_more] + ' ' + phrases[second[two_or_more]]
+    three = phrase_count == 3
+    content[three] = content[three] + ' ' + phrases[third[three]]
+    if distinct:
+        content = content + np.array([f' #{i}' for i in range(n)], dtype=object)
+
+    at = pd.Timestamp('2024-01-01') + pd.to_timedelta(np.arange(n), unit='min')
+    minor = extra.integers(0, 10, n)
+    app_version = pd.Series(minor).map(lambda m: f'1.{m}.0')
+    replied = extra.random(n) < REPLY_RATE
+    reply_content = pd.Series(np.array(REPLIES, dtype=object)[extra.integers(0, len(REPLIES), n)])
+    replied_at = pd.Series(at + pd.to_timedelta(extra.integers(1, 72, n), unit='h'))
+    user_ids = extra.integers(1, max(n, 2), n)
+
+    return pd.DataFrame({
+        'reviewId': [f'gp:{value:016x}' for value in extra.integers(0, 2**63 - 1, n, dtype=np.int64)],
+        'userName': [f'User {user_id}' for user_id in user_ids],
+        'userImage': [f'https://play-lh.googleusercontent.com/a/{user_id}' for user_id in user_ids],
+        'content': content,
+        'score': rng.integers(1, 6, n),
+        'thumbsUpCount': extra.integers(0, 51, n),
+        'reviewCreatedVersion': app_version,
+        'at': at,
+        'replyContent': reply_content.where(replied, None),
+        'repliedAt': replied_at.where(replied),
+        'appVersion': app_version,
+        'app_id': 'com.example.app',
+        'app_name': 'Example App',
+    })
+
+
+class SyntheticPlayBackend:
+    """
+    google_play_scraper stand-in serving make_reviews() data for any app
+
+    The records are generated once and shared by every app, so benchmarks
+    measure the scraper rather than the corpus generator.
+    """
+
+    def __init__(self, reviews_per_app: int = 1000, seed: int = 42):
+        self.reviews_per_app = reviews_per_app
+        self._records = make_reviews(reviews_per_app, seed).drop(
+            columns=['app_id', 'app_name']
+        ).to_dict('records')
+
+    def app(self, app_id, lang='en', country='us'):
+        return {'title': f'App {app_id}', 'reviews': self.reviews_per_app, 'score': 4.0}
+
+    def reviews_all(self, app_id, sleep_milliseconds=0, **kwargs):
+        return list(self._records)
+
+    def reviews(self, app_id, lang='en', country='us', count=100, continuation_token=None, **kwargs):
+        offset = continuation_token.token if continuation_token is not None else 0
+        if offset is None:
+            return [], continuation_token
+        end = offset + count
+        return self._records[offset:end], PageToken(end if end < len(self._records) else None)
+
+
+class PageToken:
+    """Continuation token whose ``token`` is the offset of the next page"""
+
+    def __init__(self, token):
+        self.token = token
@@ -0,0 +1,283 @@
+"""
+Stage-by-stage time and peak memory of the pipeline, checked against a baseline
+
+Every (size, stage) pair runs in a fresh interpreter on the seeded synthetic
+corpus, so peak RSS is not shared between stages. Setup (building the corpus
+and the inputs of the stage, and one-off library loading such as
+matplotlib's fonts) is not measured. A stage's time is the median of
+--repeats runs, each on freshly built services so no cache carries over;
+peak memory is the growth of the peak RSS during the first run. Results are
+compared with benchmarks/suite_baseline.json and the script exits with
+status 1 when a stage got slower or bigger than the baseline by more than
+the tolerance.
+
+Times depend on the machine, so each run of a stage is followed by a run of
+a fixed reference workload, and the baseline stores the median reference
+time next to the stage time. Baseline times are scaled by the ratio of the
+current and recorded reference times before comparing; that corrects for
+CPU speed and load, not for core counts or library versions, so record a
+local baseline (--update-baseline) before relying on the comparison on a
+new machine.
+
+Usage:
+    python benchmarks/suite.py [--sizes 1000 10000 100000] [--stages analyze scrape]
+    python benchmarks/suite.py --sizes 1000000       # one million reviews
+    python benchmarks/suite.py --update-baseline
+"""
+import argparse
+import functools
+import json
+import random
+import resource
+import subprocess
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+
+BASELINE_PATH = Path(__file__).resolve().parent / 'suite_baseline.json'
+DEFAULT_SIZES = (1000, 10000, 100000)
+# Reviews per synthetic app in the scrape stage
+REVIEWS_PER_APP = 10000
+# Reviews per app in the report stages. A report lists a fixed top-N of
+# issues, so what grows with the corpus is its table of per-app insights.
+REPORT_REVIEWS_PER_APP = 100
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def reference_seconds() -> float:
+    """Time of a fixed workload mixing Python string work and NumPy sorting, like the stages do"""
+    import numpy as np
+
+    rng = random.Random(0)
+    numbers = np.random.default_rng(0).random(500000)
+    start = time.perf_counter()
+    words = sorted(f'word{rng.randrange(50000)}' for _ in range(100000))
+    sum(len(word) for word in words)
+    np.sort(numbers)
+    return time.perf_counter() - start
+
+
+@functools.lru_cache(maxsize=None)
+def _corpus(n: int, distinct: bool = False):
+    """Seeded corpus, built once per process and shared by the repeats"""
+    from benchmarks.corpus import make_reviews
+    return make_reviews(n, distinct=distinct)
+
+
+@functools.lru_cache(maxsize=None)
+def _load_wordcloud():
+    """Render once, so matplotlib's one-off font and colormap loading is setup"""
+    from src.services.wordcloud_renderer import WordCloudRenderer
+    WordCloudRenderer(cache_size=0).render({'warm': 2, 'up': 1})
+
+
+# Each stage takes the corpus size and returns the callable to measure;
+# everything done before returning is setup and is not measured. Stages are
+# set up again for every repeat, so caches start empty each time.
+
+def stage_scrape(n: int) -> Callable[[], object]:
+    from benchmarks.corpus import SyntheticPlayBackend
+    from src.services.scraper_service import GooglePlayScraper
+
+    apps = max(1, n // REVIEWS_PER_APP)
+    scraper = GooglePlayScraper(backend=SyntheticPlayBackend(reviews_per_app=n // apps))
+    urls = [f'https://play.google.com/store/apps/details?id=com.example.app{i}' for i in range(apps)]
+    return lambda: scraper.scrape_reviews(urls)
+
+
+def stage_analyze(n: int) -> Callable[[], object]:
+    from src.services.analyzer_service import SentimentAnalyzer
+
+    analyzer = SentimentAnalyzer(compact_results=True)
+    reviews_df = _corpus(n, distinct=True)
+    # One-off lexicon and wordcloud/matplotlib loading is setup
+    analyzer.scorer
+    analyzer.wordcloud_renderer
+    _load_wordcloud()
+    return lambda: analyzer.analyze_sentiment(reviews_df)
+
+
+def stage_clean_text(n: int) -> Callable[[], object]:
+    from src.services.analyzer_service import SentimentAnalyzer
+
+    analyzer = SentimentAnalyzer()
+    contents = _corpus(n, distinct=True)['content'].tolist()
+    return lambda: [analyzer._clean_text(text) for text in contents]
+
+
+def stage_wordcloud(n: int) -> Callable[[], object]:
+    from src.services.analyzer_service import SentimentAnalyzer
+
+    analyzer = SentimentAnalyzer()
+    frequencies = analyzer.normalizer.count_texts(_corpus(n)['content'].tolist())
+    _load_wordcloud()
+    return lambda: analyzer._generate_wordcloud(frequencies)
+
+
+@functools.lru_cache(maxsize=None)
+def _report_data(n: int) -> Dict:
+    """Report data of n reviews split into apps of REPORT_REVIEWS_PER_APP reviews"""
+    from src.services.report_generator_service import build_report_data
+    from src.services.sentiment_aggregator import SentimentAggregator
+    from src.services.text_normalizer import TextNormalizer
+
+    reviews_df = _corpus(n)
+    normalizer = TextNormalizer(set())
+    totals, app_insights = SentimentAggregator(), []
+    for i, start in enumerate(range(0, n, REPORT_REVIEWS_PER_APP)):
+        app_df = reviews_df.iloc[start:start + REPORT_REVIEWS_PER_APP]
+        # Star ratings stand in for sentiment: scoring is not what this measures
+        metrics = SentimentAggregator().update(
+            (app_df['score'] - 3) / 2, app_df['score'], normalizer.count_texts(app_df['content'].tolist())
+        )
+        totals.merge(metrics)
+        result = metrics.result()
+        app_insights.append({
+            'app_name': f'Example App {i}',
+            'app_id': f'com.example.app{i}',
+            'reviews_analyzed': len(app_df),
+            'app_rating': 4.2,
+            'average_rating': result['average_rating'],
+            'negative_reviews': result['negative_reviews'],
+        })
+    return build_report_data(totals.result(), app_insights)
+
+
+def stage_report_csv(n: int) -> Callable[[], object]:
+    from src.services.report_generator_service import ReportGenerator
+
+    data, output_dir = _report_data(n), Path(tempfile.mkdtemp())
+    return lambda: ReportGenerator().generate_reports(data, output_dir, pdf=False)
+
+
+def stage_report_pdf(n: int) -> Callable[[], object]:
+    from src.services.report_generator_service import ReportGenerator
+
+    data, output_dir = _report_data(n), Path(tempfile.mkdtemp())
+    return lambda: ReportGenerator().generate_pdf(data, output_dir)
+
+
+def stage_export(n: int) -> Callable[[], object]:
+    from src.services.review_io import write_reviews
+    from src.services.scraper_service import compact_review_frame
+
+    reviews_df = compact_review_frame(_corpus(n).copy())
+    path = Path(tempfile.mkdtemp()) / 'reviews.parquet'
+    return lambda: write_reviews(reviews_df, path)
+
+
+STAGES = {
+    'scrape': stage_scrape,
+    'analyze': stage_analyze,
+    'clean_text': stage_clean_text,
+    'wordcloud': stage_wordcloud,
+    'report_csv': stage_report_csv,
+    'report_pdf': stage_report_pdf,
+    'export': stage_export,
+}
+
+
+def run_stage(stage: str, n: int, repeats: int):
+    """Run one stage in this process and print its measurements as JSON"""
+    times, references, peak_mb = [], [], None
+    for _ in range(repeats):
+        measured = STAGES[stage](n)
+        before = _peak_rss_mb()
+        start = time.perf_counter()
+        measured()
+        times.append(time.perf_counter() - start)
+        if peak_mb is None:
+            peak_mb = _peak_rss_mb() - before
+        # Timed after the stage so it cannot raise the stage's peak RSS
+        references.append(reference_seconds())
+    print(json.dumps({
+        'seconds': statistics.median(times),
+        'peak_mb': peak_mb,
+        'reference_seconds': statistics.median(references),
+    }))
+
+
+def measure(stage: str, n: int, repeats: int) -> Dict[str, float]:
+    result = subprocess.run(
+        [sys.executable, __file__, '--child', stage, '--sizes', str(n), '--repeats', str(repeats)],
+        cwd=root_dir, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def is_regression(current: float, reference: float, tolerance: float, min_delta: float) -> bool:
+    return current > reference * (1 + tolerance) and current - reference > min_delta
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES))
+    parser.add_argument('--stages', nargs='+', choices=list(STAGES), default=list(STAGES))
+    parser.add_argument('--repeats', type=int, default=5,
+                        help='Runs per stage; the median time is compared (default: 5)')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Allowed slowdown or memory growth over the baseline (default: 0.25)')
+    parser.add_argument('--min-delta-seconds', type=float, default=0.05,
+                        help='Slowdowns below this are treated as noise (default: 0.05)')
+    parser.add_argument('--min-delta-mb', type=float, default=20.0,
+                        help='Memory growth below this is treated as noise (default: 20)')
+    parser.add_argument('--update-baseline', action='store_true')
+    parser.add_argument('--child', choices=list(STAGES), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_stage(args.child, args.sizes[0], max(1, args.repeats))
+        return
+
+    baseline = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else {}
+    regressions = []
+
+    print(f"{'size':>8} {'stage':<11} {'time':>9} {'baseline':>9} {'peak MB':>8} {'baseline':>9}")
+    for n in args.sizes:
+        for stage in args.stages:
+            current = measure(stage, n, max(1, args.repeats))
+            recorded = baseline.get(str(n), {}).get(stage)
+            flags = []
+            if recorded is not None:
+                # The baseline time as it would be on this machine, under its current load
+                scale = current['reference_seconds'] / recorded.get('reference_seconds', current['reference_seconds'])
+                expected_seconds = recorded['seconds'] * scale
+                if is_regression(current['seconds'], expected_seconds, args.tolerance, args.min_delta_seconds):
+                    flags.append('SLOWER')
+                if is_regression(current['peak_mb'], recorded['peak_mb'], args.tolerance, args.min_delta_mb):
+                    flags.append('MORE MEMORY')
+            if flags:
+                regressions.append(f'{stage}@{n}')
+            base_time = f"{expected_seconds:>8.3f}s" if recorded else f"{'-':>9}"
+            base_mb = f"{recorded['peak_mb']:>9.1f}" if recorded else f"{'-':>9}"
+            print(
+                f"{n:>8} {stage:<11} {current['seconds']:>8.3f}s {base_time} "
+                f"{current['peak_mb']:>8.1f} {base_mb}  {' '.join(flags)}"
+            )
+            if args.update_baseline:
+                baseline.setdefault(str(n), {})[stage] = {
+                    'seconds': round(current['seconds'], 4),
+                    'peak_mb': round(current['peak_mb'], 1),
+                    'reference_seconds': round(current['reference_seconds'], 5),
+                }
+
+    if args.update_baseline:
+        BASELINE_PATH.write_text(json.dumps(baseline, indent=2, sort_keys=True) + '\n')
+        print(f"Baseline written to {BASELINE_PATH}")
+    elif regressions:
+        print(f"Regressions: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
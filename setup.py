@@ -10,6 +10,7 @@ setup(
         "textblob>=0.17.1",
         "pandas>=1.5.3",
         "fpdf>=1.7.2",
+        "pyarrow>=10.0.0",
     ],
     python_requires=">=3.8",
 )
\ No newline at end of file
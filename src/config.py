@@ -0,0 +1,74 @@
+from pathlib import Path
+
+# Default settings shared by the services, UI and batch entry points
+
+# Google Play locale used for app details and reviews
+DEFAULT_LANG = 'en'
+DEFAULT_COUNTRY = 'us'
+
+# Host that serves every google_play_scraper request
+PLAY_STORE_HOST = 'play.google.com'
+
+# Scraper concurrency: number of apps fetched at once (1 = sequential)
+DEFAULT_MAX_WORKERS = 1
+
+# Per-host request budget; None disables rate limiting
+DEFAULT_REQUESTS_PER_SECOND = None
+
+# Reviews requested per page when streaming with the paginated reviews() call
+DEFAULT_BATCH_SIZE = 200
+
+# Local review store used by incremental scraping
+DATA_DIR = Path(__file__).resolve().parent.parent / 'data'
+DEFAULT_STORE_PATH = DATA_DIR / 'reviews.db'
+
+# Fetch retries: attempts after the first one, and the exponential backoff
+# base and cap (the actual delay is jittered between 0 and the cap)
+DEFAULT_MAX_RETRIES = 4
+DEFAULT_BACKOFF_SECONDS = 1.0
+DEFAULT_MAX_BACKOFF_SECONDS = 30.0
+
+# Resumable full fetches: reviews per checkpointed page (google_play_scraper's
+# per-request maximum), checkpoint location and how long a checkpoint stays
+# resumable before the app is fetched from scratch again
+DEFAULT_FETCH_PAGE_SIZE = 4500
+DEFAULT_CHECKPOINT_PATH = DATA_DIR / 'fetch_checkpoints.db'
+DEFAULT_CHECKPOINT_MAX_AGE_SECONDS = 24 * 3600
+
+# Sentiment analysis parallelism: worker processes (1 = in-process) and
+# reviews scored per worker task
+DEFAULT_ANALYZER_JOBS = 1
+DEFAULT_CHUNK_SIZE = 10000
+
+# Sentiment engine: 'textblob' (exact TextBlob polarity) or 'lexicon'
+# (faster lookup-table approximation); see sentiment_backends
+DEFAULT_SENTIMENT_BACKEND = 'textblob'
+
+# Sentiment cache: in-memory LRU bound and on-disk tier location
+DEFAULT_CACHE_ENTRIES = 100000
+DEFAULT_CACHE_PATH = DATA_DIR / 'sentiment_cache.db'
+
+# Trend rollups: most frequent terms kept per app and day
+DEFAULT_ROLLUP_TOP_TERMS = 50
+
+# Duplicate reviews: 'drop' keeps one review per group of near-identical
+# reviews, 'weight' keeps them all but splits one review's weight across the
+# group, 'off' skips detection. Reviews are near-duplicates from this
+# estimated Jaccard similarity of their word pairs. Exact copies of short
+# reviews ("Great app") are only a group once an app has more than the
+# copy limit of them: a few are normal, hundreds are a flood.
+DEDUP_MODES = ('off', 'drop', 'weight')
+DEFAULT_DEDUP_MODE = 'drop'
+DEFAULT_DEDUP_THRESHOLD = 0.8
+DEFAULT_DEDUP_SHORT_COPY_LIMIT = 20
+
+# Theme extraction: themes found, hashed unigram/bigram features kept, and
+# memory allowed for the review-term matrix (beyond it, themes are fitted on
+# an even sample of the reviews and the rest are re-tokenized to assign them)
+DEFAULT_THEME_COUNT = 8
+DEFAULT_THEME_FEATURES = 4096
+DEFAULT_THEME_MEMORY_MB = 256
+
+# Streamlit result cache
+RESULT_CACHE_TTL_SECONDS = 3600
+RESULT_CACHE_ENTRIES = 16
@@ -1,6 +1,9 @@
+from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import Dict
-import pandas as pd
+from typing import TYPE_CHECKING, Dict
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 class AnalyzerInterface(ABC):
     @abstractmethod
@@ -1,6 +1,9 @@
+from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import List, Dict, Tuple
-import pandas as pd
+from typing import TYPE_CHECKING, List, Dict, Tuple
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 class ScraperInterface(ABC):
     @abstractmethod
@@ -0,0 +1,23 @@
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Sequence
+
+if TYPE_CHECKING:
+    import numpy as np
+
+class SentimentBackendInterface(ABC):
+    # Registry name of the backend
+    name: str = ''
+
+    @abstractmethod
+    def score(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Score the polarity of a batch of texts
+
+        Args:
+            texts: Review texts
+
+        Returns:
+            Array of polarities in [-1.0, 1.0], aligned with texts
+        """
+        pass
@@ -0,0 +1,228 @@
+"""
+Headless batch runner: scrape and analyze a list of Google Play URLs
+
+Usage:
+    python src/main.py urls.txt --output-dir reports [--workers 4] [--incremental]
+
+Writes analysis_report.csv/.pdf, app_insights.csv and the review table with
+its analysis as a Parquet or Arrow file; --per-app-reports adds one report
+set per app. Does not import Streamlit.
+"""
+import argparse
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+# Add project root to path
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+
+from src.config import (
+    DEDUP_MODES,
+    DEFAULT_ANALYZER_JOBS,
+    DEFAULT_CACHE_PATH,
+    DEFAULT_CHECKPOINT_PATH,
+    DEFAULT_DEDUP_MODE,
+    DEFAULT_DEDUP_SHORT_COPY_LIMIT,
+    DEFAULT_DEDUP_THRESHOLD,
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_MAX_WORKERS,
+    DEFAULT_REQUESTS_PER_SECOND,
+    DEFAULT_SENTIMENT_BACKEND,
+    DEFAULT_STORE_PATH,
+)
+from src.services import instrumentation
+from src.services.analyzer_service import SentimentAnalyzer
+from src.services.checkpoint_store import CheckpointStore
+from src.services.instrumentation import Instrumentation
+from src.services.report_generator_service import REPORT_TOP_ISSUES, ReportGenerator, build_report_data
+from src.services.review_io import FORMATS, write_reviews
+from src.services.review_store import ReviewStore
+from src.services.scraper_service import GooglePlayScraper
+from src.services.sentiment_backends import available_backends
+from src.services.sentiment_cache import SentimentCache
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Words handed to each per-app word cloud (WordCloudRenderer draws at most 100)
+WORDCLOUD_WORDS = 100
+
+
+def read_urls(path: str) -> List[str]:
+    """
+    Read app URLs from a file ('-' for stdin), one per line
+
+    Blank lines and lines starting with '#' are skipped, and duplicates are
+    dropped while keeping file order.
+    """
+    text = sys.stdin.read() if path == '-' else Path(path).read_text(encoding='utf-8')
+    urls = [line.strip() for line in text.splitlines()]
+    return list(dict.fromkeys(url for url in urls if url and not url.startswith('#')))
+
+
+def per_app_reports(
+    analyzer: SentimentAnalyzer,
+    reviews_df: 'pd.DataFrame',
+    app_insights: List[Dict],
+    output_dir: Path
+) -> List[Tuple[Dict, Path]]:
+    """
+    Report data and output directory of each app
+
+    Word clouds are left to the report workers, which render them from each
+    app's word counts.
+    """
+    insights_by_app = {insight['app_id']: insight for insight in app_insights}
+    reports = []
+    for app_id, aggregator in analyzer.aggregate_by_app(reviews_df).items():
+        data = build_report_data(
+            aggregator.result(top_words=REPORT_TOP_ISSUES),
+            [insights_by_app[app_id]] if app_id in insights_by_app else None,
+            word_frequencies=dict(aggregator.common_words.most_common(WORDCLOUD_WORDS))
+        )
+        reports.append((data, output_dir / _safe_name(app_id)))
+    return reports
+
+
+def _safe_name(app_id: str) -> str:
+    """App ids are package names, but keep anything path-like out of directory names"""
+    return ''.join(c if c.isalnum() or c in '._-' else '_' for c in app_id)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='reviewsmart',
+        description='Scrape and analyze Google Play reviews without the web UI'
+    )
+    parser.add_argument('urls_file', help="File with one Google Play URL per line ('-' for stdin)")
+    parser.add_argument('-o', '--output-dir', default='reports', help='Directory for the reports (default: reports)')
+    parser.add_argument('--format', choices=FORMATS, default='parquet',
+                        help='Columnar format of the review table (default: parquet)')
+    parser.add_argument('--no-pdf', action='store_true', help='Skip the PDF report')
+    parser.add_argument('--per-app-reports', action='store_true',
+                        help='Also write one report set per app under OUTPUT_DIR/apps, using --jobs processes')
+    parser.add_argument('--workers', type=int, default=DEFAULT_MAX_WORKERS,
+                        help='Apps scraped concurrently')
+    parser.add_argument('--requests-per-second', type=float, default=DEFAULT_REQUESTS_PER_SECOND,
+                        help='Request budget against the Play Store, retries included (default: unlimited)')
+    parser.add_argument('--max-retries', type=int, default=DEFAULT_MAX_RETRIES,
+                        help=f'Retries of a request failing with a transient error (default: {DEFAULT_MAX_RETRIES})')
+    parser.add_argument('--checkpoint-path', default=str(DEFAULT_CHECKPOINT_PATH),
+                        help='Fetch checkpoints a failed or killed run resumes from')
+    parser.add_argument('--no-checkpoints', action='store_true',
+                        help='Fetch every app from scratch, without checkpoints')
+    parser.add_argument('--jobs', type=int, default=DEFAULT_ANALYZER_JOBS,
+                        help='Worker processes for sentiment scoring')
+    parser.add_argument('--sentiment-backend', choices=available_backends(), default=DEFAULT_SENTIMENT_BACKEND,
+                        help=f'Sentiment engine (default: {DEFAULT_SENTIMENT_BACKEND})')
+    parser.add_argument('--cache-path', default=str(DEFAULT_CACHE_PATH),
+                        help='On-disk sentiment cache shared between runs')
+    parser.add_argument('--no-cache', action='store_true', help='Disable the sentiment cache')
+    parser.add_argument('--dedup', choices=DEDUP_MODES, default=DEFAULT_DEDUP_MODE,
+                        help="Duplicate and near-duplicate reviews: 'drop' them, 'weight' them so each "
+                             f"group counts once, or leave them 'off' (default: {DEFAULT_DEDUP_MODE}). "
+                             "Both 'drop' and 'weight' change review counts and average ratings; "
+                             "use 'off' for the figures of earlier versions")
+    parser.add_argument('--dedup-threshold', type=float, default=DEFAULT_DEDUP_THRESHOLD,
+                        help=f'Similarity from which reviews are near-duplicates (default: {DEFAULT_DEDUP_THRESHOLD})')
+    parser.add_argument('--dedup-short-copies', type=int, default=DEFAULT_DEDUP_SHORT_COPY_LIMIT,
+                        help='Exact copies of a review under five words kept as unique reviews per app; '
+                             f'more are one group (default: {DEFAULT_DEDUP_SHORT_COPY_LIMIT})')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Only download reviews newer than the ones in the review store')
+    parser.add_argument('--store-path', default=str(DEFAULT_STORE_PATH),
+                        help='Review store used by --incremental')
+    parser.add_argument('--diagnostics', metavar='PATH',
+                        help='Write per-stage timings, throughput and memory as JSON')
+    parser.add_argument('--trace-log', metavar='PATH',
+                        help='Append one JSON line per timed stage to this file')
+    parser.add_argument('--profile', metavar='PATH',
+                        help='Run under cProfile and dump the stats here (.prof)')
+    return parser
+
+
+def run(args: argparse.Namespace) -> int:
+    """
+    Run one batch job
+
+    Returns:
+        Process exit code (0 on success, 1 when no reviews were found)
+    """
+    # numpy-based; imported here so --help stays cheap
+    from src.services.review_deduplicator import create_deduplicator
+
+    urls = read_urls(args.urls_file)
+    if not urls:
+        print("No URLs found in", args.urls_file, file=sys.stderr)
+        return 1
+
+    review_store = ReviewStore(args.store_path) if args.incremental else None
+    checkpoint_store = None if args.no_checkpoints else CheckpointStore(args.checkpoint_path)
+    cache = None if args.no_cache else SentimentCache(path=args.cache_path)
+    scraper = GooglePlayScraper(
+        max_workers=args.workers,
+        requests_per_second=args.requests_per_second,
+        review_store=review_store,
+        max_retries=args.max_retries,
+        checkpoint_store=checkpoint_store,
+        deduplicator=create_deduplicator(args.dedup, args.dedup_threshold, args.dedup_short_copies)
+    )
+    analyzer = SentimentAnalyzer(
+        n_jobs=args.jobs,
+        cache=cache,
+        compact_results=True,
+        sentiment_backend=args.sentiment_backend
+    )
+
+    diagnostics = Instrumentation(log_path=args.trace_log, profile_path=args.profile)
+    try:
+        with diagnostics:
+            reviews_df, app_insights = scraper.scrape_reviews(urls)
+            if reviews_df.empty:
+                print("No reviews found for the provided URLs", file=sys.stderr)
+                return 1
+
+            analysis = analyzer.analyze_sentiment(reviews_df)
+
+            output_dir = Path(args.output_dir)
+            generator = ReportGenerator()
+            written = generator.generate_reports(
+                build_report_data(analysis, app_insights), output_dir, pdf=not args.no_pdf
+            )
+            if args.per_app_reports:
+                app_reports = per_app_reports(analyzer, reviews_df, app_insights, output_dir / 'apps')
+                generator.generate_batch(app_reports, n_jobs=args.jobs, pdf=not args.no_pdf)
+                written.append(output_dir / 'apps')
+            reviews_path = output_dir / f'reviews.{args.format}'
+            with instrumentation.span(f'export.{args.format}') as span:
+                write_reviews(reviews_df, reviews_path, analysis=analysis, app_insights=app_insights)
+                span.items = len(reviews_df)
+                span.bytes = reviews_path.stat().st_size
+            written.append(reviews_path)
+    finally:
+        if review_store is not None:
+            review_store.close()
+        if checkpoint_store is not None:
+            checkpoint_store.close()
+        if cache is not None:
+            cache.close()
+        if args.diagnostics:
+            print(f"Wrote diagnostics to {diagnostics.write_json(args.diagnostics)}")
+
+    print(
+        f"Analyzed {analysis['total_reviews']} reviews from {len(app_insights)} apps "
+        f"(average rating {analysis['average_rating']:.2f}, "
+        f"sentiment {analysis['average_sentiment']:.2f})"
+    )
+    for path in written:
+        print(f"Wrote {path}")
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    return run(build_parser().parse_args(argv))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
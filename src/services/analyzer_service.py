@@ -1,26 +1,124 @@
-from typing import Dict
-import pandas as pd
-from textblob import TextBlob
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Set, Tuple
 from collections import Counter
 from datetime import datetime
-import re
-from wordcloud import WordCloud
-import base64
-import io
+from src.config import DEFAULT_ANALYZER_JOBS, DEFAULT_CHUNK_SIZE, DEFAULT_SENTIMENT_BACKEND
+from src.services import instrumentation
+from src.services.sentiment_backends import available_backends, backend_factory, create_backend, register_backend
+from src.services.sentiment_cache import SentimentCache
+from src.services.text_normalizer import TextNormalizer
+
+# numpy/pandas, the sentiment backend's lexicon and wordcloud/PIL (via
+# WordCloudRenderer) are imported on first use, not at module import
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+    from src.interfaces.sentiment_backend_interface import SentimentBackendInterface
+    from src.services.sentiment_aggregator import SentimentAggregator
+    from src.services.wordcloud_renderer import WordCloudRenderer
+
+# Analyzer instance owned by each worker process of the parallel mode
+_worker_analyzer = None
+
+
+def _init_worker(stop_words: Set[str], sentiment_backend: str, factory: Callable):
+    """Build the per-process analyzer once, when the worker starts"""
+    global _worker_analyzer
+    # Spawned workers only know the built-in backends; the parent's factory
+    # arrives pickled by reference, which re-imports the module defining it
+    register_backend(sentiment_backend, factory)
+    _worker_analyzer = SentimentAnalyzer(sentiment_backend=sentiment_backend)
+    _worker_analyzer.stop_words = stop_words
+    _worker_analyzer.normalizer = TextNormalizer(stop_words)
+
+
+def _analyze_chunk(
+    contents: List[str],
+    keep_tokens: bool
+) -> Tuple[List[float], Counter, Optional[List[List[str]]]]:
+    """Score one chunk of reviews in a worker process"""
+    return _worker_analyzer._analyze_contents(contents, keep_tokens)
+
 
 class SentimentAnalyzer:
-    def __init__(self):
+    def __init__(
+        self,
+        n_jobs: int = DEFAULT_ANALYZER_JOBS,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        cache: Optional[SentimentCache] = None,
+        compact_results: bool = False,
+        sentiment_backend: str = DEFAULT_SENTIMENT_BACKEND
+    ):
+        """
+        Args:
+            n_jobs: Worker processes used to score large review sets
+                (1 = score in-process)
+            chunk_size: Reviews per worker task in parallel mode
+            cache: Memoizes sentiment and tokens per distinct review
+                text, so repeated texts are only scored once
+            compact_results: Store per-review scores in a 'sentiment' column
+                of the analyzed DataFrame instead of copying every review into
+                the result's 'sentiment_scores' and 'reviews_data' lists
+            sentiment_backend: Registered sentiment backend scoring the
+                reviews ('textblob' for exact TextBlob polarity, 'lexicon'
+                for the faster lookup-table approximation)
+        """
+        if sentiment_backend not in available_backends():
+            raise ValueError(
+                f"Unknown sentiment backend: {sentiment_backend} "
+                f"(available: {', '.join(available_backends())})"
+            )
+        self.n_jobs = max(1, int(n_jobs))
+        self.chunk_size = max(1, int(chunk_size))
+        self.cache = cache
+        self.compact_results = compact_results
+        self.sentiment_backend = sentiment_backend
         self.stop_words = {
             'app', 'use', 'using', 'used', 'would', 'could', 'please',
             'think', 'way', 'make', 'need', 'like', 'good', 'great',
             'want', 'get', 'got', 'one', 'also', 'much', 'many',
             'even', 'now', 'will', 'just', 'time'
         }
+        self.normalizer = TextNormalizer(self.stop_words)
+        self._scorer = None
+        self._wordcloud_renderer = None
+
+    @property
+    def scorer(self) -> SentimentBackendInterface:
+        """Sentiment backend, built (and its lexicon loaded) on the first scoring call"""
+        if self._scorer is None:
+            self._scorer = create_backend(self.sentiment_backend)
+        return self._scorer
+
+    @property
+    def wordcloud_renderer(self) -> WordCloudRenderer:
+        """Word cloud renderer, built (and wordcloud loaded) on the first render"""
+        if self._wordcloud_renderer is None:
+            from src.services.wordcloud_renderer import WordCloudRenderer
+            self._wordcloud_renderer = WordCloudRenderer()
+        return self._wordcloud_renderer
+
+    def config_key(self) -> Tuple:
+        """
+        Settings that change analysis results, for keying cached results
+
+        Worker count, chunk size and the sentiment cache only change how
+        results are computed, not the results, so they are left out.
+        """
+        return (self.sentiment_backend, self.compact_results, tuple(sorted(self.stop_words)))
 
     def analyze_sentiment(self, reviews_df: pd.DataFrame) -> Dict:
         """
         Analyze sentiments from the reviews DataFrame
+
+        Duplicates flagged by ReviewDeduplicator's 'weight' mode count by
+        their weight and are left out of the word counts.
         """
+        import numpy as np
+        from src.services.sentiment_aggregator import SentimentAggregator
+
         # Handle empty DataFrame
         if reviews_df.empty:
             return self._empty_analysis()
@@ -31,102 +129,294 @@ class SentimentAnalyzer:
             if col not in reviews_df.columns:
                 reviews_df[col] = None
         
-        # Calculate sentiments
-        sentiment_scores = []
-        common_words = Counter()
-        all_sentiments = []
-        cleaned_texts = []
-        
-        for _, row in reviews_df.iterrows():
-            content = str(row['content'])
-            blob = TextBlob(content)
-            sentiment = blob.sentiment.polarity
-            
-            sentiment_scores.append({
-                'text': content,
-                'score': sentiment
-            })
-            all_sentiments.append(sentiment)
-            
-            # Clean and process text for word cloud and common words
-            cleaned_text = self._clean_text(content)
-            cleaned_texts.append(cleaned_text)
-            
-            # Add words to counter
-            words = cleaned_text.split()
-            common_words.update(words)
-
-        # Calculate sentiment distribution
-        sentiment_distribution = self._get_sentiment_distribution(all_sentiments)
-
-        # Generate word cloud
-        wordcloud_base64 = self._generate_wordcloud(' '.join(cleaned_texts))
+        # Calculate sentiments for the whole column at once
+        contents = self._contents(reviews_df)
+        all_sentiments, common_words = self._analyze_texts(contents)
+
+        with instrumentation.span('analyze.aggregate') as span:
+            aggregator = SentimentAggregator().update(
+                all_sentiments,
+                self._ratings(reviews_df),
+                self._without_duplicates(common_words, reviews_df),
+                self._weights(reviews_df)
+            )
+            span.items = len(contents)
+        result = self.summarize(aggregator)
+
+        if self.compact_results:
+            # Scores stay next to the reviews they belong to
+            reviews_df['sentiment'] = np.asarray(all_sentiments, dtype=float)
+        else:
+            with instrumentation.span('analyze.reviews_data') as span:
+                result['sentiment_scores'] = [
+                    {'text': content, 'score': sentiment}
+                    for content, sentiment in zip(contents, all_sentiments)
+                ]
+                result['reviews_data'] = reviews_df.to_dict('records')
+                span.items = len(contents)
+        return result
+
+    def aggregate(
+        self,
+        batch: pd.DataFrame,
+        aggregator: Optional[SentimentAggregator] = None,
+        keep_scores: bool = False
+    ) -> SentimentAggregator:
+        """
+        Score a batch of reviews and fold it into an aggregator
+
+        Args:
+            batch: DataFrame with 'content' and 'score' columns
+            aggregator: Aggregator to update; a new one is created if omitted
+            keep_scores: Also store per-review scores in the batch's
+                'sentiment' column, as compact results do
+
+        Returns:
+            The updated aggregator
+        """
+        import numpy as np
+        from src.services.sentiment_aggregator import SentimentAggregator
+
+        if aggregator is None:
+            aggregator = SentimentAggregator()
+        if batch.empty:
+            return aggregator
+
+        contents = self._contents(batch)
+        sentiments, common_words = self._analyze_texts(contents)
+        if keep_scores:
+            batch['sentiment'] = np.asarray(sentiments, dtype=float)
+        with instrumentation.span('analyze.aggregate') as span:
+            span.items = len(contents)
+            return aggregator.update(
+                sentiments,
+                self._ratings(batch),
+                self._without_duplicates(common_words, batch),
+                self._weights(batch)
+            )
+
+    def aggregate_by_app(self, reviews_df: pd.DataFrame) -> Dict[str, SentimentAggregator]:
+        """
+        One aggregator per app_id, in first-seen order
+
+        Scores already stored in a 'sentiment' column (compact results) are
+        reused; otherwise each app's reviews are scored.
+        """
+        from src.services.sentiment_aggregator import SentimentAggregator
+
+        aggregators = {}
+        for app_id, app_df in reviews_df.groupby('app_id', observed=True, sort=False):
+            if 'sentiment' not in app_df.columns:
+                aggregators[app_id] = self.aggregate(app_df)
+                continue
+            with instrumentation.span('analyze.tokenize') as span:
+                if 'is_duplicate' in app_df.columns:
+                    common_words = self.normalizer.count_texts(self._contents(app_df[~app_df['is_duplicate']]))
+                else:
+                    common_words = self.normalizer.count_texts(self._contents(app_df))
+                span.items = len(app_df)
+            aggregators[app_id] = SentimentAggregator().update(
+                app_df['sentiment'].to_numpy(dtype=float),
+                self._ratings(app_df),
+                common_words,
+                self._weights(app_df)
+            )
+        return aggregators
+
+    def summarize(self, aggregator: SentimentAggregator) -> Dict:
+        """
+        Build the analysis result dict from an aggregator
+
+        Per-review data is not held by aggregators, so 'sentiment_scores'
+        and 'reviews_data' are left empty.
+        """
+        if not aggregator.total_reviews:
+            return self._empty_analysis()
 
+        metrics = aggregator.result()
+        with instrumentation.span('render.wordcloud') as span:
+            wordcloud_base64 = self._generate_wordcloud(aggregator.common_words)
+            span.bytes = len(wordcloud_base64)
         return {
-            'total_reviews': len(reviews_df),
-            'average_rating': float(reviews_df['score'].mean()) if 'score' in reviews_df.columns else 0.0,
-            'negative_reviews': len(reviews_df[reviews_df['score'] <= 3]) if 'score' in reviews_df.columns else 0,
-            'average_sentiment': sum(all_sentiments) / len(all_sentiments) if all_sentiments else 0.0,
-            'sentiment_scores': sentiment_scores,
-            'sentiment_distribution': sentiment_distribution,
-            'common_words': dict(common_words.most_common(10)),
-            'reviews_data': reviews_df.to_dict('records'),
+            'total_reviews': metrics['total_reviews'],
+            'average_rating': metrics['average_rating'],
+            'negative_reviews': metrics['negative_reviews'],
+            'average_sentiment': metrics['average_sentiment'],
+            'sentiment_scores': [],
+            'sentiment_distribution': metrics['sentiment_distribution'],
+            'common_words': metrics['common_words'],
+            'reviews_data': [],
+            # Word cloud from the same word counts
             'wordcloud_base64': wordcloud_base64
         }
 
+    def _analyze_texts(self, contents: List[str]) -> Tuple[List[float], Counter]:
+        """
+        Analyze review texts through the cache and/or process pool when enabled
+
+        Returns:
+            Tuple of (sentiments aligned with contents, word counts)
+        """
+        if self.cache is not None:
+            return self._analyze_cached(contents)
+        if self.n_jobs > 1 and len(contents) > self.chunk_size:
+            sentiments, common_words, _ = self._analyze_parallel(contents)
+        else:
+            sentiments, common_words, _ = self._analyze_contents(contents)
+        return sentiments, common_words
+
+    def _analyze_cached(self, contents: List[str]) -> Tuple[List[float], Counter]:
+        """
+        Analyze review texts, scoring only those missing from the cache
+        """
+        # Scores depend on the backend, tokens on the stop words
+        namespace = f"{self.sentiment_backend}:{' '.join(sorted(self.stop_words))}"
+        with instrumentation.span('analyze.cache_lookup') as span:
+            keys = [self.cache.key(content, namespace) for content in contents]
+            entries = self.cache.get_many(keys)
+            span.items = len(keys)
+
+        # Distinct texts not cached yet, in first-seen order
+        missing = {}
+        for key, content in zip(keys, contents):
+            if key not in entries and key not in missing:
+                missing[key] = content
+        instrumentation.count('sentiment_cache.hits', len(entries))
+        instrumentation.count('sentiment_cache.misses', len(missing))
+
+        if missing:
+            missing_contents = list(missing.values())
+            if self.n_jobs > 1 and len(missing_contents) > self.chunk_size:
+                sentiments, _, token_lists = self._analyze_parallel(missing_contents, keep_tokens=True)
+            else:
+                sentiments, _, token_lists = self._analyze_contents(missing_contents, keep_tokens=True)
+            scored = {
+                key: (sentiment, tuple(tokens))
+                for key, sentiment, tokens in zip(missing, sentiments, token_lists)
+            }
+            self.cache.put_many(scored)
+            entries.update(scored)
+
+        sentiments = [entries[key][0] for key in keys]
+        common_words = self.normalizer.count(entries[key][1] for key in keys)
+        return sentiments, common_words
+
+    def _analyze_contents(
+        self,
+        contents: List[str],
+        keep_tokens: bool = False
+    ) -> Tuple[List[float], Counter, Optional[List[List[str]]]]:
+        """
+        Score and tokenize a list of review texts
+
+        Args:
+            contents: Review texts
+            keep_tokens: Also return each review's tokens
+
+        Returns:
+            Tuple of (sentiments, word counts, tokens per review or None),
+            aligned with contents
+        """
+        with instrumentation.span('analyze.score', backend=self.sentiment_backend) as span:
+            sentiments = self.scorer.score(contents).tolist()
+            span.items = len(contents)
+            span.bytes = sum(map(len, contents))
+
+        # Token frequencies feed both the common words and the word cloud
+        with instrumentation.span('analyze.tokenize') as span:
+            span.items = len(contents)
+            if not keep_tokens:
+                return sentiments, self.normalizer.count_texts(contents), None
+            token_lists = self.normalizer.tokenize_batch(contents)
+            return sentiments, self.normalizer.count(token_lists), token_lists
+
+    def _analyze_parallel(
+        self,
+        contents: List[str],
+        keep_tokens: bool = False
+    ) -> Tuple[List[float], Counter, Optional[List[List[str]]]]:
+        """
+        Split contents into chunks and analyze them in a process pool
+
+        Chunks are merged in input order, so sentiments, tokens and the
+        counter's first-seen word order (which breaks most_common ties) are
+        the same as in the serial path.
+        """
+        chunks = [
+            contents[start:start + self.chunk_size]
+            for start in range(0, len(contents), self.chunk_size)
+        ]
+        sentiments = []
+        common_words = Counter()
+        token_lists = [] if keep_tokens else None
+
+        # Workers do not report their own spans; the pool is timed as a whole
+        with instrumentation.span('analyze.parallel', jobs=self.n_jobs) as span, ProcessPoolExecutor(
+            max_workers=min(self.n_jobs, len(chunks)),
+            initializer=_init_worker,
+            initargs=(self.stop_words, self.sentiment_backend, backend_factory(self.sentiment_backend))
+        ) as executor:
+            span.items = len(contents)
+            results = executor.map(_analyze_chunk, chunks, repeat(keep_tokens))
+            for chunk_sentiments, chunk_words, chunk_tokens in results:
+                sentiments.extend(chunk_sentiments)
+                common_words.update(chunk_words)
+                if keep_tokens:
+                    token_lists.extend(chunk_tokens)
+
+        return sentiments, common_words, token_lists
+
+    def analyze_batches(self, batches: Iterable[pd.DataFrame]) -> Dict:
+        """
+        Analyze reviews arriving as a stream of DataFrame batches
+
+        Only the aggregator's running totals and word counter are kept
+        between batches, so peak memory is bounded by the batch size.
+        Per-review data is not retained: 'sentiment_scores' and
+        'reviews_data' are left empty.
+        """
+        from src.services.sentiment_aggregator import SentimentAggregator
+
+        aggregator = SentimentAggregator()
+        for batch in batches:
+            self.aggregate(batch, aggregator)
+        return self.summarize(aggregator)
+
     def _clean_text(self, text: str) -> str:
         """Clean and preprocess text for word cloud and analysis"""
-        # Convert to lowercase
-        text = text.lower()
-        
-        # Remove special characters and numbers
-        text = re.sub(r'[^a-zA-Z\s]', '', text)
-        
-        # Split into words and remove stop words
-        words = [word for word in text.split() if word not in self.stop_words]
-        
-        return ' '.join(words)
-
-    def _generate_wordcloud(self, text: str) -> str:
-        """Generate word cloud and return as base64 string"""
-        if not text.strip():
-            return ''
-            
-        try:
-            wordcloud = WordCloud(
-                width=800,
-                height=400,
-                background_color='white',
-                min_font_size=10,
-                max_font_size=150,
-                colormap='viridis',
-                max_words=100
-            ).generate(text)
-
-            img = io.BytesIO()
-            wordcloud.to_image().save(img, format='PNG')
-            img.seek(0)
-            return base64.b64encode(img.getvalue()).decode()
-        except Exception as e:
-            print(f"Error generating word cloud: {e}")
-            return ''
-
-    def _get_sentiment_distribution(self, sentiments: list) -> Dict:
-        """Calculate sentiment distribution"""
-        ranges = {
-            'Very Negative': (-1.0, -0.6),
-            'Negative': (-0.6, -0.2),
-            'Neutral': (-0.2, 0.2),
-            'Positive': (0.2, 0.6),
-            'Very Positive': (0.6, 1.0)
-        }
+        return ' '.join(self.normalizer.tokenize(text))
+
+    def _generate_wordcloud(self, frequencies: Dict[str, int]) -> str:
+        """Generate word cloud from word counts and return as base64 string"""
+        return self.wordcloud_renderer.render(frequencies)
+
+    def _contents(self, reviews_df: pd.DataFrame) -> List[str]:
+        """Review texts as Python strings, with missing content as ''"""
+        if 'content' not in reviews_df.columns:
+            return [''] * len(reviews_df)
+        return reviews_df['content'].fillna('').astype(str).tolist()
+
+    def _ratings(self, reviews_df: pd.DataFrame) -> Optional[np.ndarray]:
+        """Star ratings as floats, with unparseable values as NaN"""
+        import numpy as np
+        import pandas as pd
+
+        if 'score' not in reviews_df.columns:
+            return None
+        return pd.to_numeric(reviews_df['score'], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
 
-        distribution = {}
-        for label, (low, high) in ranges.items():
-            count = sum(1 for s in sentiments if low <= s < high)
-            distribution[label] = count
+    def _weights(self, reviews_df: pd.DataFrame) -> Optional[np.ndarray]:
+        """Review weights set by ReviewDeduplicator's 'weight' mode, if any"""
+        if 'weight' not in reviews_df.columns:
+            return None
+        return reviews_df['weight'].to_numpy(dtype=float)
 
-        return distribution
+    def _without_duplicates(self, common_words: Counter, reviews_df: pd.DataFrame) -> Counter:
+        """Word counts minus those of the reviews flagged as duplicates"""
+        if 'is_duplicate' not in reviews_df.columns or not reviews_df['is_duplicate'].any():
+            return common_words
+        duplicates = self._contents(reviews_df[reviews_df['is_duplicate']])
+        return common_words - self.normalizer.count_texts(duplicates)
 
     def _empty_analysis(self) -> Dict:
         """Return empty analysis structure"""
@@ -0,0 +1,106 @@
+import pickle
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+from src.config import DEFAULT_CHECKPOINT_MAX_AGE_SECONDS, DEFAULT_CHECKPOINT_PATH
+
+
+class CheckpointStore:
+    """
+    Persistent SQLite checkpoints of in-progress review fetches
+
+    For each app being fetched, keeps the pages downloaded so far and the
+    continuation token of the next page, so an interrupted fetch can resume
+    where it stopped. Pages and tokens are pickled: the store is a local
+    cache written and read by this process only.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path] = DEFAULT_CHECKPOINT_PATH,
+        max_age_seconds: Optional[float] = DEFAULT_CHECKPOINT_MAX_AGE_SECONDS
+    ):
+        """
+        Args:
+            path: SQLite database file (':memory:' for a throwaway store)
+            max_age_seconds: Checkpoints not updated for longer than this are
+                discarded instead of resumed, since reviews posted meanwhile
+                would be missed; None keeps them forever
+        """
+        self.path = Path(path)
+        self.max_age_seconds = max_age_seconds
+        if str(path) != ':memory:':
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        # One connection shared by scraper worker threads, serialized by a lock
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS fetch_state ("
+                "app_id TEXT PRIMARY KEY, token BLOB, pages INTEGER NOT NULL, updated_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS fetch_pages ("
+                "app_id TEXT NOT NULL, page INTEGER NOT NULL, reviews BLOB NOT NULL, "
+                "PRIMARY KEY (app_id, page))"
+            )
+
+    def load(self, app_id: str) -> Optional[Tuple[object, List[Dict]]]:
+        """
+        Return the checkpoint of an unfinished fetch
+
+        Returns:
+            Tuple of (continuation token of the next page, reviews fetched so
+            far), or None when there is no resumable checkpoint
+        """
+        with self._lock:
+            state = self._conn.execute(
+                "SELECT token, updated_at FROM fetch_state WHERE app_id = ?", (app_id,)
+            ).fetchone()
+            if state is None:
+                return None
+            token, updated_at = state
+            expired = self.max_age_seconds is not None and time.time() - updated_at > self.max_age_seconds
+            pages = [] if expired else self._conn.execute(
+                "SELECT reviews FROM fetch_pages WHERE app_id = ? ORDER BY page", (app_id,)
+            ).fetchall()
+        if expired:
+            self.clear(app_id)
+            return None
+        reviews = [review for (page,) in pages for review in pickle.loads(page)]
+        return pickle.loads(token), reviews
+
+    def save_page(self, app_id: str, reviews: List[Dict], token) -> int:
+        """
+        Append a fetched page and the token of the page after it, atomically
+
+        Returns:
+            Number of pages checkpointed for the app
+        """
+        with self._lock, self._conn:
+            state = self._conn.execute(
+                "SELECT pages FROM fetch_state WHERE app_id = ?", (app_id,)
+            ).fetchone()
+            page = state[0] if state else 0
+            self._conn.execute(
+                "INSERT OR REPLACE INTO fetch_pages (app_id, page, reviews) VALUES (?, ?, ?)",
+                (app_id, page, pickle.dumps(reviews, pickle.HIGHEST_PROTOCOL))
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO fetch_state (app_id, token, pages, updated_at) VALUES (?, ?, ?, ?)",
+                (app_id, pickle.dumps(token, pickle.HIGHEST_PROTOCOL), page + 1, time.time())
+            )
+            return page + 1
+
+    def clear(self, app_id: str):
+        """Drop an app's checkpoint, once its fetch completed"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM fetch_pages WHERE app_id = ?", (app_id,))
+            self._conn.execute("DELETE FROM fetch_state WHERE app_id = ?", (app_id,))
+
+    def close(self):
+        """Close the underlying database connection"""
+        with self._lock:
+            self._conn.close()
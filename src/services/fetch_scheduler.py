@@ -0,0 +1,202 @@
+import random
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from src.config import (
+    DEFAULT_BACKOFF_SECONDS,
+    DEFAULT_COUNTRY,
+    DEFAULT_FETCH_PAGE_SIZE,
+    DEFAULT_LANG,
+    DEFAULT_MAX_BACKOFF_SECONDS,
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_REQUESTS_PER_SECOND,
+    PLAY_STORE_HOST,
+)
+from src.services import instrumentation
+from src.services.checkpoint_store import CheckpointStore
+from src.services.rate_limiter import HostRateLimiter
+
+# Errors that retrying cannot fix: bugs, and apps that do not exist
+# (google_play_scraper.exceptions.NotFoundError, matched by name so the
+# library is not imported here)
+PERMANENT_ERRORS = (TypeError, AttributeError, NotImplementedError)
+PERMANENT_ERROR_NAMES = {'NotFoundError'}
+
+
+class TruncatedWalkError(ConnectionError):
+    """A review walk came back empty before reaching the app's review count"""
+
+
+def is_transient(error: Exception) -> bool:
+    """
+    Whether a failed request is worth retrying
+
+    Failed page requests surface as generic errors (HTTP errors on
+    throttling, JSON and index errors on an unexpected page, and
+    TruncatedWalkError from backends that swallow them), so everything but
+    the permanent errors above is retried.
+    """
+    if isinstance(error, PERMANENT_ERRORS):
+        return False
+    return not any(cls.__name__ in PERMANENT_ERROR_NAMES for cls in type(error).__mro__)
+
+
+class FetchScheduler:
+    """
+    Issues Play Store requests under a shared rate budget, with retries
+
+    Every attempt, retries included, waits for a slot of one HostRateLimiter,
+    so all workers sharing the scheduler stay within one requests-per-second
+    budget. Transient errors are retried with full-jitter exponential backoff.
+    With a CheckpointStore, full review fetches are checkpointed page by page
+    and resume from the last saved page after a failure or a killed run.
+    """
+
+    def __init__(
+        self,
+        requests_per_second: Optional[float] = DEFAULT_REQUESTS_PER_SECOND,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff_seconds: float = DEFAULT_BACKOFF_SECONDS,
+        max_backoff_seconds: float = DEFAULT_MAX_BACKOFF_SECONDS,
+        checkpoint_store: Optional[CheckpointStore] = None,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        """
+        Args:
+            requests_per_second: Request budget shared by every caller, None
+                for no limit
+            max_retries: Retries of a failed request before giving up
+            backoff_seconds: Cap of the first retry's delay; doubles per retry
+            max_backoff_seconds: Upper bound of the delay cap
+            checkpoint_store: Makes fetch_all_reviews resumable
+            sleep: Called with each backoff delay (tests pass a recorder)
+        """
+        self.rate_limiter = HostRateLimiter(requests_per_second)
+        self.max_retries = max(0, int(max_retries))
+        self.backoff_seconds = backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.checkpoint_store = checkpoint_store
+        self._sleep = sleep
+
+    def call(self, request: Callable, *args, **kwargs):
+        """
+        Issue one request, retrying transient failures
+
+        Raises:
+            The last error once retries are exhausted, or the first
+            permanent error
+        """
+        attempt = 0
+        while True:
+            self.rate_limiter.acquire(PLAY_STORE_HOST)
+            try:
+                return request(*args, **kwargs)
+            except Exception as e:
+                if attempt >= self.max_retries or not is_transient(e):
+                    raise
+                delay = self.backoff_delay(attempt)
+                attempt += 1
+                instrumentation.count('fetch.retries')
+                print(f"Request failed ({e}); retry {attempt} of {self.max_retries} in {delay:.1f}s")
+                self._sleep(delay)
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Full-jitter delay before retry number attempt + 1"""
+        cap = min(self.max_backoff_seconds, self.backoff_seconds * 2 ** attempt)
+        return random.uniform(0, cap)
+
+    def iter_pages(
+        self,
+        backend,
+        app_id: str,
+        page_size: int,
+        continuation_token=None,
+        expected_reviews: Optional[int] = None
+    ) -> Iterator[Tuple[List[Dict], object]]:
+        """
+        Page through an app's reviews, newest first, retrying each page
+
+        google_play_scraper's own reviews() returns a failed page as an empty
+        page without a next token, the same as the end of the reviews. An
+        empty page before ``expected_reviews`` reviews were fetched is
+        therefore raised as a TruncatedWalkError and retried like any failure.
+
+        Args:
+            backend: Object exposing google_play_scraper's ``reviews``
+            continuation_token: Token to resume from; None starts at the newest
+            expected_reviews: Reviews this walk should reach (e.g. the app's
+                review count), None to trust the first empty page
+
+        Yields:
+            Tuples of (non-empty page of reviews, token of the next page)
+        """
+        fetched = 0
+
+        def fetch_page(token):
+            batch, next_token = backend.reviews(
+                app_id,
+                lang=DEFAULT_LANG,
+                country=DEFAULT_COUNTRY,
+                count=page_size,
+                continuation_token=token,
+            )
+            if not batch and expected_reviews is not None and fetched < expected_reviews:
+                raise TruncatedWalkError(
+                    f"{app_id} reviews ended after {fetched} of {expected_reviews}"
+                )
+            return batch, next_token
+
+        while continuation_token is None or continuation_token.token is not None:
+            with instrumentation.span('fetch.page', app_id=app_id) as span:
+                batch, continuation_token = self.call(fetch_page, continuation_token)
+                span.items = len(batch)
+            if not batch:
+                break
+            fetched += len(batch)
+            yield batch, continuation_token
+            if continuation_token is None:
+                break
+
+    def fetch_all_reviews(
+        self,
+        backend,
+        app_id: str,
+        page_size: int = DEFAULT_FETCH_PAGE_SIZE,
+        expected_reviews: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Fetch every review of an app, resuming from its checkpoint if any
+
+        Each page is checkpointed as it arrives and the checkpoint is dropped
+        once the last page is in. If the fetch fails, including a walk that
+        ends early (see iter_pages), the checkpoint stays so the next call
+        only requests the remaining pages.
+
+        Args:
+            expected_reviews: The app's review count, see iter_pages
+
+        Returns:
+            The app's reviews, newest first
+        """
+        reviews, token = [], None
+        if self.checkpoint_store is not None:
+            checkpoint = self.checkpoint_store.load(app_id)
+            if checkpoint is not None:
+                token, reviews = checkpoint
+                instrumentation.count('fetch.resumed_reviews', len(reviews))
+                print(f"Resuming {app_id} from checkpoint ({len(reviews)} reviews already fetched)")
+
+        resumed = bool(reviews)
+        if expected_reviews is not None:
+            expected_reviews -= len(reviews)
+        for batch, token in self.iter_pages(backend, app_id, page_size, token, expected_reviews):
+            reviews.extend(batch)
+            if self.checkpoint_store is not None:
+                self.checkpoint_store.save_page(app_id, batch, token)
+
+        if self.checkpoint_store is not None:
+            self.checkpoint_store.clear(app_id)
+        if resumed:
+            # Reviews posted while the fetch was interrupted shift the pages,
+            # so the first resumed page may repeat a few stored reviews
+            reviews = list({review['reviewId']: review for review in reviews}.values())
+        return reviews
@@ -0,0 +1,199 @@
+from __future__ import annotations
+import contextlib
+import json
+import threading
+import time
+from contextvars import ContextVar
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Dict, Iterator, List, Optional, Union
+
+# cProfile/pstats are only imported when profiling is requested
+if TYPE_CHECKING:
+    import cProfile
+
+try:
+    import resource
+except ImportError:  # Windows: no peak RSS, spans still time
+    resource = None
+
+# Recorder of the run in progress; services report to whichever one is active
+_current: ContextVar[Optional['Instrumentation']] = ContextVar('instrumentation', default=None)
+
+
+class Span:
+    """One timed stage; set ``items`` and ``bytes`` to report throughput"""
+
+    __slots__ = ('name', 'attrs', 'items', 'bytes')
+
+    def __init__(self, name: str, attrs: Dict):
+        self.name = name
+        self.attrs = attrs
+        self.items = 0
+        self.bytes = 0
+
+
+class Instrumentation:
+    """
+    Collects per-stage spans and counters for one pipeline run
+
+    Activate it with ``with Instrumentation() as instr:``; the services then
+    report their stages through the module-level span() and count(). Outside
+    an active run those calls are no-ops.
+
+    Spans with the same name are aggregated into calls, total and max
+    seconds, items, bytes and items per second. Memory is reported as the
+    process's peak RSS reached by the end of the stage (the highest over its
+    calls). It is a process-wide high-water mark, not the stage's own usage:
+    it does not add up across stages, and a stage running after the peak
+    shows that earlier peak.
+    """
+
+    def __init__(
+        self,
+        log_path: Optional[Union[str, Path]] = None,
+        profile: bool = False,
+        profile_path: Optional[Union[str, Path]] = None
+    ):
+        """
+        Args:
+            log_path: Append one JSON line per finished span to this file
+            profile: Run cProfile over the thread that activates the run
+            profile_path: Also dump the raw cProfile stats here (.prof)
+        """
+        self.log_path = Path(log_path) if log_path else None
+        self.profile = profile or profile_path is not None
+        self.profile_path = Path(profile_path) if profile_path else None
+        self.stages: Dict[str, Dict] = {}
+        self.counters: Dict[str, int] = {}
+        self.profile_top: List[Dict] = []
+        self.wall_seconds = 0.0
+        self._lock = threading.Lock()
+        self._log: Optional[IO[str]] = None
+        self._profiler: Optional[cProfile.Profile] = None
+        self._token = None
+        self._started = None
+
+    def __enter__(self) -> 'Instrumentation':
+        self._token = _current.set(self)
+        self._started = time.perf_counter()
+        if self.log_path is not None:
+            # Opened once: spans from concurrent fetch threads only append a line
+            self._log = self.log_path.open('a', encoding='utf-8')
+        if self.profile:
+            import cProfile
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._profiler is not None:
+            self._profiler.disable()
+            self._collect_profile()
+        self.wall_seconds = time.perf_counter() - self._started
+        _current.reset(self._token)
+        if self._log is not None:
+            with self._lock:
+                self._log.close()
+                self._log = None
+
+    @contextlib.contextmanager
+    def span(self, name: str, **attrs) -> Iterator[Span]:
+        """Time a stage; attributes are kept in the structured log"""
+        span = Span(name, attrs)
+        start = time.perf_counter()
+        try:
+            yield span
+        finally:
+            self._record(span, time.perf_counter() - start, _peak_rss_mb())
+
+    def count(self, name: str, value: int = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def summary(self) -> Dict:
+        """JSON-ready report of the run"""
+        with self._lock:
+            stages = {
+                name: {
+                    **stage,
+                    'seconds': round(stage['seconds'], 6),
+                    'max_seconds': round(stage['max_seconds'], 6),
+                    'items_per_second': (
+                        round(stage['items'] / stage['seconds'], 1)
+                        if stage['items'] and stage['seconds'] else None
+                    ),
+                }
+                for name, stage in self.stages.items()
+            }
+            return {
+                'wall_seconds': round(self.wall_seconds, 6),
+                'stages': stages,
+                'counters': dict(self.counters),
+                'profile': list(self.profile_top),
+            }
+
+    def write_json(self, path: Union[str, Path]) -> Path:
+        """Write summary() to a JSON file"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.summary(), indent=2))
+        return path
+
+    def _record(self, span: Span, seconds: float, peak_rss_mb: float):
+        with self._lock:
+            stage = self.stages.setdefault(span.name, {
+                'calls': 0, 'seconds': 0.0, 'max_seconds': 0.0,
+                'items': 0, 'bytes': 0, 'peak_rss_mb': 0.0,
+            })
+            stage['calls'] += 1
+            stage['seconds'] += seconds
+            stage['max_seconds'] = max(stage['max_seconds'], seconds)
+            stage['items'] += span.items
+            stage['bytes'] += span.bytes
+            stage['peak_rss_mb'] = max(stage['peak_rss_mb'], round(peak_rss_mb, 1))
+            if self._log is not None:
+                self._log.write(json.dumps({
+                    'span': span.name, 'seconds': round(seconds, 6),
+                    'items': span.items, 'bytes': span.bytes, **span.attrs,
+                }, default=str) + '\n')
+
+    def _collect_profile(self, limit: int = 25):
+        import pstats
+
+        if self.profile_path is not None:
+            self.profile_path.parent.mkdir(parents=True, exist_ok=True)
+            self._profiler.dump_stats(str(self.profile_path))
+        stats = pstats.Stats(self._profiler)
+        rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:limit]
+        self.profile_top = [
+            {
+                'function': f"{filename}:{line}({function})",
+                'calls': calls,
+                'own_seconds': round(own, 6),
+                'cumulative_seconds': round(cumulative, 6),
+            }
+            for (filename, line, function), (_, calls, own, cumulative, _) in rows
+        ]
+
+
+_NULL_SPAN = Span('', {})
+
+
+def span(name: str, **attrs):
+    """Time a stage of the active run; a no-op when nothing is recording"""
+    instrumentation = _current.get()
+    if instrumentation is None:
+        return contextlib.nullcontext(_NULL_SPAN)
+    return instrumentation.span(name, **attrs)
+
+
+def count(name: str, value: int = 1):
+    """Add to a counter of the active run, if any"""
+    instrumentation = _current.get()
+    if instrumentation is not None:
+        instrumentation.count(name, value)
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024 if resource else 0.0
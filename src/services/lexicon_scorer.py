@@ -0,0 +1,91 @@
+import re
+from typing import Sequence
+import numpy as np
+import pandas as pd
+from textblob._text import EMOTICONS
+from textblob.en import sentiment as pattern_sentiment
+from src.interfaces.sentiment_backend_interface import SentimentBackendInterface
+
+# Lowercase words (keeping contractions like "don't" together), "!" and
+# the common emoticons
+WORD_PATTERN = re.compile(r"[a-z]+(?:'[a-z]+)?|!|<3|[:;=8x][-o^']?[()\[\]dp/\\|*]")
+
+
+class LexiconScorer(SentimentBackendInterface):
+    """
+    Fast lexicon lookup-table polarity, approximating TextBlob
+
+    The pattern lexicon TextBlob uses is precompiled into a word -> polarity
+    table. Texts are split with one regex instead of pattern's tokenizer, and
+    only the main rules are kept: a negation word ("not", "never", "...n't")
+    flips the next sentiment word to -0.5x its polarity, a modifier such as
+    "very" scales it by the modifier's intensity, "!" boosts the last word and
+    common emoticons count as words. Pattern's finer modifier/negation
+    scoping is skipped, so scores differ slightly from TextBlob's. Use
+    PolarityScorer where exact TextBlob parity matters.
+    """
+
+    name = 'lexicon'
+
+    def __init__(self):
+        lexicon = pattern_sentiment
+        lexicon.load()
+        # word -> polarity of the part-of-speech averaged entry
+        self._polarity = {word: entry[None][0] for word, entry in dict.items(lexicon)}
+        # modifier word -> intensity it applies to the next word
+        self._intensity = {
+            word: entry[None][2] for word, entry in dict.items(lexicon)
+            if any(pos in entry for pos in lexicon.modifiers)
+        }
+        self._negations = set(lexicon.negations)
+        # Emoticons count as known words, first match wins like pattern's scan
+        for (_, polarity), emoticons in EMOTICONS.items():
+            for emoticon in emoticons:
+                self._polarity.setdefault(emoticon.lower(), polarity)
+
+    def score(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Score a batch of texts
+
+        Returns:
+            Array of polarities in [-1.0, 1.0], aligned with texts
+        """
+        if len(texts) == 0:
+            return np.empty(0, dtype=float)
+        codes, uniques = pd.factorize(pd.Series(texts, dtype=object), use_na_sentinel=False)
+        words = pd.Series(uniques, dtype=str).str.lower().str.findall(WORD_PATTERN).tolist()
+        unique_scores = np.fromiter(
+            (self._score_words(text_words) for text_words in words),
+            dtype=float,
+            count=len(uniques)
+        )
+        return unique_scores[codes]
+
+    def _score_words(self, words: Sequence[str]) -> float:
+        polarity = self._polarity
+        # One polarity per assessed word, as in pattern's assessments
+        scores = []
+        modifier = None
+        negated = False
+        for word in words:
+            p = polarity.get(word)
+            if p is not None:
+                if modifier is None:
+                    scores.append(p)
+                else:
+                    # "very good" replaces the modifier's own entry
+                    scores[-1] = max(-1.0, min(p * modifier, 1.0))
+                modifier = self._intensity.get(word)
+                # "not really good": the negation carries over the modifier
+                if negated and modifier is None:
+                    scores[-1] *= -0.5
+                    negated = False
+            elif word == '!':
+                if scores:
+                    scores[-1] = max(-1.0, min(scores[-1] * 1.25, 1.0))
+            elif word in self._negations or word.endswith("n't"):
+                negated = True
+        if negated and modifier is not None:
+            # Trailing "not very"
+            scores[-1] *= -0.5
+        return sum(scores) / len(scores) if scores else 0.0
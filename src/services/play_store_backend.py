@@ -0,0 +1,81 @@
+from typing import Dict, List, Tuple
+from src.config import DEFAULT_COUNTRY, DEFAULT_LANG
+
+
+class PlayStoreBackend:
+    """
+    The google_play_scraper module, with review pages that raise on failure
+
+    The library's reviews() catches any error of its page request and returns
+    the reviews fetched so far with no continuation token, which looks exactly
+    like the last page: a throttled walk would end early and be taken as
+    complete. reviews() here issues the same page requests through the
+    library's page-level fetch, so errors reach FetchScheduler's retries and
+    checkpoints. Every other attribute is the library's own.
+    """
+
+    def __init__(self):
+        import google_play_scraper
+        from google_play_scraper.features import reviews as reviews_feature
+
+        self._module = google_play_scraper
+        self._feature = reviews_feature
+
+    def __getattr__(self, name):
+        return getattr(self._module, name)
+
+    def reviews(
+        self,
+        app_id: str,
+        lang: str = DEFAULT_LANG,
+        country: str = DEFAULT_COUNTRY,
+        sort=None,
+        count: int = 100,
+        filter_score_with=None,
+        filter_device_with=None,
+        continuation_token=None
+    ) -> Tuple[List[Dict], object]:
+        """
+        Same arguments and result as google_play_scraper.reviews()
+
+        Raises:
+            Any error of the underlying page requests
+        """
+        feature = self._feature
+        if continuation_token is not None:
+            if continuation_token.token is None:
+                return [], continuation_token
+            token = continuation_token.token
+            lang, country = continuation_token.lang, continuation_token.country
+            sort, count = continuation_token.sort, continuation_token.count
+            filter_score_with = continuation_token.filter_score_with
+            filter_device_with = continuation_token.filter_device_with
+        else:
+            token = None
+            sort = (sort or self._module.Sort.NEWEST).value
+
+        url = feature.Formats.Reviews.build(lang=lang, country=country)
+        result = []
+        while len(result) < count:
+            items, token = feature._fetch_review_items(
+                url,
+                app_id,
+                sort,
+                min(count - len(result), feature.MAX_COUNT_EACH_FETCH),
+                filter_score_with,
+                filter_device_with,
+                token,
+            )
+            result.extend(
+                {key: spec.extract_content(item) for key, spec in feature.ElementSpecs.Review.items()}
+                for item in items
+            )
+            # A list in place of the token also marks the last page
+            if isinstance(token, list):
+                token = None
+            if token is None or not items:
+                break
+
+        return result, feature._ContinuationToken(
+            token, lang, country, sort, count, filter_score_with, filter_device_with
+        )
@@ -0,0 +1,130 @@
+from typing import Sequence
+import numpy as np
+import pandas as pd
+from textblob._text import EMOTICONS, PUNCTUATION, replacements
+from textblob.en import sentiment as pattern_sentiment
+from src.interfaces.sentiment_backend_interface import SentimentBackendInterface
+
+
+class PolarityScorer(SentimentBackendInterface):
+    """
+    Batched, lexicon-preloaded equivalent of ``TextBlob(text).sentiment.polarity``
+
+    TextBlob builds a blob object per text and looks every word up through
+    pattern's lazy dictionary. This scorer flattens the pattern lexicon into
+    plain lookup tables once, scores each distinct text of a batch only once
+    and scatters the results back with a NumPy gather. The negation/modifier
+    rules are applied exactly as pattern does, so the scores are identical.
+    """
+
+    name = 'textblob'
+
+    def __init__(self):
+        lexicon = pattern_sentiment
+        lexicon.load()
+        # word -> (polarity, intensity) of the part-of-speech averaged entry
+        self._words = {
+            word: (entry[None][0], entry[None][2]) for word, entry in dict.items(lexicon)
+        }
+        # Known words that modify the next word ("very", "really", ...)
+        self._modifier_words = {
+            word for word, entry in dict.items(lexicon)
+            if any(pos in entry for pos in lexicon.modifiers)
+        }
+        self._negations = set(lexicon.negations)
+        self._is_modifier = lexicon.modifier
+        # Lowercased emoticon -> polarity, first match wins like pattern's scan
+        self._emoticons = {}
+        for (_, polarity), emoticons in EMOTICONS.items():
+            for emoticon in emoticons:
+                self._emoticons.setdefault(emoticon.lower(), polarity)
+        self._tokenize = lexicon.tokenizer
+
+    def score(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Score a batch of texts
+
+        Returns:
+            Array of polarities in [-1.0, 1.0], aligned with texts
+        """
+        if len(texts) == 0:
+            return np.empty(0, dtype=float)
+        codes, uniques = pd.factorize(pd.Series(texts, dtype=object), use_na_sentinel=False)
+        # pattern's tokenizer starts by splitting contractions ("don't" ->
+        # "do n't") with one re.sub per rule; these are literal rewrites, so
+        # run them once over the whole column instead of per text
+        prepared = pd.Series(uniques, dtype=str)
+        for contraction, split in replacements.items():
+            prepared = prepared.str.replace(contraction, split, regex=False)
+        unique_scores = np.fromiter(
+            (self._polarity(text, {}) for text in prepared.tolist()),
+            dtype=float,
+            count=len(uniques)
+        )
+        return unique_scores[codes]
+
+    def polarity(self, text: str) -> float:
+        """Polarity of a single text, as TextBlob computes it"""
+        return self._polarity(text, replacements)
+
+    def _polarity(self, text: str, contractions: dict) -> float:
+        """
+        Run pattern's assessment rules over a text
+
+        Args:
+            text: Text to score
+            contractions: Contraction rewrites still to apply while tokenizing
+                (empty when the batch pre-pass has already applied them)
+        """
+        words = self._words
+        # One [polarity, intensity, negated] entry per assessed chunk
+        assessments = []
+        modifier = None
+        negation = None
+
+        for word in ' '.join(self._tokenize(text, replace=contractions)).split():
+            word = word.lower()
+            known = words.get(word)
+            if known is not None:
+                p, i = known
+                if modifier is None:
+                    assessments.append([p, i, False])
+                else:
+                    # "really good": scale by the modifier's intensity
+                    last = assessments[-1]
+                    last[0] = max(-1.0, min(p * last[1], 1.0))
+                    last[1] = i
+                if negation is not None:
+                    # "not (really) good"
+                    last = assessments[-1]
+                    last[1] = 1.0 / last[1]
+                    last[2] = True
+                modifier = word if word in self._modifier_words else None
+                negation = word if word in self._negations else None
+            else:
+                if word in self._negations:
+                    negation = word
+                elif negation and len(word.strip("'")) > 1:
+                    # Negation survives small words ("not a good")
+                    negation = None
+                if negation is not None and modifier is not None and self._is_modifier(modifier):
+                    # "really not good"
+                    assessments[-1][2] = True
+                    negation = None
+                elif modifier and len(word) > 2:
+                    # Modifier survives small words ("really is a good")
+                    modifier = None
+                if word == '!' and assessments:
+                    assessments[-1][0] = max(-1.0, min(assessments[-1][0] * 1.25, 1.0))
+                if word == '(!)':
+                    assessments.append([0.0, 1.0, False])
+                if word.isalpha() is False and len(word) <= 5 and word not in PUNCTUATION:
+                    emoticon = self._emoticons.get(word)
+                    if emoticon is not None:
+                        assessments.append([emoticon, 1.0, False])
+
+        # Same left-to-right summation as pattern, "not good" = slightly bad
+        total = 0
+        for p, _, negated in assessments:
+            total += p * -0.5 if negated else p
+        return total / float(len(assessments) or 1)
@@ -0,0 +1,54 @@
+import threading
+import time
+from typing import Dict, Optional
+
+
+class RateLimiter:
+    """Thread-safe limiter that spaces calls at a fixed requests-per-second rate"""
+
+    def __init__(self, requests_per_second: Optional[float] = None):
+        if requests_per_second is not None and requests_per_second <= 0:
+            raise ValueError("requests_per_second must be positive")
+        self.interval = 1.0 / requests_per_second if requests_per_second else 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        Block until the caller may issue its next request
+
+        Returns:
+            Seconds spent waiting
+        """
+        if not self.interval:
+            return 0.0
+
+        # Reserve a slot under the lock, sleep outside it so other threads
+        # can queue up their own slots meanwhile
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+
+        wait = slot - now
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class HostRateLimiter:
+    """Keeps one RateLimiter per host so each host gets its own budget"""
+
+    def __init__(self, requests_per_second: Optional[float] = None):
+        self.requests_per_second = requests_per_second
+        self._limiters: Dict[str, RateLimiter] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, host: str) -> float:
+        """Block until a request to the given host is allowed"""
+        with self._lock:
+            limiter = self._limiters.get(host)
+            if limiter is None:
+                limiter = RateLimiter(self.requests_per_second)
+                self._limiters[host] = limiter
+        return limiter.acquire()
@@ -1,40 +1,265 @@
-import pandas as pd
+import csv
+import os
+from itertools import repeat
 from pathlib import Path
-from typing import Dict
-from fpdf import FPDF
+from typing import Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+from src.config import DEFAULT_ANALYZER_JOBS
 from src.interfaces.report_generator_interface import ReportGeneratorInterface
+from src.services import instrumentation
+
+# Issues listed in the PDF report (the CSV lists all of them); the word
+# cloud covers the long tail
+REPORT_TOP_ISSUES = 20
+# Per-app insight columns, in report order, with their PDF headers and widths (mm)
+APP_COLUMNS = (
+    ('app_name', 'App', 70),
+    ('reviews_analyzed', 'Reviews', 25),
+    ('app_rating', 'Store Rating', 25),
+    ('average_rating', 'Avg Rating', 25),
+    ('negative_reviews', 'Negative', 25),
+)
+
+
+def build_report_data(
+    analysis: Dict,
+    app_insights: Optional[Sequence[Dict]] = None,
+    word_frequencies: Optional[Mapping[str, int]] = None
+) -> Dict:
+    """
+    Precompute the aggregates a report renders from an analysis result
+
+    Per-review data ('sentiment_scores', 'reviews_data') is left out, so
+    report data stays small enough to hand to worker processes.
+
+    Args:
+        analysis: Result of SentimentAnalyzer.analyze_sentiment/summarize,
+            or SentimentAggregator.result()
+        app_insights: Per-app insight rows
+        word_frequencies: Word counts to render the word cloud from, when
+            the analysis has no rendered 'wordcloud_base64'
+    """
+    return {
+        'average_rating': analysis['average_rating'],
+        'total_reviews': analysis['total_reviews'],
+        'negative_reviews': analysis.get('negative_reviews'),
+        'average_sentiment': analysis.get('average_sentiment'),
+        'sentiment_distribution': dict(analysis.get('sentiment_distribution') or {}),
+        'common_issues': dict(analysis['common_words']),
+        'wordcloud_base64': analysis.get('wordcloud_base64') or '',
+        'word_frequencies': dict(word_frequencies or {}),
+        'app_insights': list(app_insights or []),
+    }
+
+
+def _generate_reports(data: Dict, output_path: Path, pdf: bool) -> List[Path]:
+    """Generate one report set in a worker process"""
+    return ReportGenerator().generate_reports(data, output_path, pdf)
+
+
+def _pdf_text(value) -> str:
+    """The core PDF fonts only cover Latin-1; replace anything else"""
+    return str(value).encode('latin-1', 'replace').decode('latin-1')
+
 
 class ReportGenerator(ReportGeneratorInterface):
+    """
+    Writes CSV and PDF reports from precomputed analysis aggregates
+
+    ``data`` holds at least 'average_rating', 'total_reviews' and
+    'common_issues'; the other sections of build_report_data() are rendered
+    when present.
+    """
+
+    # fpdf, wordcloud and the process pool are imported by the report that needs them
     def generate_csv(self, data: Dict, output_path: Path) -> Path:
-        df = pd.DataFrame({
-            'Metric': ['Average Rating', 'Total Reviews'] + list(data['common_issues'].keys()),
-            'Value': [data['average_rating'], data['total_reviews']] + list(data['common_issues'].values())
-        })
-        
-        csv_path = output_path / 'analysis_report.csv'
-        df.to_csv(csv_path, index=False)
+        csv_path = Path(output_path) / 'analysis_report.csv'
+        with instrumentation.span('report.csv') as span, open(csv_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(('Metric', 'Value'))
+            writer.writerows(self._metric_rows(data))
+            span.bytes = f.tell()
+        return csv_path
+
+    def generate_app_csv(self, app_insights: Sequence[Dict], output_path: Path) -> Path:
+        """Write one row per app, streamed straight from the insight dicts"""
+        csv_path = Path(output_path) / 'app_insights.csv'
+        fieldnames = list(dict.fromkeys(key for row in app_insights for key in row))
+        with instrumentation.span('report.app_csv') as span, open(csv_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(app_insights)
+            span.items = len(app_insights)
+            span.bytes = f.tell()
         return csv_path
-    
+
     def generate_pdf(self, data: Dict, output_path: Path) -> Path:
+        with instrumentation.span('report.pdf') as span:
+            pdf_path = self._render_pdf(data, Path(output_path))
+            span.bytes = pdf_path.stat().st_size
+        return pdf_path
+
+    def _render_pdf(self, data: Dict, output_path: Path) -> Path:
+        from fpdf import FPDF
+
         pdf = FPDF()
+        pdf.set_auto_page_break(True, margin=15)
         pdf.add_page()
-        
+
         # Add title
         pdf.set_font('Arial', 'B', 16)
         pdf.cell(0, 10, 'Review Analysis Report', ln=True, align='C')
-        
+
         # Add summary
         pdf.set_font('Arial', '', 12)
-        pdf.cell(0, 10, f"Average Rating: {data['average_rating']:.2f}", ln=True)
-        pdf.cell(0, 10, f"Total Reviews: {data['total_reviews']}", ln=True)
-        
-        # Add common issues
-        pdf.set_font('Arial', 'B', 14)
-        pdf.cell(0, 10, 'Common Issues:', ln=True)
-        pdf.set_font('Arial', '', 12)
-        for issue, count in data['common_issues'].items():
-            pdf.cell(0, 10, f"- {issue}: {count}", ln=True)
-        
+        for label, value in self._summary_rows(data):
+            pdf.cell(0, 8, f"{label}: {value}", ln=True)
+
+        if data.get('sentiment_distribution'):
+            self._pdf_distribution(pdf, data['sentiment_distribution'])
+        self._pdf_issues(pdf, data['common_issues'])
+        if data.get('wordcloud_base64'):
+            self._pdf_wordcloud(pdf, data['wordcloud_base64'])
+        if data.get('app_insights'):
+            self._pdf_app_table(pdf, data['app_insights'])
+
         pdf_path = output_path / 'analysis_report.pdf'
         pdf.output(str(pdf_path))
-        return pdf_path
\ No newline at end of file
+        return pdf_path
+
+    def generate_reports(self, data: Dict, output_path: Path, pdf: bool = True) -> List[Path]:
+        """
+        Write every report of one analysis into output_path
+
+        A word cloud is rendered here from 'word_frequencies' when the data
+        has none yet, so batch workers also share that work.
+
+        Returns:
+            Paths of analysis_report.csv, app_insights.csv (with per-app
+            insights) and analysis_report.pdf (unless pdf is False)
+        """
+        output_path = Path(output_path)
+        output_path.mkdir(parents=True, exist_ok=True)
+        if not data.get('wordcloud_base64') and data.get('word_frequencies'):
+            from src.services.wordcloud_renderer import WordCloudRenderer
+            with instrumentation.span('render.wordcloud') as span:
+                image = WordCloudRenderer(cache_size=0).render(data['word_frequencies'])
+                span.bytes = len(image)
+            data = {**data, 'wordcloud_base64': image}
+
+        written = [self.generate_csv(data, output_path)]
+        if data.get('app_insights'):
+            written.append(self.generate_app_csv(data['app_insights'], output_path))
+        if pdf:
+            written.append(self.generate_pdf(data, output_path))
+        return written
+
+    def generate_batch(
+        self,
+        reports: Sequence[Tuple[Dict, Path]],
+        n_jobs: int = DEFAULT_ANALYZER_JOBS,
+        pdf: bool = True
+    ) -> List[List[Path]]:
+        """
+        Write report sets for many analyses, e.g. one per app
+
+        Args:
+            reports: (report data, output directory) pairs
+            n_jobs: Worker processes (1 = generate in-process)
+            pdf: Also write the PDF reports
+
+        Returns:
+            Paths written for each report set, in input order
+        """
+        if n_jobs <= 1 or len(reports) <= 1:
+            return [self.generate_reports(data, path, pdf) for data, path in reports]
+
+        from concurrent.futures import ProcessPoolExecutor
+
+        n_jobs = min(n_jobs, len(reports))
+        # Several reports per task amortize pickling and scheduling
+        chunksize = max(1, len(reports) // (n_jobs * 4))
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            return list(executor.map(
+                _generate_reports,
+                [data for data, _ in reports],
+                [path for _, path in reports],
+                repeat(pdf),
+                chunksize=chunksize
+            ))
+
+    def _summary_rows(self, data: Dict) -> Iterator[Tuple[str, str]]:
+        yield 'Average Rating', f"{data['average_rating']:.2f}"
+        yield 'Total Reviews', f"{data['total_reviews']}"
+        if data.get('negative_reviews') is not None:
+            yield 'Negative Reviews', f"{data['negative_reviews']}"
+        if data.get('average_sentiment') is not None:
+            yield 'Average Sentiment', f"{data['average_sentiment']:.2f}"
+
+    def _metric_rows(self, data: Dict) -> Iterator[Tuple[str, object]]:
+        """Metric/Value rows of the CSV report, generated lazily"""
+        yield 'Average Rating', data['average_rating']
+        yield 'Total Reviews', data['total_reviews']
+        if data.get('negative_reviews') is not None:
+            yield 'Negative Reviews', data['negative_reviews']
+        if data.get('average_sentiment') is not None:
+            yield 'Average Sentiment', data['average_sentiment']
+        for label, count in (data.get('sentiment_distribution') or {}).items():
+            yield f'Sentiment: {label}', count
+        yield from data['common_issues'].items()
+
+    def _pdf_heading(self, pdf, text: str):
+        pdf.ln(4)
+        pdf.set_font('Arial', 'B', 14)
+        pdf.cell(0, 10, text, ln=True)
+        pdf.set_font('Arial', '', 11)
+
+    def _pdf_distribution(self, pdf, distribution: Dict[str, int]):
+        """One row per bucket with a bar scaled to the largest bucket"""
+        self._pdf_heading(pdf, 'Sentiment Distribution:')
+        total = sum(distribution.values()) or 1
+        largest = max(distribution.values()) or 1
+        for label, count in distribution.items():
+            pdf.cell(35, 7, _pdf_text(label))
+            pdf.cell(35, 7, f"{count} ({count / total:.0%})")
+            pdf.set_fill_color(70, 130, 180)
+            pdf.rect(pdf.get_x(), pdf.get_y() + 1.5, 110 * count / largest, 4, 'F')
+            pdf.ln(7)
+
+    def _pdf_issues(self, pdf, issues: Dict[str, int]):
+        self._pdf_heading(pdf, 'Common Issues:')
+        # Two issues per line keeps the list compact
+        items = list(issues.items())[:REPORT_TOP_ISSUES]
+        for start in range(0, len(items), 2):
+            for issue, count in items[start:start + 2]:
+                pdf.cell(95, 7, _pdf_text(f"- {issue}: {count}"))
+            pdf.ln(7)
+
+    def _pdf_wordcloud(self, pdf, image_base64: str):
+        import base64
+        import tempfile
+
+        # This fpdf version only embeds images from files
+        fd, image_path = tempfile.mkstemp(suffix='.png')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(base64.b64decode(image_base64))
+            self._pdf_heading(pdf, 'Word Cloud:')
+            pdf.image(image_path, w=pdf.w - pdf.l_margin - pdf.r_margin)
+        finally:
+            os.remove(image_path)
+
+    def _pdf_app_table(self, pdf, app_insights: Sequence[Dict]):
+        pdf.add_page()
+        self._pdf_heading(pdf, 'Apps:')
+        pdf.set_font('Arial', 'B', 10)
+        for _, header, width in APP_COLUMNS:
+            pdf.cell(width, 7, header, border=1)
+        pdf.ln(7)
+        pdf.set_font('Arial', '', 10)
+        for row in app_insights:
+            for key, _, width in APP_COLUMNS:
+                value = row.get(key, '')
+                if isinstance(value, float):
+                    value = f"{value:.2f}"
+                pdf.cell(width, 7, _pdf_text(value)[:40], border=1)
+            pdf.ln(7)
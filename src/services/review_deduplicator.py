@@ -0,0 +1,260 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple
+import numpy as np
+from src.config import DEDUP_MODES, DEFAULT_DEDUP_MODE, DEFAULT_DEDUP_SHORT_COPY_LIMIT, DEFAULT_DEDUP_THRESHOLD
+from src.services import instrumentation
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Reviews with fewer words are never compared as near-duplicates, and their
+# exact copies only count as duplicates in floods (see short_copy_limit):
+# different users legitimately write the same "Great app"
+MIN_WORDS = 5
+# MinHash signature length; 16-bit values keep signatures at 128 bytes per
+# distinct review while barely biasing the similarity estimate
+MINHASH_PERMUTATIONS = 64
+# Reviews whose signatures are compared at once when verifying candidates
+VERIFY_CHUNK = 100000
+_MIX = np.uint64(0x9E3779B97F4A7C15)
+# Anything that is not an ASCII letter or digit separates words
+_SEPARATORS = bytes(code for code in range(128) if not chr(code).isalnum())
+_SEPARATORS_TO_SPACES = bytes.maketrans(_SEPARATORS, b' ' * len(_SEPARATORS))
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase words joined by single spaces: the text compared for exact duplicates"""
+    if text.isascii():
+        text = text.encode('ascii').lower().translate(_SEPARATORS_TO_SPACES).decode('ascii')
+    else:
+        text = ''.join(char if char.isalnum() else ' ' for char in text.lower())
+    return ' '.join(text.split())
+
+
+def lsh_bands(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """
+    Split a signature into (bands, rows per band) for a similarity threshold
+
+    Two reviews become candidates when all rows of any band match, which is
+    likely above about (1 / bands) ** (1 / rows) similarity. The split whose
+    point is closest to the threshold without exceeding it is chosen, so few
+    true duplicates are missed; candidates are verified afterwards.
+    """
+    splits = [(num_perm // rows, rows) for rows in range(1, num_perm + 1) if num_perm % rows == 0]
+    below = [split for split in splits if (1 / split[0]) ** (1 / split[1]) <= threshold]
+    return max(below, key=lambda split: split[1]) if below else splits[0]
+
+
+def create_deduplicator(
+    mode: str = DEFAULT_DEDUP_MODE,
+    threshold: float = DEFAULT_DEDUP_THRESHOLD,
+    short_copy_limit: Optional[int] = DEFAULT_DEDUP_SHORT_COPY_LIMIT
+) -> Optional['ReviewDeduplicator']:
+    """Deduplicator for a mode of DEDUP_MODES; None when deduplication is 'off'"""
+    if mode == 'off':
+        return None
+    return ReviewDeduplicator(threshold=threshold, mode=mode, short_copy_limit=short_copy_limit)
+
+
+class ReviewDeduplicator:
+    """
+    Finds groups of identical and near-identical reviews
+
+    Reviews are first grouped by their normalized text (case, punctuation
+    and spacing ignored); for texts under MIN_WORDS words, only when the
+    copies exceed the short copy limit. Distinct texts of at least MIN_WORDS
+    words are then compared by the Jaccard similarity of their sets of adjacent word
+    pairs, estimated with MinHash signatures; locality-sensitive hashing of
+    signature bands only pairs up reviews likely to be similar, so the cost
+    grows linearly with the number of reviews instead of quadratically.
+    Candidate pairs above the threshold are merged into groups, and each
+    group is represented by its first review (the newest, in scraper order).
+    """
+
+    def __init__(
+        self,
+        threshold: float = DEFAULT_DEDUP_THRESHOLD,
+        mode: str = DEFAULT_DEDUP_MODE,
+        num_perm: int = MINHASH_PERMUTATIONS,
+        min_words: int = MIN_WORDS,
+        seed: int = 0,
+        short_copy_limit: Optional[int] = DEFAULT_DEDUP_SHORT_COPY_LIMIT
+    ):
+        """
+        Args:
+            threshold: Estimated similarity from which reviews are duplicates
+            mode: 'drop' duplicates, or 'weight' them (see apply())
+            num_perm: MinHash signature length
+            min_words: Shorter reviews are never near-duplicates
+            seed: Seed of the MinHash hash functions
+            short_copy_limit: Exact copies of a shorter review that are
+                still all kept as unique reviews; more copies than this form
+                one group. None keeps shorter reviews unique however often
+                they repeat
+        """
+        if mode not in DEDUP_MODES or mode == 'off':
+            raise ValueError(f"Unknown deduplication mode {mode!r}; choose 'drop' or 'weight'")
+        self.threshold = threshold
+        self.mode = mode
+        self.num_perm = num_perm
+        self.min_words = max(2, min_words)
+        self.short_copy_limit = short_copy_limit
+        self.bands, self.rows = lsh_bands(num_perm, threshold)
+        rng = np.random.default_rng(seed)
+        # 32-bit multiply-shift hash functions: odd multipliers, random offsets
+        self._multipliers = (rng.integers(0, 2 ** 31, num_perm, dtype=np.uint32) * 2 + 1).astype(np.uint32)
+        self._offsets = rng.integers(0, 2 ** 32, num_perm, dtype=np.uint32)
+
+    def find_duplicates(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Position of each review's group representative
+
+        Returns:
+            int64 array; a review that is not a duplicate points to itself
+        """
+        import pandas as pd
+
+        n = len(texts)
+        normalized = [normalize_text(text) if isinstance(text, str) else '' for text in texts]
+        codes, distinct = pd.factorize(pd.Series(normalized, dtype=object))
+        # Codes follow first appearance, so a group's first row is found by a stable sort
+        order = np.argsort(codes, kind='stable')
+        first_rows = order[np.flatnonzero(np.r_[True, codes[order][1:] != codes[order][:-1]])] if n else order
+
+        groups = np.arange(len(distinct), dtype=np.int64)
+        # Normalized words are separated by exactly one space
+        lengths = np.fromiter(
+            (text.count(' ') + 1 if text else 0 for text in distinct), dtype=np.int64, count=len(distinct)
+        )
+        eligible = np.flatnonzero(lengths >= self.min_words)
+        if len(eligible) > 1:
+            signatures = self._signatures([distinct[i] for i in eligible], lengths[eligible])
+            pairs = self._verified_pairs(signatures)
+            groups[eligible] = eligible[_components(len(eligible), pairs)]
+        representatives = first_rows[groups[codes]]
+        # Short reviews stay unique, unless their exact copies are a flood;
+        # empty texts always do
+        unique = lengths < self.min_words
+        if self.short_copy_limit is not None:
+            copies = np.bincount(codes, minlength=len(distinct))
+            unique &= (copies <= self.short_copy_limit) | (lengths == 0)
+        unique_rows = np.flatnonzero(unique[codes])
+        representatives[unique_rows] = unique_rows
+        return representatives
+
+    def apply(self, reviews_df: pd.DataFrame) -> Tuple[pd.DataFrame, int]:
+        """
+        Remove or down-weight the duplicate reviews of one app
+
+        In 'drop' mode only each group's representative is kept. In 'weight'
+        mode every review is kept with a 'weight' of one over its group size,
+        so a group counts as one review in ratings and sentiment, and an
+        'is_duplicate' flag that keeps all but the representative out of
+        word counts. The given frame is not modified.
+
+        Returns:
+            Tuple of (new reviews frame, number of duplicate reviews found)
+        """
+        if reviews_df.empty or 'content' not in reviews_df:
+            return reviews_df, 0
+        with instrumentation.span('dedup.find') as span:
+            contents = reviews_df['content'].tolist()
+            representatives = self.find_duplicates(contents)
+            span.items = len(contents)
+        is_duplicate = representatives != np.arange(len(representatives))
+        duplicates = int(is_duplicate.sum())
+        instrumentation.count('dedup.duplicates', duplicates)
+
+        if self.mode == 'drop':
+            return reviews_df[~is_duplicate].reset_index(drop=True), duplicates
+        group_sizes = np.bincount(representatives, minlength=len(representatives))
+        reviews_df = reviews_df.assign(weight=1.0 / group_sizes[representatives], is_duplicate=is_duplicate)
+        return reviews_df, duplicates
+
+    def _signatures(self, texts: List[str], lengths: np.ndarray) -> np.ndarray:
+        """
+        16-bit MinHash signatures of the adjacent word pairs of each text
+
+        Args:
+            texts: Normalized texts of at least two words
+            lengths: Word count of each text
+        """
+        import pandas as pd
+
+        # One split of the joined texts: a list per text would keep the
+        # garbage collector busy with millions of short-lived lists
+        word_ids, vocabulary = pd.factorize(pd.Series(' '.join(texts).split(), dtype=object))
+        word_ids = word_ids.astype(np.uint64)
+        # Word pair ids mixed down to 32 bits; the pair spanning two texts is dropped
+        within = np.ones(len(word_ids) - 1, dtype=bool)
+        within[np.cumsum(lengths)[:-1] - 1] = False
+        pairs = (word_ids[:-1] * np.uint64(len(vocabulary)) + word_ids[1:])[within]
+        pairs = ((pairs * _MIX) >> np.uint64(32)).astype(np.uint32)
+        starts = np.r_[0, np.cumsum(lengths - 1)[:-1]]
+
+        signatures = np.empty((len(texts), self.num_perm), dtype=np.uint16)
+        for p in range(self.num_perm):
+            hashes = pairs * self._multipliers[p]
+            hashes += self._offsets[p]
+            hashes >>= np.uint32(16)
+            signatures[:, p] = np.minimum.reduceat(hashes, starts)
+        return signatures
+
+    def _verified_pairs(self, signatures: np.ndarray) -> np.ndarray:
+        """(earlier, later) index pairs sharing a band and above the threshold"""
+        n = len(signatures)
+        candidates = []
+        for band in range(self.bands):
+            columns = signatures[:, band * self.rows:(band + 1) * self.rows].astype(np.uint64)
+            keys = np.zeros(n, dtype=np.uint64)
+            for column in columns.T:
+                keys = keys * _MIX + column
+            order = np.argsort(keys, kind='stable')
+            sorted_keys = keys[order]
+            same = np.flatnonzero(sorted_keys[1:] == sorted_keys[:-1])
+            if not len(same):
+                continue
+            # Pair each bucket member with the one before it and with the
+            # bucket's first member: linear in the bucket size
+            bucket_starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+            bucket_first = order[bucket_starts[np.searchsorted(bucket_starts, same + 1, side='right') - 1]]
+            candidates.append(np.stack([order[same], order[same + 1]], axis=1))
+            candidates.append(np.stack([bucket_first, order[same + 1]], axis=1))
+        if not candidates:
+            return np.empty((0, 2), dtype=np.int64)
+
+        pairs = np.concatenate(candidates)
+        pairs = np.sort(pairs, axis=1)
+        pairs = pairs[pairs[:, 0] != pairs[:, 1]]
+        keys = np.sort(pairs[:, 0] * n + pairs[:, 1])
+        keys = keys[np.r_[True, keys[1:] != keys[:-1]]] if len(keys) else keys
+        pairs = np.stack([keys // n, keys % n], axis=1)
+
+        verified = []
+        for start in range(0, len(pairs), VERIFY_CHUNK):
+            chunk = pairs[start:start + VERIFY_CHUNK]
+            similarity = (signatures[chunk[:, 0]] == signatures[chunk[:, 1]]).mean(axis=1)
+            verified.append(chunk[similarity >= self.threshold])
+        return np.concatenate(verified)
+
+
+def _components(n: int, pairs: np.ndarray) -> np.ndarray:
+    """Smallest member of each node's connected component, by label propagation"""
+    labels = np.arange(n, dtype=np.int64)
+    if not len(pairs):
+        return labels
+    first, second = pairs[:, 0], pairs[:, 1]
+    while True:
+        lowest = np.minimum(labels[first], labels[second])
+        updated = labels.copy()
+        np.minimum.at(updated, first, lowest)
+        np.minimum.at(updated, second, lowest)
+        # Pointer jumping: follow labels to their own labels
+        while True:
+            jumped = updated[updated]
+            if np.array_equal(jumped, updated):
+                break
+            updated = jumped
+        if np.array_equal(updated, labels):
+            return labels
+        labels = updated
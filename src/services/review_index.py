@@ -0,0 +1,285 @@
+from __future__ import annotations
+import hashlib
+import io
+import re
+from bisect import bisect_left
+from datetime import date, datetime
+from itertools import chain
+from typing import TYPE_CHECKING, Dict, List, Optional, Union
+import numpy as np
+from src.services.text_normalizer import TextNormalizer
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from src.services.review_store import ReviewStore
+
+# "crash OR battery drain" and "crash | battery drain" both mean
+# crash, or battery and drain
+OR_PATTERN = re.compile(r'\s+OR\s+|\s*\|\s*')
+
+DateLike = Union[date, datetime, str]
+
+
+class ReviewIndex:
+    """
+    In-memory inverted index over a review DataFrame
+
+    Maps each token (as produced by the analyzer's TextNormalizer, so stop
+    words are not indexed) to the sorted row positions of the reviews
+    containing it. All postings live in one int32 array sliced by per-term
+    offsets. Star ratings and review dates are kept as arrays, so score and
+    date filters are vectorized masks over the term matches.
+
+    Positions refer to rows of the DataFrame the index was built from:
+    select them with ``reviews_df.iloc[positions]``.
+    """
+
+    def __init__(
+        self,
+        terms: Dict[str, int],
+        offsets: np.ndarray,
+        postings: np.ndarray,
+        scores: np.ndarray,
+        timestamps: np.ndarray,
+        fingerprint: str,
+        normalizer: TextNormalizer
+    ):
+        self.terms = terms
+        self.offsets = offsets
+        self.postings = postings
+        self.scores = scores
+        self.timestamps = timestamps
+        self.fingerprint = fingerprint
+        self.normalizer = normalizer
+        self._sorted_terms = list(terms)
+
+    @classmethod
+    def build(cls, reviews_df: pd.DataFrame, normalizer: TextNormalizer) -> 'ReviewIndex':
+        """Tokenize every review and index it by its distinct tokens"""
+        import pandas as pd
+
+        n = len(reviews_df)
+        contents = reviews_df['content'].fillna('').astype(str).tolist() if 'content' in reviews_df else [''] * n
+        token_lists = normalizer.tokenize_batch(contents)
+        lengths = np.fromiter(map(len, token_lists), dtype=np.int64, count=n)
+        codes, vocabulary = pd.factorize(
+            pd.Series(list(chain.from_iterable(token_lists)), dtype=object), sort=True
+        )
+        docs = np.repeat(np.arange(n, dtype=np.int64), lengths)
+        # One (term, review) key per distinct token of a review, sorted by
+        # term, then review
+        keys = _sorted_unique(codes.astype(np.int64) * max(n, 1) + docs)
+        term_codes = keys // max(n, 1)
+        postings = (keys % max(n, 1)).astype(np.int32)
+        offsets = np.searchsorted(term_codes, np.arange(len(vocabulary) + 1)).astype(np.int64)
+
+        return cls(
+            terms={term: i for i, term in enumerate(vocabulary)},
+            offsets=offsets,
+            postings=postings,
+            scores=cls._score_array(reviews_df),
+            timestamps=cls._timestamp_array(reviews_df),
+            fingerprint=review_fingerprint(reviews_df, normalizer),
+            normalizer=normalizer
+        )
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    def term_postings(self, term: str) -> np.ndarray:
+        """
+        Sorted positions of the reviews containing an (already normalized)
+        term; a trailing '*' matches every term with that prefix
+        """
+        if term.endswith('*'):
+            # Term ids follow sorted term order, so a prefix is one id range
+            prefix = term[:-1]
+            low = bisect_left(self._sorted_terms, prefix)
+            high = bisect_left(self._sorted_terms, prefix + '\uffff')
+            return _sorted_unique(self.postings[self.offsets[low]:self.offsets[high]])
+        i = self.terms.get(term)
+        if i is None:
+            return np.empty(0, dtype=np.int32)
+        return self.postings[self.offsets[i]:self.offsets[i + 1]]
+
+    def search(
+        self,
+        query: str = '',
+        min_score: Optional[float] = None,
+        max_score: Optional[float] = None,
+        start: Optional[DateLike] = None,
+        end: Optional[DateLike] = None,
+        limit: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        Find reviews by terms, star rating and date
+
+        Args:
+            query: Words that must all appear ("battery drain"), with OR or
+                | between alternatives ("crash* OR battery drain"); words are
+                normalized like review text and a trailing * matches a
+                prefix ("crash*": crash, crashes, crashing). Empty matches
+                every review.
+            min_score, max_score: Inclusive star rating range
+            start, end: Inclusive date range; a plain date as end includes
+                that whole day
+            limit: Return at most this many matches
+
+        Returns:
+            Row positions of the matching reviews, newest first
+        """
+        groups = self.parse_query(query)
+        if query.strip() and not groups:
+            # Only stop words or punctuation: nothing indexed can match
+            return np.empty(0, dtype=np.int32)
+        candidates = self._match(groups) if groups else np.arange(len(self), dtype=np.int32)
+
+        mask = np.ones(len(candidates), dtype=bool)
+        if min_score is not None:
+            mask &= self.scores[candidates] >= min_score
+        if max_score is not None:
+            mask &= self.scores[candidates] <= max_score
+        if start is not None:
+            mask &= self.timestamps[candidates] >= _timestamp(start)
+        if end is not None:
+            mask &= self.timestamps[candidates] <= _timestamp(end, end_of_day=True)
+        candidates = candidates[mask]
+
+        # Newest first; reviews without a date last
+        newest_first = candidates[np.argsort(self.timestamps[candidates], kind='stable')[::-1]]
+        return newest_first[:limit] if limit is not None else newest_first
+
+    def parse_query(self, query: str) -> List[List[str]]:
+        """Split a query into OR-ed groups of AND-ed normalized terms"""
+        groups = [
+            [
+                term + '*' if word.endswith('*') and not term.endswith('*') else term
+                for word in part.split()
+                for term in self.normalizer.tokenize(word)
+            ]
+            for part in OR_PATTERN.split(query.strip())
+        ]
+        return [terms for terms in groups if terms]
+
+    def to_bytes(self) -> bytes:
+        """Serialize the index (NumPy arrays only, no pickle)"""
+        buffer = io.BytesIO()
+        np.savez(
+            buffer,
+            terms=np.frombuffer('\n'.join(self.terms).encode('utf-8'), dtype=np.uint8),
+            offsets=self.offsets,
+            postings=self.postings,
+            scores=self.scores,
+            timestamps=self.timestamps,
+            fingerprint=np.frombuffer(self.fingerprint.encode('ascii'), dtype=np.uint8),
+        )
+        return buffer.getvalue()
+
+    @classmethod
+    def from_bytes(cls, data: bytes, normalizer: TextNormalizer) -> 'ReviewIndex':
+        with np.load(io.BytesIO(data)) as arrays:
+            terms = arrays['terms'].tobytes().decode('utf-8')
+            return cls(
+                terms={term: i for i, term in enumerate(terms.split('\n'))} if terms else {},
+                offsets=arrays['offsets'],
+                postings=arrays['postings'],
+                scores=arrays['scores'],
+                timestamps=arrays['timestamps'],
+                fingerprint=arrays['fingerprint'].tobytes().decode('ascii'),
+                normalizer=normalizer
+            )
+
+    def save(self, review_store: ReviewStore):
+        """Persist the index in the review store, keyed by its fingerprint"""
+        review_store.save_index(self.fingerprint, self.to_bytes())
+
+    @classmethod
+    def load_or_build(
+        cls,
+        reviews_df: pd.DataFrame,
+        normalizer: TextNormalizer,
+        review_store: Optional[ReviewStore] = None
+    ) -> 'ReviewIndex':
+        """
+        Reuse the index stored for exactly these reviews, or build and store it
+
+        Without a review store this is build().
+        """
+        if review_store is None:
+            return cls.build(reviews_df, normalizer)
+        fingerprint = review_fingerprint(reviews_df, normalizer)
+        data = review_store.load_index(fingerprint)
+        if data is not None:
+            return cls.from_bytes(data, normalizer)
+        index = cls.build(reviews_df, normalizer)
+        index.save(review_store)
+        return index
+
+    def _match(self, groups: List[List[str]]) -> np.ndarray:
+        matches = None
+        for terms in groups:
+            # Intersect rarest first so intermediate results stay small
+            postings = sorted((self.term_postings(term) for term in set(terms)), key=len)
+            docs = postings[0]
+            for other in postings[1:]:
+                if not len(docs):
+                    break
+                docs = np.intersect1d(docs, other, assume_unique=True)
+            matches = docs if matches is None else _sorted_unique(np.concatenate([matches, docs]))
+        return matches.astype(np.int32, copy=False)
+
+    @staticmethod
+    def _score_array(reviews_df: pd.DataFrame) -> np.ndarray:
+        import pandas as pd
+
+        if 'score' not in reviews_df:
+            return np.full(len(reviews_df), np.nan, dtype=np.float32)
+        return pd.to_numeric(reviews_df['score'], errors='coerce').to_numpy(dtype=np.float32, na_value=np.nan)
+
+    @staticmethod
+    def _timestamp_array(reviews_df: pd.DataFrame) -> np.ndarray:
+        """Review dates as int64 nanoseconds; missing dates sort before all others"""
+        import pandas as pd
+
+        if 'at' not in reviews_df:
+            return np.full(len(reviews_df), np.iinfo(np.int64).min, dtype=np.int64)
+        at = pd.to_datetime(reviews_df['at'], errors='coerce').astype('datetime64[ns]')
+        return at.to_numpy().view(np.int64).copy()
+
+
+def review_fingerprint(reviews_df: pd.DataFrame, normalizer: TextNormalizer) -> str:
+    """
+    Identity of a review set in row order, under a tokenizer's stop words
+
+    Review ids identify the reviews; without them, the review texts, ratings
+    and dates do.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(' '.join(sorted(normalizer.stop_words)).encode('utf-8'))
+    digest.update(str(len(reviews_df)).encode('ascii'))
+    if 'reviewId' in reviews_df:
+        columns = ['reviewId']
+    else:
+        columns = [column for column in ('content', 'score', 'at') if column in reviews_df]
+    for column in columns:
+        digest.update(b'\1' + column.encode('ascii'))
+        digest.update('\0'.join(map(str, reviews_df[column].tolist())).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _sorted_unique(values: np.ndarray) -> np.ndarray:
+    """Sorted distinct values; a plain sort beats np.unique's hashing on large int arrays"""
+    values = np.sort(values)
+    if len(values):
+        values = values[np.r_[True, values[1:] != values[:-1]]]
+    return values
+
+
+def _timestamp(value: DateLike, end_of_day: bool = False) -> int:
+    import pandas as pd
+
+    timestamp = pd.Timestamp(value)
+    if end_of_day and not isinstance(value, datetime) and timestamp == timestamp.normalize():
+        # A plain date as the upper bound covers that whole day
+        timestamp += pd.Timedelta(days=1) - pd.Timedelta(1, 'ns')
+    return timestamp.as_unit('ns').value
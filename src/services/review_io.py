@@ -0,0 +1,172 @@
+from __future__ import annotations
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING, BinaryIO, Dict, List, Optional, Union
+from src.config import DEFAULT_CHUNK_SIZE
+
+# pyarrow is imported when a file is actually written or read
+if TYPE_CHECKING:
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+
+FORMATS = ('parquet', 'arrow')
+FORMAT_SUFFIXES = {
+    '.parquet': 'parquet',
+    '.pq': 'parquet',
+    '.arrow': 'arrow',
+    '.feather': 'arrow',
+    '.ipc': 'arrow',
+}
+MIME_TYPES = {
+    'parquet': 'application/vnd.apache.parquet',
+    'arrow': 'application/vnd.apache.arrow.file',
+}
+# Schema metadata key holding the analysis summary next to the review table
+ANALYSIS_METADATA_KEY = b'reviewsmart.analysis'
+SUMMARY_FIELDS = (
+    'total_reviews',
+    'average_rating',
+    'negative_reviews',
+    'average_sentiment',
+    'sentiment_distribution',
+    'common_words',
+)
+
+Destination = Union[str, Path, BinaryIO]
+
+
+def write_reviews(
+    reviews_df: pd.DataFrame,
+    destination: Destination,
+    format: Optional[str] = None,
+    analysis: Optional[Dict] = None,
+    app_insights: Optional[List[Dict]] = None,
+    batch_size: int = DEFAULT_CHUNK_SIZE
+) -> None:
+    """
+    Stream a review table to a Parquet or Arrow IPC file, batch by batch
+
+    Args:
+        reviews_df: Scraped reviews, optionally with a 'sentiment' column
+        destination: File path or writable binary buffer
+        format: 'parquet' or 'arrow'; inferred from the file suffix if omitted
+        analysis: Analysis results whose summary is stored in the file metadata
+        app_insights: Per-app insights stored with the summary
+        batch_size: Rows converted and written per batch
+    """
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+    import pyarrow.parquet as pq
+
+    format = _resolve_format(destination, format)
+    schema = pa.Schema.from_pandas(reviews_df, preserve_index=False)
+    if analysis is not None or app_insights is not None:
+        summary = {field: (analysis or {}).get(field) for field in SUMMARY_FIELDS}
+        summary['app_insights'] = app_insights
+        schema = schema.with_metadata({
+            **(schema.metadata or {}),
+            ANALYSIS_METADATA_KEY: json.dumps(summary, default=_json_default).encode('utf-8'),
+        })
+
+    if format == 'parquet':
+        writer = pq.ParquetWriter(_sink(destination), schema)
+    else:
+        # Uncompressed so the file can be memory-mapped back without copies
+        writer = ipc.new_file(_sink(destination), schema)
+    with writer:
+        for start in range(0, len(reviews_df), batch_size):
+            chunk = reviews_df.iloc[start:start + batch_size]
+            table = pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+            writer.write_table(table.replace_schema_metadata(schema.metadata))
+
+
+def read_reviews(
+    source: Destination,
+    format: Optional[str] = None,
+    memory_map: bool = True
+) -> pd.DataFrame:
+    """
+    Load a review table written by write_reviews
+
+    Files on disk are memory-mapped, so Arrow IPC files are read without
+    copying the column buffers. Timestamps and categorical columns come
+    back with their original dtypes.
+
+    Args:
+        source: File path or readable binary buffer
+        format: 'parquet' or 'arrow'; inferred from the file suffix if omitted
+        memory_map: Memory-map file paths instead of reading them into memory
+
+    Returns:
+        DataFrame with the stored reviews
+    """
+    return _read_table(source, format, memory_map).to_pandas()
+
+
+def read_analysis_summary(source: Destination, format: Optional[str] = None) -> Optional[Dict]:
+    """
+    Read the analysis summary stored by write_reviews, without loading any rows
+
+    Returns:
+        The stored summary, or None if the file was written without one
+    """
+    import pyarrow.parquet as pq
+
+    format = _resolve_format(source, format)
+    if format == 'parquet':
+        schema = pq.read_schema(_source(source))
+    else:
+        with _open_ipc(source, memory_map=True) as reader:
+            schema = reader.schema
+    raw = (schema.metadata or {}).get(ANALYSIS_METADATA_KEY)
+    return json.loads(raw) if raw else None
+
+
+def _read_table(source: Destination, format: Optional[str], memory_map: bool) -> pa.Table:
+    import pyarrow.parquet as pq
+
+    format = _resolve_format(source, format)
+    if format == 'parquet':
+        return pq.read_table(_source(source), memory_map=memory_map)
+    with _open_ipc(source, memory_map) as reader:
+        return reader.read_all()
+
+
+def _open_ipc(source: Destination, memory_map: bool) -> ipc.RecordBatchFileReader:
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+
+    if isinstance(source, (str, Path)):
+        source = pa.memory_map(str(source)) if memory_map else pa.OSFile(str(source))
+    return ipc.open_file(source)
+
+
+def _resolve_format(target: Destination, format: Optional[str]) -> str:
+    if format is None:
+        if not isinstance(target, (str, Path)):
+            raise ValueError("format is required when writing to or reading from a buffer")
+        format = FORMAT_SUFFIXES.get(Path(target).suffix.lower())
+        if format is None:
+            raise ValueError(f"Cannot infer export format from file name: {target}")
+    if format not in FORMATS:
+        raise ValueError(f"Unsupported export format: {format}")
+    return format
+
+
+def _json_default(value):
+    # numpy scalars in the analysis results
+    if hasattr(value, 'item'):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _sink(destination: Destination):
+    if isinstance(destination, (str, Path)):
+        Path(destination).parent.mkdir(parents=True, exist_ok=True)
+        return str(destination)
+    return destination
+
+
+def _source(source: Destination):
+    return str(source) if isinstance(source, (str, Path)) else source
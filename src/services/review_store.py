@@ -0,0 +1,198 @@
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Union
+from src.config import DEFAULT_STORE_PATH, DEFAULT_BATCH_SIZE
+
+# Review fields returned by google_play_scraper, in storage order
+REVIEW_COLUMNS = (
+    'reviewId',
+    'userName',
+    'userImage',
+    'content',
+    'score',
+    'thumbsUpCount',
+    'reviewCreatedVersion',
+    'at',
+    'replyContent',
+    'repliedAt',
+    'appVersion',
+)
+DATETIME_COLUMNS = {'at', 'repliedAt'}
+INTEGER_COLUMNS = {'score', 'thumbsUpCount'}
+# Search indexes kept in the store; older ones are dropped as new ones are saved
+MAX_STORED_INDEXES = 4
+
+
+class ReviewStore:
+    """
+    Persistent SQLite store of already-seen reviews keyed by (app_id, reviewId)
+
+    Lets repeat runs download only reviews that are newer than the ones
+    already stored.
+    """
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_STORE_PATH):
+        self.path = Path(path)
+        if str(path) != ':memory:':
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        # One connection shared by scraper worker threads, serialized by a lock
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._lock = threading.Lock()
+        columns = ', '.join(
+            f"{col} {'INTEGER' if col in INTEGER_COLUMNS else 'TEXT'}" for col in REVIEW_COLUMNS
+        )
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS reviews ("
+                f"app_id TEXT NOT NULL, {columns}, "
+                f"PRIMARY KEY (app_id, reviewId))"
+            )
+            # Matches iter_reviews' order, so reading an app back needs no sort
+            self._conn.execute("DROP INDEX IF EXISTS idx_reviews_app_at")
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_reviews_app_newest "
+                "ON reviews (app_id, at DESC, reviewId)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS search_indexes ("
+                "name TEXT PRIMARY KEY, data BLOB NOT NULL, saved_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS trend_rollups ("
+                "name TEXT PRIMARY KEY, data BLOB NOT NULL, saved_at REAL NOT NULL)"
+            )
+
+    def add_reviews(self, app_id: str, reviews: Iterable[Dict]) -> int:
+        """
+        Store reviews for an app, ignoring ones already present
+
+        Returns:
+            Number of newly stored reviews
+        """
+        rows = [
+            (app_id,) + tuple(self._encode(col, review.get(col)) for col in REVIEW_COLUMNS)
+            for review in reviews
+        ]
+        placeholders = ', '.join('?' * (len(REVIEW_COLUMNS) + 1))
+        with self._lock, self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                f"INSERT OR IGNORE INTO reviews (app_id, {', '.join(REVIEW_COLUMNS)}) "
+                f"VALUES ({placeholders})",
+                rows
+            )
+            return self._conn.total_changes - before
+
+    def known_review_ids(self, app_id: str, review_ids: Iterable[str]) -> Set[str]:
+        """Return the subset of review_ids already stored for an app"""
+        review_ids = list(review_ids)
+        known = set()
+        # Stay well below SQLite's bound-parameter limit
+        for start in range(0, len(review_ids), 500):
+            chunk = review_ids[start:start + 500]
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT reviewId FROM reviews WHERE app_id = ? "
+                    f"AND reviewId IN ({', '.join('?' * len(chunk))})",
+                    [app_id] + chunk
+                ).fetchall()
+            known.update(row[0] for row in rows)
+        return known
+
+    def count_reviews(self, app_id: str) -> int:
+        """Number of reviews stored for an app"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM reviews WHERE app_id = ?", (app_id,)
+            ).fetchone()[0]
+
+    def iter_reviews(self, app_id: str, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[List[Dict]]:
+        """
+        Yield an app's stored reviews, newest first, in lists of batch_size
+
+        One query walks the (app_id, at, reviewId) index and each batch is
+        fetched from its cursor, so reading every review is a single pass.
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                f"SELECT {', '.join(REVIEW_COLUMNS)} FROM reviews WHERE app_id = ? "
+                f"ORDER BY at DESC, reviewId",
+                (app_id,)
+            )
+        try:
+            while True:
+                with self._lock:
+                    rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield [self._decode_row(row) for row in rows]
+        finally:
+            with self._lock:
+                cursor.close()
+
+    def load_reviews(self, app_id: str) -> List[Dict]:
+        """Return all stored reviews for an app, newest first"""
+        return [review for batch in self.iter_reviews(app_id) for review in batch]
+
+    def save_index(self, name: str, data: bytes):
+        """Store a serialized search index (see ReviewIndex), keeping the newest few"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO search_indexes (name, data, saved_at) VALUES (?, ?, ?)",
+                (name, data, time.time())
+            )
+            self._conn.execute(
+                "DELETE FROM search_indexes WHERE name NOT IN ("
+                "SELECT name FROM search_indexes ORDER BY saved_at DESC LIMIT ?)",
+                (MAX_STORED_INDEXES,)
+            )
+
+    def load_index(self, name: str) -> Optional[bytes]:
+        """Return a stored search index, or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM search_indexes WHERE name = ?", (name,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def save_rollup(self, name: str, data: bytes):
+        """Store an app's serialized trend rollup (see TrendRollup), replacing the previous one"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO trend_rollups (name, data, saved_at) VALUES (?, ?, ?)",
+                (name, data, time.time())
+            )
+
+    def load_rollup(self, name: str) -> Optional[bytes]:
+        """Return a stored trend rollup, or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM trend_rollups WHERE name = ?", (name,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def close(self):
+        """Close the underlying database connection"""
+        with self._lock:
+            self._conn.close()
+
+    def _encode(self, column: str, value):
+        """Convert a review field to its SQLite representation"""
+        if value is None:
+            return None
+        if column in DATETIME_COLUMNS and isinstance(value, datetime):
+            return value.isoformat()
+        if column in INTEGER_COLUMNS:
+            return int(value)
+        return str(value)
+
+    def _decode_row(self, row: tuple) -> Dict:
+        """Convert a stored row back to a google_play_scraper review dict"""
+        review = dict(zip(REVIEW_COLUMNS, row))
+        for column in DATETIME_COLUMNS:
+            if review[column] is not None:
+                review[column] = datetime.fromisoformat(review[column])
+        return review
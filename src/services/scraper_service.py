@@ -1,78 +1,176 @@
 # src/services/scraper_service.py
-from typing import List, Dict, Tuple
-from google_play_scraper import reviews_all, app
-import pandas as pd
+from __future__ import annotations
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Iterator, List, Dict, Tuple, Optional
+from src.config import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_COUNTRY,
+    DEFAULT_LANG,
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_MAX_WORKERS,
+    DEFAULT_REQUESTS_PER_SECOND,
+)
 from src.interfaces.scraper_interface import ScraperInterface
+from src.services import instrumentation
+from src.services.checkpoint_store import CheckpointStore
+from src.services.fetch_scheduler import FetchScheduler, TruncatedWalkError
+from src.services.review_store import ReviewStore
 import time
 from urllib.parse import urlparse, parse_qs
 
+# pandas, numpy and google_play_scraper are imported where they are first
+# used, so URL handling alone stays cheap to import
+if TYPE_CHECKING:
+    import pandas as pd
+    from src.services.review_deduplicator import ReviewDeduplicator
+
+# Repeated per-app values, stored once per app as categories
+CATEGORICAL_COLUMNS = ('app_id', 'app_name', 'app_url')
+# Free-text columns, stored as Arrow-backed strings instead of Python objects
+STRING_COLUMNS = ('reviewId', 'userName', 'content')
+
+
+def compact_review_frame(reviews_df: pd.DataFrame) -> pd.DataFrame:
+    """Convert one app's reviews to compact dtypes, in place"""
+    import pandas as pd
+
+    for col in STRING_COLUMNS:
+        if col in reviews_df.columns and not _is_arrow_string(reviews_df[col].dtype):
+            reviews_df[col] = reviews_df[col].astype('string[pyarrow]')
+    for col in CATEGORICAL_COLUMNS:
+        if col in reviews_df.columns and not isinstance(reviews_df[col].dtype, pd.CategoricalDtype):
+            reviews_df[col] = reviews_df[col].astype('category')
+    return reviews_df
+
+
+def constant_category(value, length: int) -> pd.Categorical:
+    """A column repeating one value, built directly as a one-category categorical"""
+    import numpy as np
+    import pandas as pd
+
+    return pd.Categorical.from_codes(
+        np.zeros(length, dtype=np.int8),
+        categories=['' if value is None else value]
+    )
+
+
+def _is_arrow_string(dtype) -> bool:
+    """Whether a column already holds Arrow-backed strings (pandas >= 3 default)"""
+    import pandas as pd
+
+    return isinstance(dtype, pd.StringDtype) and dtype.storage == 'pyarrow'
+
+
+def combine_review_frames(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Concatenate per-app review frames in a single pass
+
+    Category columns are unioned separately, because concatenating
+    categoricals with different categories falls back to object dtype.
+    """
+    import pandas as pd
+    from pandas.api.types import union_categoricals
+
+    if not frames:
+        return pd.DataFrame()
+
+    categorical = [col for col in CATEGORICAL_COLUMNS if col in frames[0].columns]
+    combined = pd.concat([frame.drop(columns=categorical) for frame in frames], ignore_index=True)
+    for col in categorical:
+        combined[col] = union_categoricals(
+            [frame[col].astype('category') for frame in frames]
+        )
+    return combined
+
+
+def _default_backend():
+    """google_play_scraper with raising review pages, imported on first use"""
+    from src.services.play_store_backend import PlayStoreBackend
+    return PlayStoreBackend()
+
+
 class GooglePlayScraper(ScraperInterface):
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        requests_per_second: Optional[float] = DEFAULT_REQUESTS_PER_SECOND,
+        backend=None,
+        review_store: Optional[ReviewStore] = None,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        checkpoint_store: Optional[CheckpointStore] = None,
+        deduplicator: Optional[ReviewDeduplicator] = None
+    ):
+        """
+        Args:
+            max_workers: Number of apps fetched concurrently (1 = sequential)
+            requests_per_second: Per-host request budget shared by all workers
+                and retries, None for no limit
+            backend: Object exposing the google_play_scraper functions
+                (``app``, ``reviews``); defaults to the real module, wrapped
+                in a PlayStoreBackend
+            review_store: Enables incremental mode: only reviews newer than the
+                ones already in the store are downloaded, and results are read
+                back from the store
+            max_retries: Retries of a request failing with a transient error
+            checkpoint_store: Makes full fetches resumable: pages fetched
+                before a failure are kept and not requested again
+            deduplicator: Drops or down-weights each app's duplicate and
+                near-duplicate reviews before insights are built
+        """
+        self.max_workers = max(1, int(max_workers))
+        self.scheduler = FetchScheduler(
+            requests_per_second,
+            max_retries=max_retries,
+            checkpoint_store=checkpoint_store
+        )
+        self.rate_limiter = self.scheduler.rate_limiter
+        self._backend = backend
+        self.review_store = review_store
+        self.deduplicator = deduplicator
+
+    @property
+    def backend(self):
+        """Backend in use; the real module is only imported when first needed"""
+        if self._backend is None:
+            self._backend = _default_backend()
+        return self._backend
+
+    @backend.setter
+    def backend(self, backend):
+        self._backend = backend
+
     def scrape_reviews(self, urls: List[str]) -> Tuple[pd.DataFrame, List[Dict]]:
         """
         Scrape reviews from multiple Google Play Store URLs
         """
-        all_reviews = pd.DataFrame()
+        app_frames = []
         all_insights = []
-        
-        for url in urls:
-            try:
-                print(f"Processing URL: {url}")
-                app_id = self._extract_app_id(url)
-                print(f"Extracted app_id: {app_id}")
-                
-                # Get app details
-                try:
-                    app_info = app(
-                        app_id,
-                        lang='en',
-                        country='us'
-                    )
-                    print(f"App details fetched. Total reviews: {app_info.get('reviews', 0)}")
-                except Exception as e:
-                    print(f"Error fetching app details: {e}")
-                    continue
-                
-                # Fetch reviews
-                try:
-                    print("Fetching reviews...")
-                    reviews_data = reviews_all(
-                        app_id,
-                        sleep_milliseconds=0,  # Don't sleep between requests
-                        lang='en',
-                        country='us',
-                    )
-                    print(f"Successfully fetched {len(reviews_data)} reviews")
-                    
-                    # Convert to DataFrame
-                    if reviews_data:
-                        df = pd.DataFrame(reviews_data)
-                        df['app_id'] = app_id
-                        df['app_url'] = url
-                        df['app_name'] = app_info.get('title', '')
-                        
-                        # Generate insights
-                        insights = {
-                            "app_name": app_info.get('title', ''),
-                            "app_url": url,
-                            "app_id": app_id,
-                            "total_reviews": app_info.get('reviews', 0),
-                            "reviews_analyzed": len(df),
-                            "app_rating": app_info.get('score', 0.0),
-                            "negative_reviews": len(df[df['score'] <= 3]),
-                            "average_rating": round(df['score'].mean(), 2) if not df.empty else 0
-                        }
-                        
-                        all_reviews = pd.concat([all_reviews, df], ignore_index=True)
-                        all_insights.append(insights)
-                        print(f"Successfully processed app: {app_info.get('title', '')}")
-                    
-                except Exception as e:
-                    print(f"Error fetching reviews: {e}")
-                    continue
-                
-            except Exception as e:
-                print(f"Error processing {url}: {e}")
+
+        # Apps are independent, so they can be fetched in parallel; map()
+        # keeps the input order so the output matches the sequential path
+        if self.max_workers > 1 and len(urls) > 1:
+            # Each task runs in a copy of this context, so spans from the
+            # worker threads reach the caller's active instrumentation
+            contexts = [contextvars.copy_context() for _ in urls]
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(urls))) as executor:
+                results = list(executor.map(
+                    lambda context, url: context.run(self._scrape_app, url), contexts, urls
+                ))
+        else:
+            results = [self._scrape_app(url) for url in urls]
+
+        # Combine once at the end: concatenating inside the loop would copy
+        # every earlier app's reviews again on each iteration
+        for result in results:
+            if result is None:
                 continue
+            df, insights = result
+            app_frames.append(df)
+            all_insights.append(insights)
+        with instrumentation.span('scrape.combine') as span:
+            all_reviews = combine_review_frames(app_frames)
+            span.items = len(all_reviews)
         
         if all_reviews.empty:
             print("No reviews were collected for any URL")
@@ -80,6 +178,275 @@ class GooglePlayScraper(ScraperInterface):
             print(f"Total reviews collected: {len(all_reviews)}")
         
         return all_reviews, all_insights
+
+    def stream_reviews(
+        self,
+        urls: List[str],
+        batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> Iterator[Tuple[Dict, pd.DataFrame]]:
+        """
+        Stream reviews for multiple URLs as fixed-size DataFrame batches
+
+        Only one page of reviews is held at a time, so callers can process
+        apps with hundreds of thousands of reviews in bounded memory.
+
+        Yields:
+            Tuple containing:
+            - Dictionary with the app's details (app_name, app_url, app_id,
+              total_reviews, app_rating)
+            - DataFrame with at most ``batch_size`` reviews of that app
+        """
+        import pandas as pd
+
+        for url in urls:
+            try:
+                app_id = self._extract_app_id(url)
+                app_info = self._fetch_app_info(app_id)
+            except Exception as e:
+                print(f"Error processing {url}: {e}")
+                continue
+
+            details = self._app_details(app_id, url, app_info)
+
+            try:
+                if self.review_store is not None:
+                    self.fetch_new_reviews(app_id, batch_size, details['total_reviews'])
+                    batches = self.review_store.iter_reviews(app_id, batch_size)
+                else:
+                    batches = self.iter_review_batches(app_id, batch_size, details['total_reviews'])
+
+                for batch in batches:
+                    with instrumentation.span('scrape.frame', app_id=app_id) as span:
+                        df = pd.DataFrame(batch)
+                        df['app_id'] = constant_category(app_id, len(df))
+                        df['app_url'] = constant_category(url, len(df))
+                        df['app_name'] = constant_category(details['app_name'], len(df))
+                        compact_review_frame(df)
+                        span.items = len(df)
+                    yield details, df
+            except Exception as e:
+                print(f"Error fetching reviews for {app_id}: {e}")
+                continue
+
+    def iter_review_batches(
+        self,
+        app_id: str,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        expected_reviews: Optional[int] = None
+    ) -> Iterator[List[Dict]]:
+        """
+        Page through an app's reviews with the continuation-token reviews() call
+
+        Pages come newest first (the reviews() default sort), and each page
+        is retried on transient errors.
+
+        Args:
+            expected_reviews: The app's review count; an empty page before it
+                is reached is retried as a failure (see FetchScheduler.iter_pages)
+
+        Yields:
+            Lists of at most ``batch_size`` raw review dictionaries
+        """
+        for batch, _ in self.scheduler.iter_pages(self.backend, app_id, batch_size, expected_reviews=expected_reviews):
+            yield batch
+
+    def fetch_new_reviews(
+        self,
+        app_id: str,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        expected_reviews: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Download reviews newer than the stored ones and add them to the store
+
+        Pages newest first and stops at the first page containing an already
+        stored review. New reviews are only written once the walk reaches the
+        stored ones (or, for an app with none stored, the end of its reviews),
+        so the store always holds an unbroken newest-first history.
+
+        Args:
+            expected_reviews: The app's review count, checked while the store
+                has none of its reviews (see FetchScheduler.iter_pages)
+
+        Returns:
+            The newly fetched reviews
+
+        Raises:
+            TruncatedWalkError: The walk ended before reaching the stored
+                reviews; nothing is written, so the next run fetches them again
+        """
+        has_stored = self.review_store.count_reviews(app_id) > 0
+        new_reviews, reached_stored = [], False
+        for batch in self.iter_review_batches(app_id, batch_size, None if has_stored else expected_reviews):
+            known = self.review_store.known_review_ids(
+                app_id, (review['reviewId'] for review in batch)
+            )
+            new_reviews.extend(review for review in batch if review['reviewId'] not in known)
+            if known:
+                reached_stored = True
+                break
+
+        if has_stored and not reached_stored:
+            raise TruncatedWalkError(
+                f"{app_id} reviews ended after {len(new_reviews)} new ones, before the stored ones"
+            )
+
+        added = self.review_store.add_reviews(app_id, new_reviews)
+        print(f"Fetched {added} new reviews for {app_id}")
+        return new_reviews
+
+    def deduplicate(self, reviews_df: pd.DataFrame) -> Tuple[pd.DataFrame, int]:
+        """
+        Apply the deduplicator to one app's reviews
+
+        Returns:
+            Tuple of (reviews, number of duplicates found); unchanged reviews
+            and 0 without a deduplicator
+        """
+        if self.deduplicator is None:
+            return reviews_df, 0
+        reviews_df, duplicates = self.deduplicator.apply(reviews_df)
+        if duplicates:
+            print(f"Found {duplicates} duplicate reviews")
+        return reviews_df, duplicates
+
+    def build_insights(
+        self,
+        details: Dict,
+        reviews_df: Optional[pd.DataFrame],
+        duplicates: int = 0,
+        metrics: Optional[Dict] = None
+    ) -> Dict:
+        """
+        Build the per-app insights row from app details and its reviews
+
+        Args:
+            details: App details as yielded by stream_reviews
+            reviews_df: All reviews collected for that app; may be None
+                when metrics are given
+            duplicates: Duplicate reviews found by deduplicate(); when they
+                were kept with a 'weight', ratings are weighted
+            metrics: SentimentAggregator.result() of the app's reviews, used
+                instead of reviews_df for callers that aggregated them batch
+                by batch
+        """
+        if metrics is not None:
+            reviews_analyzed = metrics['total_reviews']
+            negative_reviews = metrics['negative_reviews']
+            average_rating = round(metrics['average_rating'], 2)
+        elif 'weight' in reviews_df and not reviews_df.empty:
+            reviews_analyzed = len(reviews_df)
+            rated = reviews_df['score'].notna()
+            weights = reviews_df['weight'][rated]
+            negative_reviews = int(round(weights[reviews_df['score'][rated] <= 3].sum()))
+            average_rating = round((reviews_df['score'][rated] * weights).sum() / weights.sum(), 2) if rated.any() else 0
+        else:
+            reviews_analyzed = len(reviews_df)
+            negative_reviews = len(reviews_df[reviews_df['score'] <= 3])
+            average_rating = round(reviews_df['score'].mean(), 2) if not reviews_df.empty else 0
+        return {
+            "app_name": details['app_name'],
+            "app_url": details['app_url'],
+            "app_id": details['app_id'],
+            "total_reviews": details['total_reviews'],
+            "reviews_analyzed": reviews_analyzed,
+            "duplicate_reviews": duplicates,
+            "app_rating": details['app_rating'],
+            "negative_reviews": negative_reviews,
+            "average_rating": average_rating
+        }
+
+    def _fetch_app_info(self, app_id: str) -> Dict:
+        """Fetch an app's details, retrying transient errors"""
+        with instrumentation.span('fetch.app_details', app_id=app_id):
+            return self.scheduler.call(
+                self.backend.app,
+                app_id,
+                lang=DEFAULT_LANG,
+                country=DEFAULT_COUNTRY
+            )
+
+    def _app_details(self, app_id: str, url: str, app_info: Dict) -> Dict:
+        """Pick the fields of an app() response that the insights report"""
+        return {
+            "app_name": app_info.get('title', ''),
+            "app_url": url,
+            "app_id": app_id,
+            "total_reviews": app_info.get('reviews', 0),
+            "app_rating": app_info.get('score', 0.0),
+        }
+
+    def _scrape_app(self, url: str) -> Optional[Tuple[pd.DataFrame, Dict]]:
+        """
+        Fetch details and reviews for a single app URL
+
+        Returns:
+            Tuple of (reviews DataFrame, insights dict), or None when the app
+            could not be fetched or has no reviews
+        """
+        import pandas as pd
+
+        try:
+            print(f"Processing URL: {url}")
+            app_id = self._extract_app_id(url)
+            print(f"Extracted app_id: {app_id}")
+            
+            # Get app details
+            try:
+                app_info = self._fetch_app_info(app_id)
+                print(f"App details fetched. Total reviews: {app_info.get('reviews', 0)}")
+            except Exception as e:
+                print(f"Error fetching app details: {e}")
+                return None
+            
+            # Fetch reviews
+            try:
+                print("Fetching reviews...")
+                if self.review_store is not None:
+                    self.fetch_new_reviews(app_id, expected_reviews=app_info.get('reviews'))
+                    with instrumentation.span('store.load', app_id=app_id) as span:
+                        reviews_data = self.review_store.load_reviews(app_id)
+                        span.items = len(reviews_data)
+                else:
+                    # Paged, retried and (with a checkpoint store) resumable
+                    # equivalent of reviews_all()
+                    with instrumentation.span('fetch.reviews_all', app_id=app_id) as span:
+                        reviews_data = self.scheduler.fetch_all_reviews(
+                            self.backend, app_id, expected_reviews=app_info.get('reviews')
+                        )
+                        span.items = len(reviews_data)
+                print(f"Successfully fetched {len(reviews_data)} reviews")
+                
+                # Convert to DataFrame
+                if not reviews_data:
+                    return None
+
+                with instrumentation.span('scrape.frame', app_id=app_id) as span:
+                    df = pd.DataFrame(reviews_data)
+                    df['app_id'] = constant_category(app_id, len(df))
+                    df['app_url'] = constant_category(url, len(df))
+                    df['app_name'] = constant_category(app_info.get('title', ''), len(df))
+
+                with instrumentation.span('scrape.dedup', app_id=app_id) as span:
+                    df, duplicates = self.deduplicate(df)
+                    span.items = len(df)
+
+                with instrumentation.span('scrape.insights', app_id=app_id) as span:
+                    # Generate insights
+                    insights = self.build_insights(self._app_details(app_id, url, app_info), df, duplicates)
+                    compact_review_frame(df)
+                    span.items = len(df)
+
+                print(f"Successfully processed app: {app_info.get('title', '')}")
+                return df, insights
+                
+            except Exception as e:
+                print(f"Error fetching reviews: {e}")
+                return None
+            
+        except Exception as e:
+            print(f"Error processing {url}: {e}")
+            return None
     
     def _extract_app_id(self, url: str) -> str:
         """
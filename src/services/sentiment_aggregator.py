@@ -0,0 +1,155 @@
+from collections import Counter
+from fractions import Fraction
+from typing import Dict, Iterable, Optional
+import numpy as np
+
+# Sentiment buckets as half-open [low, high) polarity ranges
+SENTIMENT_BUCKETS = (
+    ('Very Negative', -1.0, -0.6),
+    ('Negative', -0.6, -0.2),
+    ('Neutral', -0.2, 0.2),
+    ('Positive', 0.2, 0.6),
+    ('Very Positive', 0.6, 1.0),
+)
+_BUCKET_EDGES = np.array([low for _, low, _ in SENTIMENT_BUCKETS] + [SENTIMENT_BUCKETS[-1][2]])
+
+
+def exact_sum(values: np.ndarray) -> Fraction:
+    """
+    Exact sum of float64 values
+
+    Each float is split into an integer mantissa and a power-of-two exponent
+    (x = m * 2**(e - 53)); mantissas are summed per exponent as int64 halves,
+    which cannot overflow or round. The result does not depend on how values
+    were batched or in which order partial sums were merged.
+    """
+    values = np.asarray(values, dtype=np.float64).ravel()
+    values = values[values != 0]
+    if values.size == 0:
+        return Fraction(0)
+
+    mantissas, exponents = np.frexp(values)
+    mantissas = (mantissas * 2.0 ** 53).astype(np.int64)
+    order = np.argsort(exponents, kind='stable')
+    exponents = exponents[order]
+    mantissas = mantissas[order]
+    starts = np.flatnonzero(np.r_[True, exponents[1:] != exponents[:-1]])
+
+    # 26-bit halves keep every per-exponent int64 sum far from overflow
+    high_sums = np.add.reduceat(mantissas >> 26, starts)
+    low_sums = np.add.reduceat(mantissas & ((1 << 26) - 1), starts)
+
+    total = Fraction(0)
+    for exponent, high, low in zip(exponents[starts].tolist(), high_sums.tolist(), low_sums.tolist()):
+        total += Fraction((high << 26) + low) * Fraction(2) ** (exponent - 53)
+    return total
+
+
+def sentiment_buckets(sentiments: np.ndarray) -> np.ndarray:
+    """Index into SENTIMENT_BUCKETS of each polarity, or -1 outside all buckets"""
+    # One pass: locate each polarity's [low, high) bucket
+    buckets = np.searchsorted(_BUCKET_EDGES, sentiments, side='right') - 1
+    buckets[buckets >= len(SENTIMENT_BUCKETS)] = -1
+    return buckets
+
+
+class SentimentAggregator:
+    """
+    Incrementally maintained analysis metrics
+
+    Feed it batches of sentiments, ratings and word counts with update();
+    combine aggregators built by different workers or for different apps
+    with merge(). result() returns the summary metrics at any point.
+
+    Reviews may carry weights (see ReviewDeduplicator): averages, negative
+    reviews and the sentiment distribution then count weights instead of
+    reviews, while total_reviews still counts every review.
+    """
+
+    def __init__(self):
+        self.total_reviews = 0
+        self.rating_count = 0
+        self.negative_reviews = 0
+        self.rating_sum = Fraction(0)
+        self.sentiment_sum = Fraction(0)
+        # Denominator of the average sentiment: total_reviews when unweighted
+        self.sentiment_weight = Fraction(0)
+        self.bucket_counts = np.zeros(len(SENTIMENT_BUCKETS), dtype=np.float64)
+        self.common_words = Counter()
+
+    def update(
+        self,
+        sentiments: Iterable[float],
+        ratings: Optional[Iterable[float]] = None,
+        common_words: Optional[Counter] = None,
+        weights: Optional[Iterable[float]] = None
+    ) -> 'SentimentAggregator':
+        """
+        Add one batch of reviews
+
+        Args:
+            sentiments: Polarity of each review in the batch
+            ratings: Star rating of each review; missing values are skipped
+            common_words: Word counts of the batch
+            weights: Weight of each review, 1 when omitted
+        """
+        sentiments = np.asarray(sentiments, dtype=np.float64)
+        self.total_reviews += len(sentiments)
+        buckets = sentiment_buckets(sentiments)
+        in_bucket = buckets >= 0
+
+        if weights is None:
+            self.sentiment_sum += exact_sum(sentiments)
+            self.sentiment_weight += len(sentiments)
+            self.bucket_counts += np.bincount(buckets[in_bucket], minlength=len(SENTIMENT_BUCKETS))
+        else:
+            weights = np.asarray(weights, dtype=np.float64)
+            self.sentiment_sum += exact_sum(sentiments * weights)
+            self.sentiment_weight += exact_sum(weights)
+            self.bucket_counts += np.bincount(
+                buckets[in_bucket], weights=weights[in_bucket], minlength=len(SENTIMENT_BUCKETS)
+            )
+
+        if ratings is not None:
+            ratings = np.asarray(ratings, dtype=np.float64)
+            rated = ~np.isnan(ratings)
+            if weights is None:
+                ratings = ratings[rated]
+                self.rating_count += len(ratings)
+                self.rating_sum += exact_sum(ratings)
+                self.negative_reviews += int((ratings <= 3).sum())
+            else:
+                rating_weights = weights[rated]
+                ratings = ratings[rated]
+                self.rating_count += exact_sum(rating_weights)
+                self.rating_sum += exact_sum(ratings * rating_weights)
+                self.negative_reviews += exact_sum(rating_weights[ratings <= 3])
+
+        if common_words:
+            self.common_words.update(common_words)
+        return self
+
+    def merge(self, other: 'SentimentAggregator') -> 'SentimentAggregator':
+        """Fold another aggregator's totals into this one"""
+        self.total_reviews += other.total_reviews
+        self.rating_count += other.rating_count
+        self.negative_reviews += other.negative_reviews
+        self.rating_sum += other.rating_sum
+        self.sentiment_sum += other.sentiment_sum
+        self.sentiment_weight += other.sentiment_weight
+        self.bucket_counts += other.bucket_counts
+        self.common_words.update(other.common_words)
+        return self
+
+    def result(self, top_words: int = 10) -> Dict:
+        """Summary metrics of everything aggregated so far"""
+        return {
+            'total_reviews': self.total_reviews,
+            'average_rating': float(self.rating_sum / self.rating_count) if self.rating_count else 0.0,
+            'negative_reviews': int(round(self.negative_reviews)),
+            'average_sentiment': float(self.sentiment_sum / self.sentiment_weight) if self.sentiment_weight else 0.0,
+            'sentiment_distribution': {
+                label: int(round(count)) for (label, _, _), count in zip(SENTIMENT_BUCKETS, self.bucket_counts)
+            },
+            'common_words': dict(self.common_words.most_common(top_words)),
+        }
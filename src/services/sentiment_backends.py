@@ -0,0 +1,66 @@
+from typing import Callable, Dict, List
+from src.interfaces.sentiment_backend_interface import SentimentBackendInterface
+
+
+def _textblob_backend() -> SentimentBackendInterface:
+    from src.services.polarity_scorer import PolarityScorer
+    return PolarityScorer()
+
+
+def _lexicon_backend() -> SentimentBackendInterface:
+    from src.services.lexicon_scorer import LexiconScorer
+    return LexiconScorer()
+
+
+# Backend name -> factory; factories import their engine on first use
+_BACKENDS: Dict[str, Callable[[], SentimentBackendInterface]] = {
+    'textblob': _textblob_backend,
+    'lexicon': _lexicon_backend,
+}
+
+
+def register_backend(name: str, factory: Callable[[], SentimentBackendInterface]):
+    """
+    Make a sentiment backend selectable by name
+
+    The parallel analyzer (n_jobs > 1) sends the factory to its worker
+    processes by reference. Under the spawn start method (the default on
+    macOS and Windows) they re-import its module and register it there, so
+    the factory must be a module-level function or class, not a lambda or a
+    nested function.
+
+    Args:
+        name: Name used in configuration and on the command line
+        factory: Callable returning a new backend instance
+    """
+    _BACKENDS[name] = factory
+
+
+def available_backends() -> List[str]:
+    """Names of the registered sentiment backends"""
+    return sorted(_BACKENDS)
+
+
+def backend_factory(name: str) -> Callable[[], SentimentBackendInterface]:
+    """
+    Factory registered under a name
+
+    Raises:
+        ValueError: If no backend is registered under that name
+    """
+    try:
+        return _BACKENDS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown sentiment backend: {name} (available: {', '.join(available_backends())})"
+        ) from None
+
+
+def create_backend(name: str) -> SentimentBackendInterface:
+    """
+    Build the sentiment backend registered under a name
+
+    Raises:
+        ValueError: If no backend is registered under that name
+    """
+    return backend_factory(name)()
@@ -0,0 +1,139 @@
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple, Union
+from src.config import DEFAULT_CACHE_ENTRIES
+
+# Cached value per review text: (polarity, normalized tokens)
+CacheEntry = Tuple[float, Tuple[str, ...]]
+
+
+class SentimentCache:
+    """
+    Memoizes per-review sentiment and tokens, keyed by a content hash
+
+    Entries live in a size-bounded in-memory LRU. With a path, they are also
+    written to an SQLite file, so results survive across sessions and misses
+    in memory fall back to disk before anything is re-scored.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_CACHE_ENTRIES,
+        path: Optional[Union[str, Path]] = None
+    ):
+        self.max_entries = max(1, int(max_entries))
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self._entries: 'OrderedDict[str, CacheEntry]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        if path is not None:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(path), check_same_thread=False)
+            with self._conn:
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS sentiment_cache ("
+                    "key TEXT PRIMARY KEY, polarity REAL NOT NULL, cleaned TEXT NOT NULL)"
+                )
+
+    @staticmethod
+    def key(text: str, namespace: str = '') -> str:
+        """
+        Content hash of a review text
+
+        Args:
+            text: Review text
+            namespace: Fingerprint of the settings the cached values depend on
+                (e.g. the stop-word list), so changed settings never hit stale entries
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(namespace.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(text.encode('utf-8', 'surrogatepass'))
+        return digest.hexdigest()
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, CacheEntry]:
+        """
+        Look up keys in memory, then on disk
+
+        Each distinct key counts as one hit or one miss.
+
+        Returns:
+            Dictionary with the entries found; missing keys are left out
+        """
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        missing = []
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is None:
+                    missing.append(key)
+                else:
+                    self._entries.move_to_end(key)
+                    found[key] = entry
+
+            if missing and self._conn is not None:
+                from_disk = self._read_disk(missing)
+                for key, entry in from_disk.items():
+                    self._remember(key, entry)
+                found.update(from_disk)
+                self.disk_hits += len(from_disk)
+
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, entries: Dict[str, CacheEntry]):
+        """Add freshly computed entries to memory and, if enabled, to disk"""
+        with self._lock:
+            for key, entry in entries.items():
+                self._remember(key, entry)
+            if self._conn is not None and entries:
+                with self._conn:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO sentiment_cache (key, polarity, cleaned) VALUES (?, ?, ?)",
+                        [(key, polarity, ' '.join(tokens)) for key, (polarity, tokens) in entries.items()]
+                    )
+
+    def stats(self) -> Dict:
+        """Hit/miss counters and current size"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'disk_hits': self.disk_hits,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'memory_entries': len(self._entries),
+        }
+
+    def close(self):
+        """Close the on-disk tier"""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _remember(self, key: str, entry: CacheEntry):
+        """Insert into the LRU, evicting the least recently used entries"""
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _read_disk(self, keys) -> Dict[str, CacheEntry]:
+        """Fetch entries from SQLite in chunks below the bound-parameter limit"""
+        found = {}
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            rows = self._conn.execute(
+                f"SELECT key, polarity, cleaned FROM sentiment_cache "
+                f"WHERE key IN ({', '.join('?' * len(chunk))})",
+                chunk
+            ).fetchall()
+            # Tokens never contain spaces, so they are stored space-joined
+            found.update((key, (polarity, tuple(cleaned.split()))) for key, polarity, cleaned in rows)
+        return found
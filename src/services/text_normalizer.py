@@ -0,0 +1,42 @@
+import re
+from collections import Counter
+from itertools import chain
+from typing import Iterable, List, Set
+
+# Anything that is not an ASCII letter or whitespace gets dropped
+NON_LETTERS = re.compile(r'[^a-zA-Z\s]')
+# The same characters restricted to ASCII, for bytes.translate's fast path
+_ASCII_NON_LETTERS = bytes(code for code in range(128) if NON_LETTERS.match(chr(code)))
+
+
+class TextNormalizer:
+    """
+    Turns review text into the lowercase, letters-only, stop-word-free tokens
+    used for common words and the word cloud
+    """
+
+    def __init__(self, stop_words: Set[str]):
+        self.stop_words = stop_words
+
+    def tokenize(self, text: str) -> List[str]:
+        """Normalize one review and return its tokens"""
+        if text.isascii():
+            # C-level lowercase and delete instead of a regex substitution
+            text = text.encode('ascii').lower().translate(None, _ASCII_NON_LETTERS).decode('ascii')
+        else:
+            text = NON_LETTERS.sub('', text.lower())
+        stop_words = self.stop_words
+        return [word for word in text.split() if word not in stop_words]
+
+    def tokenize_batch(self, texts: Iterable[str]) -> List[List[str]]:
+        """Tokenize a whole column of reviews"""
+        tokenize = self.tokenize
+        return [tokenize(text) for text in texts]
+
+    def count(self, token_lists: Iterable[List[str]]) -> Counter:
+        """Word frequencies over tokenized reviews, in first-seen order"""
+        return Counter(chain.from_iterable(token_lists))
+
+    def count_texts(self, texts: Iterable[str]) -> Counter:
+        """Word frequencies over raw reviews, without keeping per-review tokens"""
+        return Counter(chain.from_iterable(map(self.tokenize, texts)))
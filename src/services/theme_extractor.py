@@ -0,0 +1,414 @@
+from __future__ import annotations
+import zlib
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from src.config import (
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_THEME_COUNT,
+    DEFAULT_THEME_FEATURES,
+    DEFAULT_THEME_MEMORY_MB,
+)
+from src.services import instrumentation
+from src.services.sentiment_aggregator import SENTIMENT_BUCKETS, sentiment_buckets
+from src.services.text_normalizer import TextNormalizer
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Terms are hashed into 2**HASH_BITS feature ids; among the few thousand
+# features kept, collisions are rare
+HASH_BITS = 20
+HASH_MASK = (1 << HASH_BITS) - 1
+# Bytes per stored (review, term) entry: int32 row, int32 feature, float32 weight
+ENTRY_BYTES = 12
+# Online passes over the review-term matrix, and multiplicative updates of
+# the review weights (per mini-batch) and of the theme terms (per update)
+EPOCHS = 3
+W_ITERATIONS = 20
+H_ITERATIONS = 5
+# Terms listed per theme; the first few name it
+THEME_TERMS = 8
+THEME_LABEL_TERMS = 3
+_EPS = 1e-9
+# Function words dropped on top of the analyzer's stop words, so themes are
+# built from content words; negations stay ("not work", "doesnt load")
+THEME_STOP_WORDS = {
+    'a', 'about', 'after', 'all', 'am', 'an', 'and', 'any', 'are', 'as', 'at',
+    'be', 'been', 'but', 'by', 'did', 'do', 'does', 'for', 'from', 'had', 'has',
+    'have', 'he', 'her', 'his', 'i', 'if', 'im', 'in', 'into', 'is', 'it', 'its',
+    'ive', 'me', 'my', 'of', 'on', 'or', 'our', 'she', 'so', 'that', 'the',
+    'their', 'them', 'then', 'there', 'they', 'this', 'to', 'too', 'us', 'very',
+    'was', 'we', 'were', 'what', 'when', 'which', 'who', 'with', 'you', 'your',
+}
+
+# (rows, feature ids, weights, number of rows) of one mini-batch
+SparseBatch = Tuple[np.ndarray, np.ndarray, np.ndarray, int]
+
+
+class Lemmatizer:
+    """
+    Maps inflected words to one base form: crashes, crashing -> crash
+
+    Uses NLTK's WordNet lemmatizer when the WordNet corpus is installed
+    (``nltk.download('wordnet')``). Without it, words are grouped by their
+    Porter stem, which needs no corpus, and each stem is displayed as the
+    shortest word seen with it. Base forms are cached per distinct word.
+    """
+
+    def __init__(self, use_wordnet: bool = True):
+        self.uses_wordnet = False
+        self._base = _identity
+        self._cache: Dict[str, str] = {}
+        self._display: Dict[str, str] = {}
+        try:
+            if use_wordnet:
+                self._base = self._wordnet_lemmatizer()
+                self.uses_wordnet = self._base is not None
+            if not self.uses_wordnet:
+                from nltk.stem import PorterStemmer
+                self._base = PorterStemmer().stem
+        except ImportError:
+            self._base = _identity
+
+    def __call__(self, word: str) -> str:
+        base = self._cache.get(word)
+        if base is None:
+            base = self._cache[word] = self._base(word)
+            shown = self._display.get(base)
+            if shown is None or (len(word), word) < (len(shown), shown):
+                self._display[base] = word
+        return base
+
+    def label(self, base: str) -> str:
+        """Readable form of a base form, e.g. of the stem 'batteri'"""
+        if self.uses_wordnet:
+            return base
+        return self._display.get(base, base)
+
+    @staticmethod
+    def _wordnet_lemmatizer():
+        from nltk.stem import WordNetLemmatizer
+
+        lemmatizer = WordNetLemmatizer()
+        try:
+            lemmatizer.lemmatize('tests')
+        except LookupError:
+            # The corpus is not installed
+            return None
+
+        def lemmatize(word: str) -> str:
+            # Verb first (crashing -> crash), then noun (batteries -> battery)
+            verb = lemmatizer.lemmatize(word, 'v')
+            return verb if verb != word else lemmatizer.lemmatize(word, 'n')
+        return lemmatize
+
+
+def _identity(word: str) -> str:
+    return word
+
+
+class ThemeExtractor:
+    """
+    Finds recurring themes in reviews with TF-IDF weighting and NMF
+
+    Reviews are tokenized like the analyzer's common words, lemmatized, and
+    described by their terms and adjacent-term phrases ("dark mode"). Terms
+    are hashed into a fixed feature space, so no growing vocabulary is kept;
+    the most widespread ``max_features`` hashed features form a sparse,
+    TF-IDF weighted review-term matrix that is factorized by mini-batch
+    non-negative matrix factorization. Each theme is a weighted set of
+    terms, and each review is assigned its strongest theme.
+
+    The matrix is held in memory up to ``memory_mb``; beyond that, themes
+    are fitted on an even sample of the mini-batches and the other reviews
+    are tokenized again to assign them.
+    """
+
+    def __init__(
+        self,
+        normalizer: TextNormalizer,
+        n_themes: int = DEFAULT_THEME_COUNT,
+        max_features: int = DEFAULT_THEME_FEATURES,
+        batch_size: int = DEFAULT_CHUNK_SIZE,
+        memory_mb: float = DEFAULT_THEME_MEMORY_MB,
+        bigrams: bool = True,
+        lemmatizer: Optional[Lemmatizer] = None,
+        min_df: int = 2,
+        max_df: float = 0.5,
+        random_state: int = 0
+    ):
+        """
+        Args:
+            normalizer: Tokenizer of the analyzer; its stop words and
+                THEME_STOP_WORDS are left out
+            n_themes: Themes to find
+            max_features: Terms and phrases kept, by number of reviews using them
+            batch_size: Reviews per mini-batch
+            memory_mb: Memory budget of the stored review-term matrix
+            bigrams: Also use phrases of two adjacent terms
+            lemmatizer: Base form lookup; a new Lemmatizer by default
+            min_df: Ignore terms used by fewer reviews
+            max_df: Ignore terms used by more than this share of reviews
+            random_state: Seed of the factorization's initial themes
+        """
+        self.normalizer = TextNormalizer(normalizer.stop_words | THEME_STOP_WORDS)
+        self.n_themes = n_themes
+        self.max_features = max_features
+        self.batch_size = batch_size
+        self.memory_mb = memory_mb
+        self.bigrams = bigrams
+        self.lemmatizer = lemmatizer if lemmatizer is not None else Lemmatizer()
+        self.min_df = min_df
+        self.max_df = max_df
+        self.random_state = random_state
+
+    def extract(self, texts: Sequence[str]) -> Dict:
+        """
+        Find the themes of a column of reviews
+
+        Args:
+            texts: Review texts (a list, or a pandas Series of str)
+
+        Returns:
+            Dictionary containing:
+            - themes: List of {'label', 'terms', 'reviews'} dicts, most
+              common theme first
+            - assignments: int16 array with the index in themes of each
+              review's theme, -1 for reviews without any kept term
+            - top_terms: Most widespread terms and phrases with the number
+              of reviews using them
+        """
+        texts = [text if isinstance(text, str) else '' for text in texts]
+        n = len(texts)
+        with instrumentation.span('themes.vectorize') as span:
+            df, labels, stored = self._scan(texts)
+            span.items = n
+        features = self._select(df, labels, n)
+        result = {
+            'themes': [],
+            'assignments': np.full(n, -1, dtype=np.int16),
+            'top_terms': {self._label(labels[f]): int(df[f]) for f in features[:20]},
+        }
+        if not len(features):
+            return result
+
+        remap = np.full(HASH_MASK + 1, -1, dtype=np.int32)
+        remap[features] = np.arange(len(features), dtype=np.int32)
+        # Smoothed inverse document frequency, as in scikit-learn
+        idf = (np.log((1 + n) / (1 + df[features])) + 1).astype(np.float32)
+        batches = {start: self._weigh(batch, remap, idf) for start, batch in stored.items()}
+
+        with instrumentation.span('themes.fit') as span:
+            H = self._fit(list(batches.values()), len(features))
+            span.items = sum(batch[3] for batch in batches.values())
+        with instrumentation.span('themes.assign') as span:
+            assignments = self._assign(texts, batches, remap, idf, H)
+            span.items = n
+
+        sizes = np.bincount(assignments[assignments >= 0], minlength=len(H))
+        order = np.argsort(-sizes, kind='stable')
+        rank = np.empty(len(order), dtype=np.int16)
+        rank[order] = np.arange(len(order))
+        result['assignments'] = np.where(assignments >= 0, rank[np.maximum(assignments, 0)], -1).astype(np.int16)
+        for theme in order:
+            terms = [self._label(labels[features[f]]) for f in np.argsort(-H[theme])[:THEME_TERMS] if H[theme, f] > _EPS]
+            result['themes'].append({
+                'label': ', '.join(terms[:THEME_LABEL_TERMS]),
+                'terms': terms,
+                'reviews': int(sizes[theme]),
+            })
+        return result
+
+    def _scan(self, texts: List[str]) -> Tuple[np.ndarray, Dict[int, str], Dict[int, tuple]]:
+        """
+        First pass: document frequencies of every hashed feature, a bounded
+        feature -> term lookup, and the mini-batches that fit the memory budget
+        """
+        df = np.zeros(HASH_MASK + 1, dtype=np.int64)
+        labels: Dict[int, str] = {}
+        stored: Dict[int, tuple] = {}
+        stored_bytes, stride = 0, 1
+        budget = self.memory_mb * 1024 * 1024
+
+        for start in range(0, len(texts), self.batch_size):
+            batch, terms = self._vectorize(texts[start:start + self.batch_size])
+            df += np.bincount(batch[1], minlength=HASH_MASK + 1)
+            for term, feature in terms.items():
+                labels.setdefault(feature, term)
+            if len(labels) > 8 * self.max_features:
+                # Keep the terms of the features that are widespread so far;
+                # a pruned one comes back when it shows up again
+                keep = sorted(labels, key=df.__getitem__, reverse=True)[:4 * self.max_features]
+                labels = {feature: labels[feature] for feature in keep}
+
+            if (start // self.batch_size) % stride == 0:
+                stored[start] = batch
+                stored_bytes += len(batch[1]) * ENTRY_BYTES
+            while stored_bytes > budget and len(stored) > 1:
+                # Over budget: keep every other stored batch from here on
+                stride *= 2
+                stored = {s: b for s, b in stored.items() if (s // self.batch_size) % stride == 0}
+                stored_bytes = sum(len(b[1]) * ENTRY_BYTES for b in stored.values())
+        return df, labels, stored
+
+    def _vectorize(self, texts: List[str]) -> Tuple[tuple, Dict[str, int]]:
+        """Hashed term counts of a mini-batch: (rows, features, counts, n_rows) and term -> feature"""
+        lemmatize = self.lemmatizer
+        flat: List[str] = []
+        lengths = np.zeros(len(texts), dtype=np.int64)
+        for i, tokens in enumerate(self.normalizer.tokenize_batch(texts)):
+            bases = [lemmatize(token) for token in tokens]
+            if self.bigrams:
+                bases += [f'{first} {second}' for first, second in zip(bases, bases[1:])]
+            flat.extend(bases)
+            lengths[i] = len(bases)
+
+        terms = {term: zlib.crc32(term.encode('utf-8')) & HASH_MASK for term in dict.fromkeys(flat)}
+        features = np.fromiter(map(terms.__getitem__, flat), dtype=np.int64, count=len(flat))
+        rows = np.repeat(np.arange(len(texts), dtype=np.int64), lengths)
+        # Distinct (review, feature) pairs with their counts, via one sort
+        keys = np.sort((rows << HASH_BITS) | features)
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]]) if len(keys) else np.empty(0, dtype=np.int64)
+        counts = np.diff(np.r_[starts, len(keys)]).astype(np.float32)
+        keys = keys[starts]
+        batch = ((keys >> HASH_BITS).astype(np.int32), (keys & HASH_MASK).astype(np.int32), counts, len(texts))
+        return batch, terms
+
+    def _select(self, df: np.ndarray, labels: Dict[int, str], n: int) -> np.ndarray:
+        """Hashed ids of the kept features, most widespread first"""
+        candidates = np.fromiter(labels, dtype=np.int64, count=len(labels))
+        counts = df[candidates]
+        candidates = candidates[(counts >= self.min_df) & (counts <= max(self.min_df, self.max_df * n))]
+        order = np.argsort(-df[candidates], kind='stable')
+        return candidates[order[:self.max_features]]
+
+    def _weigh(self, batch: tuple, remap: np.ndarray, idf: np.ndarray) -> SparseBatch:
+        """Keep the selected features; sublinear TF-IDF, L2-normalized per review"""
+        rows, features, counts, n_rows = batch
+        columns = remap[features]
+        kept = columns >= 0
+        rows, columns = rows[kept], columns[kept]
+        data = (1 + np.log(counts[kept])) * idf[columns]
+        norms = np.sqrt(np.bincount(rows, weights=data * data, minlength=n_rows))
+        data = (data / norms[rows]).astype(np.float32)
+        return rows, columns, data, n_rows
+
+    def _fit(self, batches: List[SparseBatch], n_features: int) -> np.ndarray:
+        """
+        Mini-batch NMF: per batch, solve the review weights W against the
+        current themes H, then update H from the running sufficient
+        statistics W'W and W'X
+
+        The statistics start from one pass over every batch and then decay
+        over about one epoch, so they always cover all batches: a term only
+        used in late batches never has its weight zeroed for good by
+        updates that have not seen it yet.
+        """
+        rng = np.random.default_rng(self.random_state)
+        k = min(self.n_themes, n_features)
+        H = rng.random((k, n_features)) + 0.1
+        A = np.zeros((k, k))
+        B = np.zeros((k, n_features))
+        for batch in batches:
+            self._accumulate(batch, H, A, B)
+        self._update_themes(H, A, B)
+
+        decay = 1 - 1 / len(batches)
+        for _ in range(EPOCHS):
+            for b in rng.permutation(len(batches)):
+                A *= decay
+                B *= decay
+                self._accumulate(batches[b], H, A, B)
+                self._update_themes(H, A, B)
+        return H
+
+    def _accumulate(self, batch: SparseBatch, H: np.ndarray, A: np.ndarray, B: np.ndarray):
+        """Add one batch's W'W and W'X, for W solved against H, to A and B"""
+        rows, columns, data, _ = batch
+        W = self._solve_weights(batch, H)
+        A += W.T @ W
+        for j in range(len(H)):
+            B[j] += np.bincount(columns, weights=data * W[rows, j], minlength=B.shape[1])
+
+    @staticmethod
+    def _update_themes(H: np.ndarray, A: np.ndarray, B: np.ndarray):
+        for _ in range(H_ITERATIONS):
+            H *= B / (A @ H + _EPS)
+
+    def _solve_weights(self, batch: SparseBatch, H: np.ndarray) -> np.ndarray:
+        """Non-negative review weights W minimizing ||X - WH|| for fixed H"""
+        rows, columns, data, n_rows = batch
+        k = len(H)
+        XHt = np.empty((n_rows, k))
+        for j in range(k):
+            XHt[:, j] = np.bincount(rows, weights=data * H[j, columns], minlength=n_rows)
+        HHt = H @ H.T
+        W = XHt / (HHt.sum(axis=1) + _EPS)
+        for _ in range(W_ITERATIONS):
+            W *= XHt / (W @ HHt + _EPS)
+        return W
+
+    def _assign(
+        self,
+        texts: List[str],
+        batches: Dict[int, SparseBatch],
+        remap: np.ndarray,
+        idf: np.ndarray,
+        H: np.ndarray
+    ) -> np.ndarray:
+        """Strongest theme of every review, re-tokenizing batches not kept in memory"""
+        assignments = np.full(len(texts), -1, dtype=np.int16)
+        for start in range(0, len(texts), self.batch_size):
+            batch = batches.get(start)
+            if batch is None:
+                batch = self._weigh(self._vectorize(texts[start:start + self.batch_size])[0], remap, idf)
+            W = self._solve_weights(batch, H)
+            themes = W.argmax(axis=1)
+            themes[W.max(axis=1) <= _EPS] = -1
+            assignments[start:start + batch[3]] = themes
+        return assignments
+
+    def _label(self, term: str) -> str:
+        return ' '.join(self.lemmatizer.label(part) for part in term.split(' '))
+
+
+def theme_counts(reviews_df: pd.DataFrame, themes: Dict, by: str) -> pd.DataFrame:
+    """
+    Reviews per theme within groups of reviews
+
+    Args:
+        reviews_df: The reviews themes were extracted from, in the same order
+        themes: Result of ThemeExtractor.extract
+        by: 'app_id', or 'sentiment' to group by sentiment bucket
+
+    Returns:
+        DataFrame with one row per group and one column per theme, in theme
+        order, named by theme_names()
+    """
+    import pandas as pd
+
+    assignments = themes['assignments']
+    if by == 'sentiment':
+        buckets = sentiment_buckets(reviews_df['sentiment'].to_numpy(dtype=np.float64))
+        labels = np.array([label for label, _, _ in SENTIMENT_BUCKETS] + [None], dtype=object)
+        groups = pd.Categorical(labels[buckets], categories=labels[:-1])
+    else:
+        groups = reviews_df[by].to_numpy()
+    assigned = assignments >= 0
+    # Keyed by theme number: labels of different themes can coincide
+    counts = pd.crosstab(
+        pd.Series(groups[assigned], name=by),
+        pd.Categorical(assignments[assigned], categories=range(len(themes['themes']))),
+        dropna=False
+    )
+    counts.columns = pd.Index(theme_names(themes), name='theme')
+    return counts
+
+
+def theme_names(themes: Dict) -> List[str]:
+    """Distinct display name of each theme: its label, numbered when empty or repeated"""
+    names = []
+    for i, theme in enumerate(themes['themes']):
+        name = theme['label'] or f'Theme {i + 1}'
+        names.append(f'{name} ({i + 1})' if name in names else name)
+    return names
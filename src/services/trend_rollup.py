@@ -0,0 +1,407 @@
+from __future__ import annotations
+import hashlib
+import io
+from collections import Counter
+from itertools import chain
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple
+import numpy as np
+from src.config import DEFAULT_ROLLUP_TOP_TERMS
+from src.services import instrumentation
+from src.services.sentiment_aggregator import SENTIMENT_BUCKETS, sentiment_buckets
+from src.services.text_normalizer import TextNormalizer
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from src.services.review_store import ReviewStore
+
+# Additive per-cell totals; averages are derived from them at query time.
+# All but 'reviews' are weighted by a 'weight' column when present (see
+# ReviewDeduplicator), which makes them fractional
+SUM_COLUMNS = (
+    'reviews',
+    'rating_count',
+    'rating_sum',
+    'negative_reviews',
+    'sentiment_count',
+    'sentiment_sum',
+) + tuple(label for label, _, _ in SENTIMENT_BUCKETS)
+FLOAT_COLUMNS = set(SUM_COLUMNS) - {'reviews'}
+CELL_KEYS = ['app_id', 'day', 'version']
+
+
+class TrendRollup:
+    """
+    Per-app, per-day review aggregates for trend charts and range queries
+
+    Each cell (app, day, app version) holds review, rating and sentiment
+    totals plus a sentiment histogram; every query result is derived from
+    these sums, so daily or weekly trends over any date range never touch
+    the raw reviews. Term counts are kept per app and day, truncated to the
+    most frequent ``terms_per_day`` after each update, which makes top terms
+    over a range approximate for the long tail.
+
+    Feed it batches with update() as reviews arrive; each review must be
+    added once. Reviews without a date are not rolled up. In incremental
+    mode, load_or_build() keeps each app's rollup in the review store and
+    only adds the reviews newer than the ones it already holds. Earlier days
+    are not revisited, so a stored rollup is only exact while new reviews
+    cannot change how the old ones count: not with ReviewDeduplicator, where
+    a new copy can drop an old review or shrink its weight.
+    """
+
+    def __init__(
+        self,
+        normalizer: Optional[TextNormalizer] = None,
+        terms_per_day: int = DEFAULT_ROLLUP_TOP_TERMS
+    ):
+        """
+        Args:
+            normalizer: Tokenizer for term counts; None keeps no term counts
+            terms_per_day: Terms kept per app and day
+        """
+        self.normalizer = normalizer
+        self.terms_per_day = terms_per_day
+        self.cells: Optional[pd.DataFrame] = None
+        self.term_counts: Dict[Tuple[str, pd.Timestamp], Counter] = {}
+        # Newest review date added, and the ids of the reviews at that date:
+        # the high-water mark of load_or_build()
+        self.latest: Optional[pd.Timestamp] = None
+        self.latest_ids: Set[str] = set()
+
+    def update(self, reviews_df: pd.DataFrame) -> 'TrendRollup':
+        """
+        Add a batch of reviews
+
+        Uses the 'app_id', 'at', 'score', 'sentiment' (see the analyzer's
+        compact results), 'appVersion' and 'weight' columns that are present.
+        """
+        import pandas as pd
+
+        if reviews_df.empty or 'at' not in reviews_df:
+            return self
+        with instrumentation.span('rollup.update') as span:
+            at = pd.to_datetime(reviews_df['at'], errors='coerce')
+            dated = at.notna().to_numpy()
+            batch = reviews_df[dated]
+            span.items = len(batch)
+            if batch.empty:
+                return self
+
+            frame = pd.DataFrame({
+                'app_id': self._column(batch, 'app_id', ''),
+                'day': at[dated].dt.normalize().to_numpy(),
+                'version': self._column(batch, 'appVersion', ''),
+            })
+            for column, values in self._sums(batch).items():
+                frame[column] = values
+            cells = frame.groupby(CELL_KEYS, sort=False).sum()
+            self.cells = cells if self.cells is None else self._add(self.cells, cells)
+            self._advance(at[dated], batch)
+
+            if self.normalizer is not None and 'content' in batch:
+                contents = batch['content'].fillna('').astype(str)
+                if 'is_duplicate' in batch:
+                    # Like the analyzer's word counts, copies are counted once
+                    contents = contents.where(~batch['is_duplicate'].to_numpy(dtype=bool), '')
+                self._count_terms(frame, contents.tolist())
+        return self
+
+    def merge(self, other: 'TrendRollup') -> 'TrendRollup':
+        """Fold another rollup, e.g. one app's stored rollup, into this one"""
+        if other.cells is not None:
+            self.cells = other.cells.copy() if self.cells is None else self._add(self.cells, other.cells)
+        for key, counts in other.term_counts.items():
+            self.term_counts.setdefault(key, Counter()).update(counts)
+        if other.latest is not None and (self.latest is None or other.latest >= self.latest):
+            self.latest_ids = (self.latest_ids if other.latest == self.latest else set()) | other.latest_ids
+            self.latest = other.latest
+        return self
+
+    def new_reviews(self, reviews_df: pd.DataFrame) -> pd.DataFrame:
+        """The reviews not yet added: dated after the high-water mark"""
+        import pandas as pd
+
+        if self.latest is None or reviews_df.empty or 'at' not in reviews_df:
+            return reviews_df
+        at = pd.to_datetime(reviews_df['at'], errors='coerce')
+        newer = (at > self.latest).to_numpy()
+        if 'reviewId' in reviews_df:
+            same_time = (at == self.latest).to_numpy()
+            newer = newer | same_time & ~reviews_df['reviewId'].astype(str).isin(self.latest_ids).to_numpy()
+        return reviews_df[newer]
+
+    @classmethod
+    def load_or_build(
+        cls,
+        app_id: str,
+        reviews_df: pd.DataFrame,
+        normalizer: Optional[TextNormalizer] = None,
+        review_store: Optional[ReviewStore] = None,
+        settings: str = ''
+    ) -> 'TrendRollup':
+        """
+        One app's rollup, reusing the stored one and adding only newer reviews
+
+        Without a review store this is a new rollup updated with all reviews;
+        pass none when the reviews were deduplicated (see the class docstring).
+
+        Args:
+            app_id: App the reviews belong to
+            reviews_df: All of the app's (scored) reviews
+            settings: Analysis settings that change the sums, e.g. the
+                sentiment backend; rollups are stored per settings
+        """
+        if review_store is None:
+            return cls(normalizer).update(reviews_df)
+        rollup = cls.load(app_id, normalizer, review_store, settings)
+        new = rollup.new_reviews(reviews_df)
+        if rollup.latest is None or not new.empty:
+            rollup.update(new).save(app_id, review_store, settings)
+        return rollup
+
+    @classmethod
+    def load(
+        cls,
+        app_id: str,
+        normalizer: Optional[TextNormalizer] = None,
+        review_store: Optional[ReviewStore] = None,
+        settings: str = ''
+    ) -> 'TrendRollup':
+        """One app's stored rollup, or an empty one when none is stored"""
+        data = review_store.load_rollup(rollup_name(app_id, settings, normalizer)) if review_store else None
+        return cls(normalizer) if data is None else cls.from_bytes(data, normalizer)
+
+    def save(self, app_id: str, review_store: ReviewStore, settings: str = ''):
+        """Store this rollup as one app's rollup, replacing the previous one"""
+        with instrumentation.span('rollup.save', app_id=app_id) as span:
+            encoded = self.to_bytes()
+            review_store.save_rollup(rollup_name(app_id, settings, self.normalizer), encoded)
+            span.bytes = len(encoded)
+
+    def to_bytes(self) -> bytes:
+        """Serialize the cells, term counts and high-water mark (NumPy arrays only, no pickle)"""
+        cells = self.cells.reset_index() if self.cells is not None else None
+        term_keys = list(self.term_counts)
+        term_lengths = [len(self.term_counts[key]) for key in term_keys]
+        arrays = {
+            'cell_app_ids': np.array(cells['app_id'].tolist() if cells is not None else [], dtype=str),
+            'cell_days': cells['day'].to_numpy(dtype='datetime64[ns]').view(np.int64) if cells is not None
+                else np.empty(0, dtype=np.int64),
+            'cell_versions': np.array(cells['version'].tolist() if cells is not None else [], dtype=str),
+            'term_app_ids': np.array([app_id for app_id, _ in term_keys], dtype=str),
+            'term_days': np.array([day.value for _, day in term_keys], dtype=np.int64),
+            'term_lengths': np.array(term_lengths, dtype=np.int64),
+            'terms': np.array([term for key in term_keys for term in self.term_counts[key]], dtype=str),
+            'term_counts': np.array(
+                [count for key in term_keys for count in self.term_counts[key].values()], dtype=np.int64
+            ),
+            'latest': np.array([self.latest.value if self.latest is not None else np.iinfo(np.int64).min]),
+            'latest_ids': np.array(sorted(self.latest_ids), dtype=str),
+        }
+        for column in SUM_COLUMNS:
+            arrays[f'sum_{column}'] = cells[column].to_numpy() if cells is not None \
+                else np.empty(0, dtype=np.float64 if column in FLOAT_COLUMNS else np.int64)
+        buffer = io.BytesIO()
+        np.savez(buffer, **arrays)
+        return buffer.getvalue()
+
+    @classmethod
+    def from_bytes(cls, data: bytes, normalizer: Optional[TextNormalizer] = None) -> 'TrendRollup':
+        import pandas as pd
+
+        rollup = cls(normalizer)
+        with np.load(io.BytesIO(data)) as arrays:
+            if len(arrays['cell_app_ids']):
+                index = pd.MultiIndex.from_arrays([
+                    pd.Index(arrays['cell_app_ids'].tolist(), dtype=object),
+                    pd.DatetimeIndex(arrays['cell_days'].view('datetime64[ns]')),
+                    pd.Index(arrays['cell_versions'].tolist(), dtype=object),
+                ], names=CELL_KEYS)
+                rollup.cells = pd.DataFrame(
+                    {column: arrays[f'sum_{column}'] for column in SUM_COLUMNS}, index=index
+                )
+            ends = np.cumsum(arrays['term_lengths']).tolist()
+            terms = arrays['terms'].tolist()
+            counts = arrays['term_counts'].tolist()
+            start = 0
+            for app_id, day, end in zip(arrays['term_app_ids'].tolist(), arrays['term_days'].tolist(), ends):
+                rollup.term_counts[(app_id, pd.Timestamp(day))] = Counter(dict(zip(terms[start:end], counts[start:end])))
+                start = end
+            latest = int(arrays['latest'][0])
+            if latest != np.iinfo(np.int64).min:
+                rollup.latest = pd.Timestamp(latest)
+            rollup.latest_ids = set(arrays['latest_ids'].tolist())
+        return rollup
+
+    @property
+    def app_ids(self) -> List[str]:
+        if self.cells is None:
+            return []
+        return list(self.cells.index.get_level_values('app_id').unique())
+
+    def trend(
+        self,
+        app_id: Optional[str] = None,
+        freq: str = 'D',
+        start=None,
+        end=None
+    ) -> pd.DataFrame:
+        """
+        Volume, rating and sentiment per period
+
+        Args:
+            app_id: One app, or None for all apps together
+            freq: 'D' for days, 'W' for weeks starting Monday, 'M' for months
+            start, end: Inclusive date range
+
+        Returns:
+            DataFrame indexed by the first day of each period with at least
+            one review: reviews, average_rating, average_sentiment,
+            negative_reviews and one count column per sentiment bucket
+        """
+        cells = self._select(app_id, start, end)
+        daily = cells.groupby(level='day').sum()
+        if freq != 'D':
+            daily = daily.groupby(daily.index.to_period(freq).start_time).sum()
+        return self._metrics(daily.rename_axis('period'))
+
+    def releases(self, app_id: str) -> pd.DataFrame:
+        """
+        Release-to-release comparison of one app
+
+        Returns:
+            DataFrame indexed by app version, ordered by the day each version
+            was first reviewed, with the trend() metrics, first_seen,
+            last_seen and the rating_change and sentiment_change since the
+            previous version. Reviews without a version are left out.
+        """
+        cells = self._select(app_id)
+        cells = cells[cells.index.get_level_values('version') != '']
+        days = cells.index.get_level_values('day').to_series(index=cells.index.get_level_values('version'))
+        by_version = self._metrics(cells.groupby(level='version').sum())
+        by_version['first_seen'] = days.groupby(level=0).min()
+        by_version['last_seen'] = days.groupby(level=0).max()
+        by_version = by_version.sort_values('first_seen')
+        by_version['rating_change'] = by_version['average_rating'].diff()
+        by_version['sentiment_change'] = by_version['average_sentiment'].diff()
+        return by_version
+
+    def top_terms(
+        self,
+        app_id: Optional[str] = None,
+        start=None,
+        end=None,
+        n: int = 10
+    ) -> Dict[str, int]:
+        """Most frequent terms over a date range, from the per-day counts"""
+        import pandas as pd
+
+        start = pd.Timestamp(start).normalize() if start is not None else None
+        end = pd.Timestamp(end).normalize() if end is not None else None
+        total = Counter()
+        for (cell_app, day), counts in self.term_counts.items():
+            if app_id is not None and cell_app != app_id:
+                continue
+            if (start is not None and day < start) or (end is not None and day > end):
+                continue
+            total.update(counts)
+        return dict(total.most_common(n))
+
+    def _select(self, app_id: Optional[str] = None, start=None, end=None) -> pd.DataFrame:
+        import pandas as pd
+
+        if self.cells is None:
+            index = pd.MultiIndex.from_arrays(
+                [pd.Index([], dtype=object), pd.DatetimeIndex([]), pd.Index([], dtype=object)],
+                names=CELL_KEYS
+            )
+            return pd.DataFrame(columns=list(SUM_COLUMNS), index=index, dtype=float)
+        mask = np.ones(len(self.cells), dtype=bool)
+        if app_id is not None:
+            mask &= self.cells.index.get_level_values('app_id') == app_id
+        days = self.cells.index.get_level_values('day')
+        if start is not None:
+            mask &= days >= pd.Timestamp(start).normalize()
+        if end is not None:
+            mask &= days <= pd.Timestamp(end).normalize()
+        return self.cells[mask]
+
+    def _metrics(self, sums: pd.DataFrame) -> pd.DataFrame:
+        """Averages from summed cells; NaN where a period has no ratings or scores"""
+        metrics = sums[['reviews']].astype(np.int64)
+        metrics['average_rating'] = sums['rating_sum'] / sums['rating_count'].where(sums['rating_count'] > 0)
+        metrics['average_sentiment'] = sums['sentiment_sum'] / sums['sentiment_count'].where(sums['sentiment_count'] > 0)
+        metrics['negative_reviews'] = sums['negative_reviews'].round().astype(np.int64)
+        for label, _, _ in SENTIMENT_BUCKETS:
+            metrics[label] = sums[label].round().astype(np.int64)
+        return metrics
+
+    def _sums(self, batch: pd.DataFrame) -> Dict[str, np.ndarray]:
+        import pandas as pd
+
+        n = len(batch)
+        if 'score' in batch:
+            ratings = pd.to_numeric(batch['score'], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+        else:
+            ratings = np.full(n, np.nan)
+        if 'sentiment' in batch:
+            sentiments = pd.to_numeric(batch['sentiment'], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+        else:
+            sentiments = np.full(n, np.nan)
+        weights = batch['weight'].to_numpy(dtype=np.float64) if 'weight' in batch else np.ones(n)
+        rated = ~np.isnan(ratings)
+        scored = ~np.isnan(sentiments)
+
+        sums = {
+            'reviews': np.ones(n, dtype=np.int64),
+            'rating_count': np.where(rated, weights, 0.0),
+            'rating_sum': np.where(rated, ratings * weights, 0.0),
+            'negative_reviews': np.where(rated & (ratings <= 3), weights, 0.0),
+            'sentiment_count': np.where(scored, weights, 0.0),
+            'sentiment_sum': np.where(scored, sentiments * weights, 0.0),
+        }
+        buckets = np.full(n, -1)
+        buckets[scored] = sentiment_buckets(sentiments[scored])
+        for i, (label, _, _) in enumerate(SENTIMENT_BUCKETS):
+            sums[label] = np.where(buckets == i, weights, 0.0)
+        return sums
+
+    def _advance(self, at: pd.Series, batch: pd.DataFrame):
+        """Move the high-water mark to the newest review of a batch"""
+        newest = at.max()
+        if self.latest is not None and newest < self.latest:
+            return
+        ids = set(batch['reviewId'][(at == newest).to_numpy()].astype(str)) if 'reviewId' in batch else set()
+        self.latest_ids = ids | self.latest_ids if newest == self.latest else ids
+        self.latest = newest
+
+    def _count_terms(self, frame: pd.DataFrame, contents: List[str]):
+        token_lists = self.normalizer.tokenize_batch(contents)
+        for key, positions in frame.groupby(['app_id', 'day'], sort=False).indices.items():
+            counts = self.term_counts.setdefault(key, Counter())
+            counts.update(chain.from_iterable(token_lists[i] for i in positions))
+            if len(counts) > self.terms_per_day:
+                self.term_counts[key] = Counter(dict(counts.most_common(self.terms_per_day)))
+
+    @staticmethod
+    def _add(cells: pd.DataFrame, other: pd.DataFrame) -> pd.DataFrame:
+        # add() aligns on (app, day, version) but widens counts to float
+        total = cells.add(other, fill_value=0)
+        return total.astype({
+            column: np.float64 if column in FLOAT_COLUMNS else np.int64 for column in SUM_COLUMNS
+        })
+
+    @staticmethod
+    def _column(batch: pd.DataFrame, column: str, default: str) -> np.ndarray:
+        if column not in batch:
+            return np.full(len(batch), default, dtype=object)
+        return batch[column].astype(object).where(batch[column].notna(), default).astype(str).to_numpy(dtype=object)
+
+
+def rollup_name(app_id: str, settings: str, normalizer: Optional[TextNormalizer] = None) -> str:
+    """Store key of one app's rollup under the settings that shaped it"""
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update(settings.encode('utf-8'))
+    if normalizer is not None:
+        digest.update(' '.join(sorted(normalizer.stop_words)).encode('utf-8'))
+    return f'{app_id}:{digest.hexdigest()}'
@@ -0,0 +1,106 @@
+import base64
+import hashlib
+import heapq
+import io
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Mapping, Tuple
+from wordcloud import STOPWORDS, WordCloud
+
+
+class WordCloudRenderer:
+    """
+    Renders word clouds from word frequencies and caches the PNGs
+
+    Only the top ``max_words`` frequencies are handed to WordCloud, so
+    rendering cost and memory do not grow with the corpus. Rendered images
+    are cached by a fingerprint of those frequencies and the render options.
+    """
+
+    def __init__(
+        self,
+        width: int = 800,
+        height: int = 400,
+        background_color: str = 'white',
+        min_font_size: int = 10,
+        max_font_size: int = 150,
+        colormap: str = 'viridis',
+        max_words: int = 100,
+        random_state: int = 42,
+        cache_size: int = 32
+    ):
+        self.options = {
+            'width': width,
+            'height': height,
+            'background_color': background_color,
+            'min_font_size': min_font_size,
+            'max_font_size': max_font_size,
+            'colormap': colormap,
+            'max_words': max_words,
+            # Fixed layout so identical input renders identically
+            'random_state': random_state,
+        }
+        self.cache_size = max(0, int(cache_size))
+        self.hits = 0
+        self.misses = 0
+        self._images: 'OrderedDict[str, str]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def render(self, frequencies: Mapping[str, int]) -> str:
+        """
+        Render word frequencies to a PNG word cloud
+
+        Returns:
+            Base64-encoded PNG, or '' when there is nothing to draw
+        """
+        top_words = self.top_words(frequencies)
+        if not top_words:
+            return ''
+
+        key = self.fingerprint(top_words)
+        with self._lock:
+            image = self._images.get(key)
+            if image is not None:
+                self._images.move_to_end(key)
+                self.hits += 1
+                return image
+            self.misses += 1
+
+        try:
+            wordcloud = WordCloud(**self.options).generate_from_frequencies(dict(top_words))
+            img = io.BytesIO()
+            wordcloud.to_image().save(img, format='PNG')
+            image = base64.b64encode(img.getvalue()).decode()
+        except Exception as e:
+            print(f"Error generating word cloud: {e}")
+            return ''
+
+        if self.cache_size:
+            with self._lock:
+                self._images[key] = image
+                while len(self._images) > self.cache_size:
+                    self._images.popitem(last=False)
+        return image
+
+    def top_words(self, frequencies: Mapping[str, int]) -> List[Tuple[str, int]]:
+        """
+        The words WordCloud would draw: most frequent first, skipping the
+        filler words WordCloud.generate ignores
+        """
+        candidates = (
+            (word, count) for word, count in frequencies.items() if word not in STOPWORDS
+        )
+        # nlargest keeps first-seen order among ties, like a stable sort
+        return heapq.nlargest(self.options['max_words'], candidates, key=lambda item: item[1])
+
+    def fingerprint(self, top_words: List[Tuple[str, int]]) -> str:
+        """Cache key of a top-N frequency table under the current render options"""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(repr(sorted(self.options.items())).encode('utf-8'))
+        for word, count in top_words:
+            digest.update(f'\0{word}\0{count}'.encode('utf-8'))
+        return digest.hexdigest()
+
+    def stats(self) -> Dict:
+        """Image cache hit/miss counters"""
+        return {'hits': self.hits, 'misses': self.misses, 'cached_images': len(self._images)}
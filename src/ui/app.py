@@ -1,20 +1,104 @@
+import io
+import json
+import math
+import time
 import streamlit as st
 import pandas as pd
 from pathlib import Path
-from typing import List
+from typing import List, Optional, Tuple
 import sys
 
 # Add project root to path
 root_dir = Path(__file__).resolve().parent.parent.parent
 sys.path.append(str(root_dir))
 
-from src.services.scraper_service import GooglePlayScraper
+from src.services import instrumentation
+from src.services.instrumentation import Instrumentation
+from src.services.scraper_service import GooglePlayScraper, combine_review_frames
 from src.services.analyzer_service import SentimentAnalyzer
+from src.services.sentiment_aggregator import SentimentAggregator
+from src.services.sentiment_backends import available_backends
+from src.services.review_deduplicator import create_deduplicator
+from src.services.review_index import ReviewIndex
+from src.services.review_store import ReviewStore
+from src.services.sentiment_cache import SentimentCache
+from src.services.theme_extractor import ThemeExtractor, theme_counts, theme_names
+from src.services.trend_rollup import TrendRollup
+from src.services.review_io import FORMAT_SUFFIXES, MIME_TYPES, read_reviews, read_analysis_summary, write_reviews
+from src.config import (
+    DEDUP_MODES,
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_CACHE_PATH,
+    DEFAULT_DEDUP_MODE,
+    DEFAULT_SENTIMENT_BACKEND,
+    RESULT_CACHE_TTL_SECONDS,
+    RESULT_CACHE_ENTRIES,
+)
+
+# Session state slot holding the results currently on screen
+RESULTS_STATE_KEY = 'review_results'
+# Session state slot holding whether those results came from an incremental run
+RESULTS_INCREMENTAL_STATE_KEY = 'review_results_incremental'
+# Session state slot holding the search index of those results
+INDEX_STATE_KEY = 'review_index'
+# Session state slot holding the themes of those results
+THEMES_STATE_KEY = 'review_themes'
+# Session state slot holding the encoded downloads of those results
+DOWNLOADS_STATE_KEY = 'review_downloads'
+# Matching reviews listed under the search box
+SEARCH_RESULT_ROWS = 100
+
+# (reviews, per-app insights, analysis, trend rollups, diagnostics of the run
+# that produced them)
+Results = Tuple[pd.DataFrame, List[dict], Optional[dict], TrendRollup, Optional[dict]]
+
+
+@st.cache_resource
+def get_review_store() -> ReviewStore:
+    """One review store connection, shared by every scraper and the search index"""
+    return ReviewStore()
+
+
+@st.cache_resource
+def get_scraper(incremental: bool, dedup_mode: str = DEFAULT_DEDUP_MODE) -> GooglePlayScraper:
+    """One scraper per mode, shared by all sessions and reruns"""
+    return GooglePlayScraper(
+        review_store=get_review_store() if incremental else None,
+        deduplicator=create_deduplicator(dedup_mode)
+    )
+
+
+@st.cache_resource
+def get_analyzer(sentiment_backend: str = DEFAULT_SENTIMENT_BACKEND) -> SentimentAnalyzer:
+    """One analyzer per sentiment backend, sharing the on-disk sentiment cache"""
+    return SentimentAnalyzer(
+        cache=SentimentCache(path=DEFAULT_CACHE_PATH),
+        compact_results=True,
+        sentiment_backend=sentiment_backend
+    )
+
+
+@st.cache_data(ttl=RESULT_CACHE_TTL_SECONDS, max_entries=RESULT_CACHE_ENTRIES, show_spinner=False)
+def cached_results(url_key: Tuple[str, ...], incremental: bool, dedup_mode: str, analyzer_key: Tuple, _ui) -> Results:
+    """
+    Scrape and analyze a URL set, cached by the normalized URLs and analyzer settings
+
+    analyzer_key only keys the cache and _ui is not hashed. Progress elements
+    are created inside this function so cache hits can replay them. Not used
+    in incremental mode: a cached result would skip fetching new reviews.
+    """
+    return _ui._fetch_and_analyze(list(url_key), incremental, dedup_mode)
+
+
+def normalize_urls(app_urls: str) -> Tuple[str, ...]:
+    """Cache key for the entered URLs: stripped and deduplicated, in input order"""
+    return tuple(dict.fromkeys(url.strip() for url in app_urls.splitlines() if url.strip()))
+
 
 class ReviewSmartUI:
     def __init__(self):
-        self.scraper = GooglePlayScraper()
-        self.analyzer = SentimentAnalyzer()
+        self.scraper = get_scraper(incremental=False)
+        self.analyzer = get_analyzer()
 
     def run(self):
         st.set_page_config(
@@ -55,32 +139,257 @@ class ReviewSmartUI:
             help="Enter one or more Google Play Store URLs to analyze reviews"
         )
 
+        incremental = st.checkbox(
+            "Only download new reviews",
+            help="Keep already-seen reviews in a local store and fetch only newer ones on repeat runs"
+        )
+
+        backends = available_backends()
+        sentiment_backend = st.selectbox(
+            "Sentiment engine",
+            backends,
+            index=backends.index(DEFAULT_SENTIMENT_BACKEND),
+            help="'textblob' matches TextBlob exactly; 'lexicon' is several times faster with approximate scores"
+        )
+        self.analyzer = get_analyzer(sentiment_backend)
+
+        dedup_mode = st.selectbox(
+            "Duplicate reviews",
+            DEDUP_MODES,
+            index=DEDUP_MODES.index(DEFAULT_DEDUP_MODE),
+            help="Copy-pasted and near-identical reviews of an app: 'drop' keeps one of each group, "
+                 "'weight' keeps all but counts each group once, 'off' counts every review. "
+                 "Both 'drop' and 'weight' change review counts and average ratings"
+        )
+
+        saved_export = st.file_uploader(
+            "Or analyze a saved review export:",
+            type=[suffix.lstrip('.') for suffix in FORMAT_SUFFIXES],
+            help="Parquet or Arrow file downloaded from a previous run; no re-scrape needed"
+        )
+
         col1, col2, col3 = st.columns([1, 1, 1])
         with col2:
             analyze_button = st.button("📊 Analyze Reviews", use_container_width=True)
 
-        if analyze_button:
-            urls = [url.strip() for url in app_urls.splitlines() if url.strip()]
+        if analyze_button and saved_export is not None:
+            try:
+                with Instrumentation() as diagnostics:
+                    reviews_df, app_insights = self._load_export(saved_export)
+                    with st.spinner("🔍 Analyzing reviews..."):
+                        analysis = self.analyzer.analyze_sentiment(reviews_df)
+                        trends = TrendRollup(self.analyzer.normalizer).update(reviews_df)
+                st.session_state[RESULTS_STATE_KEY] = (
+                    reviews_df, app_insights, analysis, trends, diagnostics.summary()
+                )
+                st.session_state[RESULTS_INCREMENTAL_STATE_KEY] = False
+            except Exception as e:
+                st.error(f"Error loading saved export: {e}")
+                return
+
+        elif analyze_button:
+            url_key = normalize_urls(app_urls)
             
-            if not urls:
+            if not url_key:
                 st.error("Please enter at least one valid URL")
                 return
 
             try:
-                with st.spinner("🔍 Scraping and analyzing reviews..."):
-                    reviews_df, app_insights = self.scraper.scrape_reviews(urls)
-                
-                if not reviews_df.empty:
-                    analysis = self.analyzer.analyze_sentiment(reviews_df)
-                    self._display_results(analysis, app_insights)
-                    self._offer_downloads(reviews_df, analysis)
+                if incremental:
+                    # Always check the store for new reviews
+                    results = self._fetch_and_analyze(list(url_key), incremental, dedup_mode)
                 else:
-                    st.error("No reviews found for the provided URLs")
-            
+                    results = cached_results(
+                        url_key, incremental, dedup_mode, self.analyzer.config_key(), self
+                    )
             except Exception as e:
                 st.error(f"Error analyzing reviews: {e}")
+                return
+
+            if results[0].empty:
+                st.session_state.pop(RESULTS_STATE_KEY, None)
+                st.error("No reviews found for the provided URLs")
+                return
+            st.session_state[RESULTS_STATE_KEY] = results
+            st.session_state[RESULTS_INCREMENTAL_STATE_KEY] = incremental
+
+        # Results stay on screen across reruns, e.g. after clicking a download button
+        if RESULTS_STATE_KEY in st.session_state:
+            reviews_df, app_insights, analysis, trends, diagnostics = st.session_state[RESULTS_STATE_KEY]
+            cache_stats = self.analyzer.cache.stats()
+            st.caption(
+                f"Sentiment cache: {cache_stats['hits']} hits, "
+                f"{cache_stats['misses']} misses ({cache_stats['hit_rate']:.0%} hit rate)"
+            )
+            self._display_results(analysis, app_insights, reviews_df)
+            self._display_trends(trends)
+            # The store is used only if it holds the reviews on screen,
+            # whatever the checkbox says now
+            self._display_search(reviews_df, st.session_state.get(RESULTS_INCREMENTAL_STATE_KEY, False))
+            self._offer_downloads(reviews_df, analysis, app_insights)
+            if diagnostics:
+                self._display_diagnostics(diagnostics)
+
+    def _fetch_and_analyze(self, urls: List[str], incremental: bool, dedup_mode: str = DEFAULT_DEDUP_MODE) -> Results:
+        """Scrape and analyze the URLs, recording per-stage diagnostics of the run"""
+        with Instrumentation() as diagnostics:
+            reviews_df, app_insights, analysis, trends = self._stream_and_analyze(urls, incremental, dedup_mode)
+        return reviews_df, app_insights, analysis, trends, diagnostics.summary()
+
+    def _stream_and_analyze(
+        self,
+        urls: List[str],
+        incremental: bool,
+        dedup_mode: str = DEFAULT_DEDUP_MODE
+    ) -> Tuple[pd.DataFrame, List[dict], Optional[dict], TrendRollup]:
+        """
+        Scrape and analyze the URLs app by app, rendering each app as soon as it finishes
+
+        Each page is scored, aggregated and rolled up for the trend charts as
+        it arrives (in incremental mode, onto the app's stored rollup), and
+        only the scored page itself is kept for the result table, which is
+        combined once at the end. Deduplication needs all of an app's
+        reviews, so with it on, an app's pages are held until its last page
+        and then deduplicated, scored and rolled up together. The final
+        cross-app analysis is summarized from the running total.
+        """
+        scraper = get_scraper(incremental, dedup_mode)
+        progress = st.progress(0.0, text="🔍 Fetching reviews...")
+        app_table = st.empty()
+        running_metrics = st.empty()
+
+        scored_frames: List[pd.DataFrame] = []
+        app_rows: List[dict] = []
+        total = SentimentAggregator()
+        trends = TrendRollup(self.analyzer.normalizer)
+        rollup_settings = repr(self.analyzer.config_key())
+        # A stored rollup never revisits old days, but a new copy can drop an
+        # old review or shrink its weight, so deduplicated apps are rolled up
+        # from scratch each run
+        rollup_store = scraper.review_store if dedup_mode == 'off' else None
+        keep_scores = self.analyzer.compact_results
+
+        def start_app(details: dict) -> dict:
+            stored = TrendRollup.load(details['app_id'], self.analyzer.normalizer, rollup_store, rollup_settings)
+            return {
+                'details': details,
+                'aggregator': SentimentAggregator(),
+                # Stored rollup, and a rollup of the reviews it does not hold yet
+                'stored': stored,
+                'added': TrendRollup(self.analyzer.normalizer),
+                'pending': [],
+                'pages': 0,
+            }
+
+        def add_batch(app: dict, batch_df: pd.DataFrame):
+            if scraper.deduplicator is not None:
+                app['pending'].append(batch_df)
+                return
+            self.analyzer.aggregate(batch_df, app['aggregator'], keep_scores=keep_scores)
+            app['added'].update(app['stored'].new_reviews(batch_df))
+            scored_frames.append(batch_df)
+
+        def finish_app(app: dict):
+            details, aggregator, duplicates = app['details'], app['aggregator'], 0
+            if app['pending']:
+                with instrumentation.span('scrape.combine', app_id=details['app_id']) as span:
+                    app_df = combine_review_frames(app['pending'])
+                    span.items = len(app_df)
+                app['pending'].clear()
+                with instrumentation.span('scrape.dedup', app_id=details['app_id']) as span:
+                    app_df, duplicates = scraper.deduplicate(app_df)
+                    span.items = len(app_df)
+                self.analyzer.aggregate(app_df, aggregator, keep_scores=keep_scores)
+                app['added'].update(app_df)
+                scored_frames.append(app_df)
+            rollup = app['stored'].merge(app['added'])
+            if rollup_store is not None and (app['added'].cells is not None or rollup.latest is None):
+                rollup.save(details['app_id'], rollup_store, rollup_settings)
+            trends.merge(rollup)
+            total.merge(aggregator)
+            metrics = aggregator.result(top_words=0)
+            app_rows.append({
+                **scraper.build_insights(details, None, duplicates, metrics),
+                'average_sentiment': metrics['average_sentiment'],
+            })
+            with instrumentation.span('ui.render_progress') as span:
+                app_table.dataframe(pd.DataFrame(app_rows), use_container_width=True, hide_index=True)
+                self._render_running_metrics(running_metrics, total)
+                span.items = metrics['total_reviews']
 
-    def _display_results(self, analysis: dict, app_insights: List[dict]):
+        app = None
+        for details, batch_df in scraper.stream_reviews(urls, DEFAULT_BATCH_SIZE):
+            if app is not None and details['app_url'] != app['details']['app_url']:
+                finish_app(app)
+                app = None
+            if app is None:
+                app = start_app(details)
+            add_batch(app, batch_df)
+            app['pages'] += 1
+            # reviews from app() sizes the page count; it is an estimate, so clamp
+            expected_pages = max(1, math.ceil(details['total_reviews'] / DEFAULT_BATCH_SIZE))
+            app_index = urls.index(details['app_url'])
+            progress.progress(
+                (app_index + min(1.0, app['pages'] / expected_pages)) / len(urls),
+                text=f"🔍 {details['app_name']}: page {app['pages']} of ~{expected_pages} "
+                     f"(app {app_index + 1} of {len(urls)})"
+            )
+        if app is not None:
+            finish_app(app)
+
+        progress.empty()
+        app_table.empty()
+        running_metrics.empty()
+
+        app_insights = [
+            {key: value for key, value in row.items() if key != 'average_sentiment'}
+            for row in app_rows
+        ]
+        with instrumentation.span('scrape.combine') as span:
+            reviews_df = combine_review_frames(scored_frames)
+            span.items = len(reviews_df)
+        if reviews_df.empty:
+            return reviews_df, app_insights, None, trends
+        return reviews_df, app_insights, self.analyzer.summarize(total), trends
+
+    def _render_running_metrics(self, placeholder, aggregator: SentimentAggregator):
+        """Partial totals over the apps finished so far"""
+        metrics = aggregator.result(top_words=0)
+        cols = placeholder.container().columns(4)
+        values = [
+            ("Reviews So Far", metrics['total_reviews']),
+            ("Average Rating", f"{metrics['average_rating']:.2f}"),
+            ("Negative Reviews", metrics['negative_reviews']),
+            ("Sentiment Score", f"{metrics['average_sentiment']:.2f}")
+        ]
+        for col, (label, value) in zip(cols, values):
+            col.metric(label, value)
+
+    def _load_export(self, uploaded_file) -> Tuple[pd.DataFrame, List[dict]]:
+        """Read reviews and per-app insights back from a saved Parquet/Arrow export"""
+        format = FORMAT_SUFFIXES[Path(uploaded_file.name).suffix.lower()]
+        with instrumentation.span(f'import.{format}') as span:
+            reviews_df = read_reviews(uploaded_file, format=format)
+            span.items = len(reviews_df)
+            span.bytes = uploaded_file.size
+        uploaded_file.seek(0)
+        summary = read_analysis_summary(uploaded_file, format=format) or {}
+        app_insights = summary.get('app_insights')
+        if not app_insights:
+            # Exports without stored insights: rebuild them from the reviews alone
+            app_insights = [
+                self.scraper.build_insights({
+                    'app_name': app_df['app_name'].iloc[0] if 'app_name' in app_df else app_id,
+                    'app_url': app_df['app_url'].iloc[0] if 'app_url' in app_df else '',
+                    'app_id': app_id,
+                    'total_reviews': len(app_df),
+                    'app_rating': 0.0,
+                }, app_df)
+                for app_id, app_df in reviews_df.groupby('app_id', observed=True, sort=False)
+            ]
+        return reviews_df, app_insights
+
+    def _display_results(self, analysis: dict, app_insights: List[dict], reviews_df: pd.DataFrame):
         # Display app insights in a clean table
         st.markdown("<h2 style='text-align: center;'>App Overview</h2>", unsafe_allow_html=True)
         insights_df = pd.DataFrame(app_insights)
@@ -127,38 +436,189 @@ class ReviewSmartUI:
         
         with col1:
             st.markdown("<h3 style='text-align: center;'>Common Themes</h3>", unsafe_allow_html=True)
+            self._display_themes(analysis, reviews_df)
+
+        with col2:
+            st.markdown("<h3 style='text-align: center;'>Latest Reviews</h3>", unsafe_allow_html=True)
+            if not reviews_df.empty:
+                # Show latest 5 reviews, picked without copying the whole table
+                latest_index = pd.to_datetime(reviews_df['at']).nlargest(5).index
+                st.dataframe(
+                    reviews_df.loc[latest_index],
+                    use_container_width=True,
+                    hide_index=True
+                )
+
+    def _review_themes(self, reviews_df: pd.DataFrame) -> dict:
+        """Extract the themes of the results once per result set"""
+        cached = st.session_state.get(THEMES_STATE_KEY)
+        if cached is not None and cached[0] is reviews_df:
+            return cached[1]
+        with st.spinner("Extracting themes..."):
+            themes = ThemeExtractor(self.analyzer.normalizer).extract(reviews_df['content'])
+        st.session_state[THEMES_STATE_KEY] = (reviews_df, themes)
+        return themes
+
+    def _display_themes(self, analysis: dict, reviews_df: pd.DataFrame):
+        """Reviews per theme, overall or split by app or sentiment bucket"""
+        themes = self._review_themes(reviews_df) if 'content' in reviews_df else {'themes': []}
+        if not themes['themes']:
+            # Too few reviews to find themes: fall back to the top words
             words_df = pd.DataFrame(
                 list(analysis['common_words'].items()),
                 columns=['Word', 'Count']
             ).head(10)  # Show top 10 for better visibility
             st.bar_chart(words_df.set_index('Word'))
+            return
+
+        splits = ['All reviews', 'By app']
+        if 'sentiment' in reviews_df:
+            splits.append('By sentiment')
+        split = st.radio("Themes", splits, horizontal=True, label_visibility='collapsed')
+        if split == 'All reviews':
+            st.bar_chart(pd.Series(
+                [theme['reviews'] for theme in themes['themes']], index=theme_names(themes), name='Reviews'
+            ))
+        else:
+            counts = theme_counts(reviews_df, themes, 'app_id' if split == 'By app' else 'sentiment')
+            st.bar_chart(counts.T)
+        with st.expander("Theme terms"):
+            for theme in themes['themes']:
+                st.markdown(f"**{theme['label']}** ({theme['reviews']} reviews): {', '.join(theme['terms'])}")
+
+    def _display_trends(self, trends: TrendRollup):
+        """Daily/weekly trends and release comparison, answered from the rollups"""
+        st.markdown("<h2 style='text-align: center;'>Trends</h2>", unsafe_allow_html=True)
+        app_ids = trends.app_ids
+        if not app_ids:
+            return
 
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            app_id = st.selectbox("App", ['All apps'] + app_ids)
         with col2:
-            st.markdown("<h3 style='text-align: center;'>Latest Reviews</h3>", unsafe_allow_html=True)
-            reviews_df = pd.DataFrame(analysis['reviews_data'])
-            if not reviews_df.empty:
-                reviews_df['at'] = pd.to_datetime(reviews_df['at'])
+            period = st.radio("Period", ['Day', 'Week', 'Month'], index=1, horizontal=True)
+        app_id = None if app_id == 'All apps' else app_id
+        trend_df = trends.trend(app_id, freq=period[0])
+
+        col1, col2 = st.columns(2)
+        with col1:
+            st.markdown("<h3 style='text-align: center;'>Rating and Sentiment</h3>", unsafe_allow_html=True)
+            st.line_chart(trend_df[['average_rating', 'average_sentiment']])
+        with col2:
+            st.markdown("<h3 style='text-align: center;'>Review Volume</h3>", unsafe_allow_html=True)
+            st.bar_chart(trend_df[['reviews', 'negative_reviews']])
+
+        if app_id is not None:
+            releases_df = trends.releases(app_id)
+            if not releases_df.empty:
+                st.markdown("<h3 style='text-align: center;'>Releases</h3>", unsafe_allow_html=True)
                 st.dataframe(
-                    reviews_df.sort_values('at', ascending=False).head(5),  # Show latest 5 reviews
-                    use_container_width=True,
-                    hide_index=True
+                    releases_df[[
+                        'first_seen', 'reviews', 'average_rating', 'rating_change',
+                        'average_sentiment', 'sentiment_change', 'negative_reviews'
+                    ]].style.format({
+                        'average_rating': '{:.2f}',
+                        'rating_change': '{:+.2f}',
+                        'average_sentiment': '{:.2f}',
+                        'sentiment_change': '{:+.2f}',
+                        'first_seen': '{:%Y-%m-%d}',
+                    }, na_rep='-'),
+                    use_container_width=True
                 )
 
-    def _offer_downloads(self, reviews_df: pd.DataFrame, analysis: dict):
-        st.markdown("<h2 style='text-align: center;'>Download Reports</h2>", unsafe_allow_html=True)
-        
-        col1, col2, col3 = st.columns([1, 2, 1])
+        # What reviewers talk about in the latest period
+        latest = trend_df.index.max()
+        latest_terms = trends.top_terms(app_id, start=latest)
+        if latest_terms:
+            st.caption(f"Top terms since {latest:%Y-%m-%d}: " + ", ".join(latest_terms))
+
+    def _review_index(self, reviews_df: pd.DataFrame, incremental: bool) -> ReviewIndex:
+        """Index the results once; in incremental mode it is kept in the review store"""
+        cached = st.session_state.get(INDEX_STATE_KEY)
+        if cached is not None and cached[0] is reviews_df:
+            return cached[1]
+        review_store = get_review_store() if incremental else None
+        with st.spinner("Indexing reviews for search..."), instrumentation.span('search.index') as span:
+            index = ReviewIndex.load_or_build(reviews_df, self.analyzer.normalizer, review_store)
+            span.items = len(index)
+        st.session_state[INDEX_STATE_KEY] = (reviews_df, index)
+        return index
+
+    def _display_search(self, reviews_df: pd.DataFrame, incremental: bool):
+        """Drill down into the reviews by words, star rating and date"""
+        st.markdown("<h2 style='text-align: center;'>Search Reviews</h2>", unsafe_allow_html=True)
+        if reviews_df.empty:
+            return
+        index = self._review_index(reviews_df, incremental)
+
+        col1, col2, col3 = st.columns([2, 1, 1])
+        with col1:
+            query = st.text_input(
+                "Words",
+                placeholder="battery drain OR crash*",
+                help="All words must appear; OR separates alternatives, a trailing * matches a prefix"
+            )
         with col2:
-            # Create download buttons
-            csv = reviews_df.to_csv(index=False)
+            min_score, max_score = st.slider("Star rating", 1, 5, (1, 5))
+        with col3:
+            dates = pd.to_datetime(reviews_df['at'], errors='coerce').dropna() if 'at' in reviews_df else None
+            start, end = None, None
+            if dates is not None and not dates.empty:
+                first, last = dates.min().date(), dates.max().date()
+                date_range = st.date_input("Date range", (first, last), min_value=first, max_value=last)
+                if isinstance(date_range, tuple) and len(date_range) == 2:
+                    # Bounds left at the full range do not filter, so
+                    # reviews without a date still match
+                    start = date_range[0] if date_range[0] != first else None
+                    end = date_range[1] if date_range[1] != last else None
+
+        started = time.perf_counter()
+        positions = index.search(query, min_score=min_score, max_score=max_score, start=start, end=end)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        st.caption(f"{len(positions)} matching reviews ({elapsed_ms:.1f} ms)")
+        if len(positions):
+            st.dataframe(
+                reviews_df.iloc[positions[:SEARCH_RESULT_ROWS]],
+                use_container_width=True,
+                hide_index=True
+            )
+
+    def _display_diagnostics(self, diagnostics: dict):
+        """Per-stage timings, throughput and memory of the run behind the results"""
+        with st.expander("Run diagnostics"):
+            st.caption(
+                f"Recorded when these results were computed: {diagnostics['wall_seconds']:.2f}s wall time"
+            )
+            stages_df = pd.DataFrame.from_dict(diagnostics['stages'], orient='index')
+            st.dataframe(stages_df.rename_axis('stage'), use_container_width=True)
+            if diagnostics['counters']:
+                st.json(diagnostics['counters'])
             st.download_button(
-                "📥 Download Full Review Data (CSV)",
-                csv,
-                "reviews.csv",
-                "text/csv",
-                use_container_width=True
+                "Download diagnostics (JSON)",
+                json.dumps(diagnostics, indent=2),
+                "diagnostics.json",
+                "application/json"
             )
-            
+
+    def _download_files(self, reviews_df: pd.DataFrame, analysis: dict, app_insights: List[dict]) -> dict:
+        """
+        Encode the downloads once per result set
+
+        Every widget interaction reruns the script, so encoding the review
+        table on each run would redo it for every search keystroke.
+        """
+        cached = st.session_state.get(DOWNLOADS_STATE_KEY)
+        if cached is not None and cached[0] is reviews_df:
+            return cached[1]
+        files = {}
+        with instrumentation.span('export.downloads') as span:
+            for format in ('parquet', 'arrow'):
+                buffer = io.BytesIO()
+                write_reviews(reviews_df, buffer, format=format, analysis=analysis, app_insights=app_insights)
+                files[format] = buffer.getvalue()
+            files['csv'] = reviews_df.to_csv(index=False)
+
             # Create insights DataFrame
             insights_df = pd.DataFrame([{
                 'total_reviews': analysis['total_reviews'],
@@ -166,10 +626,39 @@ class ReviewSmartUI:
                 'negative_reviews': analysis['negative_reviews'],
                 'average_sentiment': analysis['average_sentiment']
             }])
-            insights_csv = insights_df.to_csv(index=False)
+            files['insights_csv'] = insights_df.to_csv(index=False)
+            span.items = len(reviews_df)
+            span.bytes = len(files['parquet']) + len(files['arrow']) + len(files['csv'])
+        st.session_state[DOWNLOADS_STATE_KEY] = (reviews_df, files)
+        return files
+
+    def _offer_downloads(self, reviews_df: pd.DataFrame, analysis: dict, app_insights: List[dict]):
+        st.markdown("<h2 style='text-align: center;'>Download Reports</h2>", unsafe_allow_html=True)
+        files = self._download_files(reviews_df, analysis, app_insights)
+
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col2:
+            # Columnar exports keep dtypes and the analysis summary, and can be reloaded above
+            for format, label in (('parquet', 'Parquet'), ('arrow', 'Arrow')):
+                st.download_button(
+                    f"📦 Download Reviews and Analysis ({label})",
+                    files[format],
+                    f"reviews.{format}",
+                    MIME_TYPES[format],
+                    use_container_width=True
+                )
+
+            # Create download buttons
+            st.download_button(
+                "📥 Download Full Review Data (CSV)",
+                files['csv'],
+                "reviews.csv",
+                "text/csv",
+                use_container_width=True
+            )
             st.download_button(
                 "📊 Download Analysis Summary (CSV)",
-                insights_csv,
+                files['insights_csv'],
                 "insights.csv",
                 "text/csv",
                 use_container_width=True
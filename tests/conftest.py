@@ -1,4 +1,6 @@
 import pytest
+import threading
+import time
 import sys
 from pathlib import Path
 
@@ -15,4 +17,107 @@ def pytest_configure(config):
 @pytest.fixture(autouse=True)
 def add_standard_fixtures(doctest_namespace):
     """Add any standard fixtures to all tests."""
-    pass
\ No newline at end of file
+    pass
+
+class FakePlayBackend:
+    """
+    Local stand-in for the google_play_scraper module.
+
+    Serves deterministic app details and reviews, optionally sleeping
+    ``latency`` seconds per call to mimic network round trips, and records
+    the most calls it served at once in ``max_in_flight``. fail()
+    injects errors into upcoming calls. With ``swallow_errors``, reviews()
+    behaves like google_play_scraper's: a failed page comes back empty with
+    no next token instead of raising.
+    """
+
+    def __init__(self, reviews_per_app=5, latency=0.0, swallow_errors=False):
+        self.reviews_per_app = reviews_per_app
+        self.latency = latency
+        self.swallow_errors = swallow_errors
+        self.calls = []
+        self.failures = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def fail(self, kind, times=1, after=0, error=ConnectionError):
+        """Make ``times`` calls of ``kind`` raise ``error``, after ``after`` successful ones"""
+        self.failures[kind] = [after, times, error]
+
+    def _request(self, kind, app_id):
+        """Record a call and wait out its latency, counting overlapping calls"""
+        with self._lock:
+            self.calls.append((kind, app_id))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.latency)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def _maybe_fail(self, kind):
+        plan = self.failures.get(kind)
+        if plan is None:
+            return
+        if plan[0] > 0:
+            plan[0] -= 1
+        elif plan[1] > 0:
+            plan[1] -= 1
+            raise plan[2](f"injected {kind} failure")
+
+    def _make_reviews(self, app_id):
+        from datetime import datetime, timedelta
+
+        base = datetime(2024, 1, 1)
+        return [
+            {
+                'reviewId': f'{app_id}-{i}',
+                'userName': f'user{i}',
+                'content': f'Review {i} for {app_id} is good' if i % 2 else f'Review {i} crashes a lot',
+                'score': (i % 5) + 1,
+                'thumbsUpCount': i,
+                'at': base + timedelta(hours=i),
+            }
+            for i in range(self.reviews_per_app)
+        ]
+
+    def app(self, app_id, lang='en', country='us'):
+        self._request('app', app_id)
+        self._maybe_fail('app')
+        return {'title': f'App {app_id}', 'reviews': self.reviews_per_app, 'score': 4.2}
+
+    def reviews_all(self, app_id, sleep_milliseconds=0, **kwargs):
+        self._request('reviews_all', app_id)
+        return self._make_reviews(app_id)
+
+    def reviews(self, app_id, lang='en', country='us', count=100, continuation_token=None, **kwargs):
+        self._request('reviews', app_id)
+        try:
+            self._maybe_fail('reviews')
+        except Exception:
+            if not self.swallow_errors:
+                raise
+            return [], FakeContinuationToken(None)
+        offset = continuation_token.token if continuation_token is not None else 0
+        if offset is None:
+            return [], continuation_token
+        # Newest first, like Sort.NEWEST
+        all_reviews = list(reversed(self._make_reviews(app_id)))
+        page = all_reviews[offset:offset + count]
+        next_offset = offset + count if offset + count < len(all_reviews) else None
+        return page, FakeContinuationToken(next_offset)
+
+
+class FakeContinuationToken:
+    """Continuation token whose ``token`` is the offset of the next page."""
+
+    def __init__(self, token):
+        self.token = token
+
+
+@pytest.fixture
+def fake_backend():
+    """Factory fixture building FakePlayBackend instances."""
+    return FakePlayBackend
@@ -2,6 +2,7 @@ import pytest
 import pandas as pd
 from datetime import datetime
 from src.services.analyzer_service import SentimentAnalyzer
+from src.services.sentiment_cache import SentimentCache
 
 def test_sentiment_analysis():
     # Create minimal test data
@@ -64,4 +65,130 @@ def test_empty_analysis():
     assert result['negative_reviews'] == 0
     assert result['average_sentiment'] == 0.0
     assert len(result['sentiment_scores']) == 0
-    assert result['sentiment_distribution'] == {}
\ No newline at end of file
+    assert result['sentiment_distribution'] == {}
+
+def test_analyze_batches_matches_full_analysis():
+    reviews_df = pd.DataFrame({
+        'content': ['This app is great!', 'Terrible crashes', 'Works fine', 'Not good at all', 'Love it'],
+        'score': [5, 1, 4, 2, 5],
+        'at': [datetime.now()] * 5
+    })
+
+    analyzer = SentimentAnalyzer()
+    full = analyzer.analyze_sentiment(reviews_df.copy())
+    streamed = analyzer.analyze_batches(
+        reviews_df.iloc[start:start + 2] for start in range(0, len(reviews_df), 2)
+    )
+
+    # Exact sums make batched results identical, not just close
+    for key in ('total_reviews', 'average_rating', 'negative_reviews', 'average_sentiment',
+                'sentiment_distribution', 'common_words', 'wordcloud_base64'):
+        assert streamed[key] == full[key]
+    assert streamed['sentiment_scores'] == []
+
+def test_parallel_analysis_matches_serial():
+    reviews_df = pd.DataFrame({
+        'content': ['Great app', 'Crashes on login', 'Not bad', 'Battery drain is terrible',
+                    'Great app', 'Love the dark mode', 'Login fails again'],
+        'score': [5, 1, 3, 2, 5, 4, 1],
+        'at': [datetime(2024, 1, 1)] * 7
+    })
+
+    serial = SentimentAnalyzer().analyze_sentiment(reviews_df.copy())
+    parallel = SentimentAnalyzer(n_jobs=2, chunk_size=3).analyze_sentiment(reviews_df.copy())
+
+    assert parallel == serial
+
+def test_cached_analysis_matches_uncached_and_reuses_scores():
+    reviews_df = pd.DataFrame({
+        'content': ['Great app', 'Great app', 'Crashes on login', 'Great app', 'Not bad'],
+        'score': [5, 5, 1, 4, 3],
+        'at': [datetime(2024, 1, 1)] * 5
+    })
+    cache = SentimentCache()
+    analyzer = SentimentAnalyzer(cache=cache)
+
+    uncached = SentimentAnalyzer().analyze_sentiment(reviews_df.copy())
+    first = analyzer.analyze_sentiment(reviews_df.copy())
+    assert first == uncached
+    assert (cache.hits, cache.misses) == (0, 3)
+
+    # A re-run scores nothing new
+    assert analyzer.analyze_sentiment(reviews_df.copy()) == uncached
+    assert (cache.hits, cache.misses) == (3, 3)
+
+def test_compact_results_keep_scores_on_dataframe():
+    reviews_df = pd.DataFrame({
+        'content': ['This app is great!', 'This app needs improvement', 'Terrible'],
+        'score': [5, 2, 1],
+        'at': [datetime(2024, 1, day) for day in (1, 2, 3)]
+    })
+
+    full = SentimentAnalyzer().analyze_sentiment(reviews_df.copy())
+    compact = SentimentAnalyzer(compact_results=True).analyze_sentiment(reviews_df)
+
+    assert compact['sentiment_scores'] == []
+    assert compact['reviews_data'] == []
+    assert reviews_df['sentiment'].tolist() == [entry['score'] for entry in full['sentiment_scores']]
+    for key in ('total_reviews', 'average_rating', 'average_sentiment', 'sentiment_distribution'):
+        assert compact[key] == full[key]
+
+def test_config_key_ignores_execution_settings():
+    assert SentimentAnalyzer(n_jobs=4, chunk_size=10).config_key() == SentimentAnalyzer().config_key()
+    assert SentimentAnalyzer(compact_results=True).config_key() != SentimentAnalyzer().config_key()
+
+def test_aggregate_can_keep_scores_on_batch():
+    reviews_df = pd.DataFrame({
+        'content': ['This app is great!', 'Terrible'],
+        'score': [5, 1],
+        'at': [datetime(2024, 1, day) for day in (1, 2)]
+    })
+    compact_df = reviews_df.copy()
+    expected = SentimentAnalyzer(compact_results=True).analyze_sentiment(compact_df)
+
+    analyzer = SentimentAnalyzer()
+    batch = reviews_df.copy()
+    aggregator = analyzer.aggregate(batch, keep_scores=True)
+
+    assert analyzer.summarize(aggregator) == expected
+    assert batch['sentiment'].tolist() == compact_df['sentiment'].tolist()
+
+def test_sentiment_backend_is_selectable():
+    reviews_df = pd.DataFrame({
+        'content': ['This app is very good', 'Awful'],
+        'score': [5, 1],
+        'at': [datetime(2024, 1, day) for day in (1, 2)]
+    })
+
+    analysis = SentimentAnalyzer(sentiment_backend='lexicon').analyze_sentiment(reviews_df)
+
+    assert analysis['sentiment_distribution']['Very Positive'] == 1
+    assert SentimentAnalyzer(sentiment_backend='lexicon').config_key() != SentimentAnalyzer().config_key()
+    with pytest.raises(ValueError):
+        SentimentAnalyzer(sentiment_backend='unknown')
+
+class HalfBackend:
+    """Module-level, so spawned workers can import it"""
+    name = 'half'
+
+    def score(self, texts):
+        import numpy as np
+        return np.full(len(texts), 0.5)
+
+def test_registered_backend_reaches_spawned_workers(monkeypatch):
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    from functools import partial
+    from src.services import analyzer_service, sentiment_backends
+
+    monkeypatch.setitem(sentiment_backends._BACKENDS, 'half', HalfBackend)
+    # Spawned workers start without the registration made above
+    monkeypatch.setattr(
+        analyzer_service, 'ProcessPoolExecutor',
+        partial(ProcessPoolExecutor, mp_context=multiprocessing.get_context('spawn'))
+    )
+    reviews_df = pd.DataFrame({'content': ['Good app', 'Bad app', 'Fine'], 'score': [5, 1, 3]})
+
+    analysis = SentimentAnalyzer(n_jobs=2, chunk_size=2, sentiment_backend='half').analyze_sentiment(reviews_df)
+
+    assert analysis['sentiment_distribution']['Positive'] == 3
@@ -0,0 +1,99 @@
+import pytest
+from src.services.checkpoint_store import CheckpointStore
+from src.services.fetch_scheduler import FetchScheduler, TruncatedWalkError, is_transient
+from src.services.play_store_backend import PlayStoreBackend
+from src.services.scraper_service import GooglePlayScraper
+
+class NotFoundError(Exception):
+    """Same name as google_play_scraper's missing-app error"""
+
+def test_transient_errors_are_retried_with_capped_backoff(fake_backend):
+    backend = fake_backend(reviews_per_app=7)
+    backend.fail('reviews', times=3, after=1)
+    delays = []
+    scheduler = FetchScheduler(max_retries=3, backoff_seconds=0.5, sleep=delays.append)
+
+    reviews = scheduler.fetch_all_reviews(backend, "com.example.app", page_size=3)
+
+    assert len({review['reviewId'] for review in reviews}) == 7
+    assert len(delays) == 3
+    assert all(0 <= delay <= cap for delay, cap in zip(delays, [0.5, 1.0, 2.0]))
+
+def test_permanent_errors_are_not_retried(fake_backend):
+    backend = fake_backend()
+    backend.fail('app', times=1, error=NotFoundError)
+    scheduler = FetchScheduler(max_retries=3, sleep=lambda delay: None)
+
+    assert not is_transient(NotFoundError())
+    with pytest.raises(NotFoundError):
+        scheduler.call(backend.app, "com.example.app")
+    assert backend.calls == [('app', "com.example.app")]
+
+def test_interrupted_fetch_resumes_from_checkpoint(fake_backend, tmp_path):
+    backend = fake_backend(reviews_per_app=7)
+    checkpoints = CheckpointStore(tmp_path / 'checkpoints.db')
+    scheduler = FetchScheduler(max_retries=0, checkpoint_store=checkpoints)
+
+    # The job dies on the second page
+    backend.fail('reviews', times=1, after=1)
+    with pytest.raises(ConnectionError):
+        scheduler.fetch_all_reviews(backend, "com.example.app", page_size=3)
+    assert len(checkpoints.load("com.example.app")[1]) == 3
+
+    # A new run (new store connection) only requests the two remaining pages
+    checkpoints.close()
+    checkpoints = CheckpointStore(tmp_path / 'checkpoints.db')
+    backend.calls.clear()
+    resumed = FetchScheduler(checkpoint_store=checkpoints)
+    reviews = resumed.fetch_all_reviews(backend, "com.example.app", page_size=3)
+
+    assert sorted(review['reviewId'] for review in reviews) == sorted(
+        review['reviewId'] for review in backend._make_reviews("com.example.app")
+    )
+    assert backend.calls.count(('reviews', "com.example.app")) == 2
+    assert checkpoints.load("com.example.app") is None
+    checkpoints.close()
+
+def test_swallowed_page_failure_keeps_checkpoint(fake_backend, tmp_path):
+    # Like google_play_scraper.reviews(), the failed second page comes back
+    # empty and without a next token, as if the reviews had ended
+    backend = fake_backend(reviews_per_app=7, swallow_errors=True)
+    backend.fail('reviews', times=1, after=1)
+    checkpoints = CheckpointStore(tmp_path / 'checkpoints.db')
+    scheduler = FetchScheduler(max_retries=0, checkpoint_store=checkpoints)
+
+    with pytest.raises(TruncatedWalkError):
+        scheduler.fetch_all_reviews(backend, "com.example.app", page_size=3, expected_reviews=7)
+    assert len(checkpoints.load("com.example.app")[1]) == 3
+
+    # With a retry left, the walk reaches every review and the checkpoint goes
+    backend.fail('reviews', times=1)
+    scheduler = FetchScheduler(max_retries=1, checkpoint_store=checkpoints, sleep=lambda delay: None)
+    reviews = scheduler.fetch_all_reviews(backend, "com.example.app", page_size=3, expected_reviews=7)
+
+    assert len({review['reviewId'] for review in reviews}) == 7
+    assert checkpoints.load("com.example.app") is None
+    checkpoints.close()
+
+def test_play_store_backend_raises_page_failures(monkeypatch):
+    from google_play_scraper.features import reviews as reviews_feature
+
+    def fail(*args):
+        raise ConnectionError("throttled")
+
+    monkeypatch.setattr(reviews_feature, '_fetch_review_items', fail)
+    with pytest.raises(ConnectionError):
+        PlayStoreBackend().reviews("com.example.app", count=10)
+
+def test_scraper_keeps_apps_through_transient_failures(fake_backend):
+    backend = fake_backend(reviews_per_app=4)
+    backend.fail('app', times=1)
+    backend.fail('reviews', times=2)
+    scraper = GooglePlayScraper(backend=backend)
+    scraper.scheduler.backoff_seconds = 0
+    urls = [f"https://play.google.com/store/apps/details?id=com.example.app{i}" for i in range(2)]
+
+    reviews_df, insights = scraper.scrape_reviews(urls)
+
+    assert len(reviews_df) == 8
+    assert len(insights) == 2
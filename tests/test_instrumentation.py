@@ -0,0 +1,50 @@
+import json
+from src.services import instrumentation
+from src.services.instrumentation import Instrumentation
+from src.services.scraper_service import GooglePlayScraper
+
+def test_spans_aggregate_per_stage(tmp_path):
+    log_path = tmp_path / 'trace.jsonl'
+    with Instrumentation(log_path=log_path) as diagnostics:
+        for _ in range(2):
+            with instrumentation.span('analyze.score', backend='lexicon') as span:
+                span.items = 10
+                span.bytes = 100
+        instrumentation.count('sentiment_cache.hits', 3)
+
+    summary = diagnostics.summary()
+    stage = summary['stages']['analyze.score']
+    assert (stage['calls'], stage['items'], stage['bytes']) == (2, 20, 200)
+    assert summary['counters'] == {'sentiment_cache.hits': 3}
+    # A process-wide high-water mark, not per-call growth (none on Windows)
+    assert stage['peak_rss_mb'] > 0 or instrumentation.resource is None
+    lines = [json.loads(line) for line in log_path.read_text().splitlines()]
+    assert [line['backend'] for line in lines] == ['lexicon', 'lexicon']
+
+def test_spans_are_noops_without_active_run():
+    with instrumentation.span('analyze.score') as span:
+        span.items = 5
+    instrumentation.count('sentiment_cache.hits')
+
+    with Instrumentation() as diagnostics:
+        pass
+    assert diagnostics.summary()['stages'] == {}
+
+def test_parallel_scrape_reports_worker_spans(fake_backend):
+    scraper = GooglePlayScraper(max_workers=3, backend=fake_backend(reviews_per_app=4))
+    urls = [f"https://play.google.com/store/apps/details?id=com.example.app{i}" for i in range(3)]
+
+    with Instrumentation() as diagnostics:
+        scraper.scrape_reviews(urls)
+
+    stages = diagnostics.summary()['stages']
+    assert stages['fetch.app_details']['calls'] == 3
+    assert stages['fetch.reviews_all']['items'] == 12
+
+def test_profile_collects_top_functions(tmp_path):
+    profile_path = tmp_path / 'run.prof'
+    with Instrumentation(profile_path=profile_path) as diagnostics:
+        sorted(range(1000), key=str)
+
+    assert profile_path.exists()
+    assert diagnostics.summary()['profile']
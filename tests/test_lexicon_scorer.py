@@ -0,0 +1,29 @@
+import pytest
+from textblob import TextBlob
+from src.services.lexicon_scorer import LexiconScorer
+
+@pytest.fixture(scope='module')
+def scorer():
+    return LexiconScorer()
+
+@pytest.mark.parametrize('text', [
+    'This is good',
+    'very good',
+    'It is not really good',
+    'Not good at all',
+    'Terrible and slow',
+    'This app is great!',
+    'Amazing support team :)',
+])
+def test_main_rules_match_textblob(scorer, text):
+    assert scorer.score([text])[0] == pytest.approx(TextBlob(text).sentiment.polarity)
+
+def test_batch_scores_align_with_input(scorer):
+    texts = ['Great', 'Awful', 'Great', '', 'nothing to see here']
+
+    scores = scorer.score(texts)
+
+    assert scores.tolist() == [scorer.score([text])[0] for text in texts]
+    assert scores[0] > 0 > scores[1]
+    assert scores[3] == scores[4] == 0.0
+    assert len(scorer.score([])) == 0
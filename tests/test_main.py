@@ -0,0 +1,39 @@
+import subprocess
+import sys
+from pathlib import Path
+import src.services.scraper_service as scraper_service
+from src.main import main, read_urls
+from src.services.review_io import read_reviews, read_analysis_summary
+
+def test_read_urls_skips_comments_and_duplicates(tmp_path):
+    urls_file = tmp_path / 'urls.txt'
+    urls_file.write_text("# nightly\nhttps://a\n\nhttps://b\nhttps://a\n")
+
+    assert read_urls(str(urls_file)) == ['https://a', 'https://b']
+
+def test_batch_run_writes_reports(fake_backend, monkeypatch, tmp_path):
+    backend = fake_backend(reviews_per_app=4)
+    monkeypatch.setattr(scraper_service, '_default_backend', lambda: backend)
+    urls_file = tmp_path / 'urls.txt'
+    urls_file.write_text("\n".join(
+        f"https://play.google.com/store/apps/details?id=com.example.app{i}" for i in range(2)
+    ))
+    output_dir = tmp_path / 'out'
+
+    exit_code = main([
+        str(urls_file), '--output-dir', str(output_dir), '--format', 'arrow',
+        '--cache-path', str(tmp_path / 'cache.db'), '--checkpoint-path', str(tmp_path / 'checkpoints.db'), '--per-app-reports', '--incremental', '--store-path', str(tmp_path / 'reviews.db')
+    ])
+
+    assert exit_code == 0
+    assert (output_dir / 'analysis_report.csv').exists()
+    assert (output_dir / 'analysis_report.pdf').exists()
+    assert len(read_reviews(output_dir / 'reviews.arrow')) == 8
+    assert read_analysis_summary(output_dir / 'reviews.arrow')['total_reviews'] == 8
+    assert (output_dir / 'app_insights.csv').exists()
+    assert (output_dir / 'apps' / 'com.example.app1' / 'analysis_report.pdf').exists()
+
+def test_cli_does_not_import_streamlit():
+    code = "import sys, src.main; assert not {'streamlit', 'pandas', 'pyarrow'} & set(sys.modules)"
+    root_dir = Path(__file__).resolve().parent.parent
+    subprocess.run([sys.executable, '-c', code], cwd=root_dir, check=True)
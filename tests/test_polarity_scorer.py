@@ -0,0 +1,36 @@
+import pytest
+from textblob import TextBlob
+from src.services.polarity_scorer import PolarityScorer
+
+TEXTS = [
+    'This app is great!',
+    'This app needs improvement',
+    "I don't like it at all",
+    'It is not really good',
+    'Really not good',
+    "It isn't bad!!!",
+    'Terribly slow :( but the support is very nice :)',
+    'Oh great, another update (!)',
+    'Great.\n\nBut crashes a lot',
+    '"Best" app ever <3',
+    'very :) good',
+    '',
+    '   ',
+    'Great',
+    'Great',
+]
+
+@pytest.fixture(scope='module')
+def scorer():
+    return PolarityScorer()
+
+def test_polarity_matches_textblob(scorer):
+    for text in TEXTS:
+        assert scorer.polarity(text) == TextBlob(text).sentiment.polarity, text
+
+def test_score_batch_matches_textblob(scorer):
+    scores = scorer.score(TEXTS)
+
+    assert scores.shape == (len(TEXTS),)
+    assert scores.tolist() == [TextBlob(text).sentiment.polarity for text in TEXTS]
+    assert scorer.score([]).shape == (0,)
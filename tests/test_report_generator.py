@@ -35,4 +35,41 @@ def test_generate_pdf(sample_data, tmp_path):
     assert pdf_path.suffix == '.pdf'
     
     # Check if PDF file is not empty
-    assert pdf_path.stat().st_size > 0
\ No newline at end of file
+    assert pdf_path.stat().st_size > 0
+
+@pytest.fixture
+def full_report_data():
+    from src.services.report_generator_service import build_report_data
+    analysis = {
+        'average_rating': 3.5,
+        'total_reviews': 100,
+        'negative_reviews': 40,
+        'average_sentiment': 0.12,
+        'sentiment_distribution': {'Negative': 30, 'Neutral': 50, 'Positive': 20},
+        'common_words': {'bug': 10, 'crash': 5},
+        'sentiment_scores': [{'text': 'dropped from reports', 'score': 0.0}],
+    }
+    app_insights = [{'app_id': 'com.example.app', 'app_name': 'Exämple ☃', 'reviews_analyzed': 100}]
+    return build_report_data(analysis, app_insights, word_frequencies={'bug': 10, 'crash': 5})
+
+def test_full_report_streams_all_sections(full_report_data, tmp_path):
+    import csv
+    written = ReportGenerator().generate_reports(full_report_data, tmp_path)
+
+    assert [path.name for path in written] == ['analysis_report.csv', 'app_insights.csv', 'analysis_report.pdf']
+    with open(written[0], newline='') as f:
+        metrics = dict(csv.reader(f))
+    assert metrics['Negative Reviews'] == '40'
+    assert metrics['Sentiment: Neutral'] == '50'
+    assert metrics['bug'] == '10'
+    with open(written[1], newline='', encoding='utf-8') as f:
+        assert next(csv.DictReader(f))['app_name'] == 'Exämple ☃'
+    assert 'sentiment_scores' not in full_report_data
+
+def test_batch_reports_in_worker_processes(full_report_data, tmp_path):
+    reports = [(full_report_data, tmp_path / f'app{i}') for i in range(3)]
+
+    written = ReportGenerator().generate_batch(reports, n_jobs=2, pdf=False)
+
+    assert [paths[0].parent for paths in written] == [path for _, path in reports]
+    assert all((path / 'analysis_report.csv').exists() for _, path in reports)
@@ -0,0 +1,68 @@
+import pandas as pd
+import pytest
+from src.services.review_deduplicator import ReviewDeduplicator, create_deduplicator
+from src.services.sentiment_aggregator import SentimentAggregator
+from src.services.trend_rollup import TrendRollup
+
+CRASH = 'The app keeps crashing every time I open the camera screen on my phone'
+
+def make_reviews():
+    return pd.DataFrame({
+        'reviewId': ['a', 'b', 'c', 'd', 'e', 'f'],
+        'content': [
+            CRASH,
+            # Same text apart from case, punctuation and spacing
+            'the app keeps crashing   every time i open the camera screen on my phone!!!',
+            # Near-duplicate: one word added
+            CRASH + ' today',
+            'Great app',
+            'Great app',
+            'Battery drains very fast since the last update, please fix it soon',
+        ],
+        'score': [1, 1, 2, 5, 5, 2],
+    })
+
+def test_exact_and_near_duplicates_share_a_representative():
+    representatives = ReviewDeduplicator().find_duplicates(make_reviews()['content'].tolist())
+    assert list(representatives) == [0, 0, 0, 3, 4, 5]
+
+def test_short_reviews_are_duplicates_only_in_floods():
+    texts = ['Great app'] * 3 + [None, None, '', 'great APP!']
+    representatives = ReviewDeduplicator(min_words=5).find_duplicates(texts)
+    assert list(representatives) == [0, 1, 2, 3, 4, 5, 6]
+
+    # More copies than the limit are one group; empty texts never are
+    representatives = ReviewDeduplicator(min_words=5, short_copy_limit=3).find_duplicates(texts)
+    assert list(representatives) == [0, 0, 0, 3, 4, 5, 0]
+    representatives = ReviewDeduplicator(min_words=5, short_copy_limit=None).find_duplicates(['Great app'] * 50)
+    assert list(representatives) == list(range(50))
+
+def test_drop_and_weight_modes():
+    dropped, duplicates = ReviewDeduplicator(mode='drop').apply(make_reviews())
+    assert duplicates == 2
+    assert list(dropped['reviewId']) == ['a', 'd', 'e', 'f']
+
+    reviews_df = make_reviews()
+    weighted, duplicates = ReviewDeduplicator(mode='weight').apply(reviews_df)
+    assert duplicates == 2
+    assert 'weight' not in reviews_df
+    assert len(weighted) == 6
+    assert list(weighted['is_duplicate']) == [False, True, True, False, False, False]
+    assert weighted['weight'].sum() == pytest.approx(4)
+
+    # The crash group counts once in ratings
+    metrics = SentimentAggregator().update(
+        [0.0] * 6, weighted['score'], weights=weighted['weight']
+    ).result()
+    assert metrics['average_rating'] == pytest.approx((4 / 3 + 5 + 5 + 2) / 4)
+    assert metrics['negative_reviews'] == 2
+    assert metrics['total_reviews'] == 6
+
+    # Trend charts agree with the weighted headline metrics
+    daily = TrendRollup().update(weighted.assign(at=pd.Timestamp('2024-01-01'))).trend()
+    assert daily['average_rating'].iloc[0] == pytest.approx(metrics['average_rating'])
+    assert daily['negative_reviews'].iloc[0] == 2
+
+    assert create_deduplicator('off') is None
+    with pytest.raises(ValueError):
+        ReviewDeduplicator(mode='off')
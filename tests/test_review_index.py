@@ -0,0 +1,48 @@
+import pandas as pd
+import pytest
+from src.services.review_index import ReviewIndex, review_fingerprint
+from src.services.review_store import ReviewStore
+from src.services.text_normalizer import TextNormalizer
+
+@pytest.fixture
+def reviews_df():
+    return pd.DataFrame({
+        'reviewId': ['r0', 'r1', 'r2', 'r3'],
+        'content': ['App crashes on login', 'Battery drain is terrible', 'Crash after update, battery fine', None],
+        'score': [1, 2, 3, 5],
+        'at': pd.to_datetime(['2024-01-01 09:00', '2024-01-02 10:00', '2024-01-03 09:00', '2024-01-04 09:00']),
+    })
+
+@pytest.fixture
+def index(reviews_df):
+    return ReviewIndex.build(reviews_df, TextNormalizer({'is', 'on', 'after', 'the'}))
+
+def test_search_terms_and_or_prefix(index):
+    assert list(index.search('battery')) == [2, 1]
+    assert list(index.search('battery drain')) == [1]
+    assert list(index.search('drain OR login')) == [1, 0]
+    assert list(index.search('crash*')) == [2, 0]
+    assert list(index.search('missing')) == []
+    assert list(index.search('the')) == []
+
+def test_search_filters_by_score_and_date(index):
+    assert list(index.search(max_score=2)) == [1, 0]
+    assert list(index.search('battery', min_score=3)) == [2]
+    # A plain end date covers that whole day
+    assert list(index.search(start='2024-01-02', end='2024-01-02')) == [1]
+    assert list(index.search(limit=2)) == [3, 2]
+
+def test_index_round_trips_through_review_store(reviews_df, index, tmp_path):
+    store = ReviewStore(tmp_path / 'reviews.db')
+    index.save(store)
+    loaded = ReviewIndex.load_or_build(reviews_df, index.normalizer, store)
+    store.close()
+
+    assert loaded.fingerprint == index.fingerprint
+    assert loaded.terms == index.terms
+    assert list(loaded.search('battery', max_score=2)) == [1]
+
+def test_fingerprint_without_review_ids_depends_on_content(reviews_df, index):
+    without_ids = reviews_df.drop(columns='reviewId')
+    edited = without_ids.assign(content=without_ids['content'].str.upper())
+    assert review_fingerprint(without_ids, index.normalizer) != review_fingerprint(edited, index.normalizer)
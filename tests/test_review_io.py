@@ -0,0 +1,50 @@
+import io
+import numpy as np
+import pandas as pd
+import pytest
+from src.services.review_io import write_reviews, read_reviews, read_analysis_summary
+
+@pytest.fixture
+def reviews_df():
+    df = pd.DataFrame({
+        'reviewId': [f'r{i}' for i in range(5)],
+        'content': ['Great app', 'Bad', None, 'Okay', 'Love it'],
+        'score': [5, 1, 3, 3, 5],
+        'at': pd.date_range('2024-01-01', periods=5, freq='h'),
+        'sentiment': [0.8, -0.7, 0.0, 0.5, 0.5],
+    })
+    df['app_id'] = pd.Categorical(['com.a', 'com.a', 'com.b', 'com.b', 'com.b'])
+    return df
+
+@pytest.mark.parametrize('suffix', ['.parquet', '.arrow'])
+def test_round_trip_preserves_dtypes(reviews_df, tmp_path, suffix):
+    path = tmp_path / f'reviews{suffix}'
+    write_reviews(reviews_df, path, batch_size=2)
+
+    loaded = read_reviews(path)
+
+    pd.testing.assert_frame_equal(loaded, reviews_df, check_dtype=False)
+    assert loaded['at'].dtype.kind == 'M'
+    assert isinstance(loaded['app_id'].dtype, pd.CategoricalDtype)
+
+@pytest.mark.parametrize('format', ['parquet', 'arrow'])
+def test_buffer_export_keeps_analysis_summary(reviews_df, format):
+    analysis = {'total_reviews': 5, 'average_sentiment': 0.22, 'reviews_data': [{'ignored': True}]}
+    buffer = io.BytesIO()
+    app_insights = [{'app_id': 'com.a', 'reviews_analyzed': np.int64(2)}]
+    write_reviews(reviews_df, buffer, format=format, analysis=analysis, app_insights=app_insights)
+
+    buffer.seek(0)
+    assert len(read_reviews(buffer, format=format)) == 5
+    buffer.seek(0)
+    summary = read_analysis_summary(buffer, format=format)
+    assert summary['total_reviews'] == 5
+    assert summary['average_sentiment'] == 0.22
+    assert 'reviews_data' not in summary
+    assert summary['app_insights'] == [{'app_id': 'com.a', 'reviews_analyzed': 2}]
+
+def test_format_required_for_unknown_targets(reviews_df, tmp_path):
+    with pytest.raises(ValueError):
+        write_reviews(reviews_df, tmp_path / 'reviews.txt')
+    with pytest.raises(ValueError):
+        write_reviews(reviews_df, io.BytesIO())
@@ -0,0 +1,42 @@
+import pytest
+from datetime import datetime
+from src.services.review_store import ReviewStore
+
+@pytest.fixture
+def store(tmp_path):
+    store = ReviewStore(tmp_path / 'reviews.db')
+    yield store
+    store.close()
+
+def make_review(i):
+    return {
+        'reviewId': f'r{i}',
+        'userName': f'user{i}',
+        'content': f'Review number {i}',
+        'score': (i % 5) + 1,
+        'thumbsUpCount': i,
+        'at': datetime(2024, 1, 1, i),
+    }
+
+def test_add_reviews_ignores_duplicates(store):
+    assert store.add_reviews('com.example.app', [make_review(i) for i in range(3)]) == 3
+    assert store.add_reviews('com.example.app', [make_review(i) for i in range(5)]) == 2
+    # Same reviewId under another app is a different review
+    assert store.add_reviews('com.other.app', [make_review(0)]) == 1
+
+    assert store.count_reviews('com.example.app') == 5
+    assert store.known_review_ids('com.example.app', ['r1', 'r9']) == {'r1'}
+
+def test_reviews_round_trip_newest_first(store, tmp_path):
+    store.add_reviews('com.example.app', [make_review(i) for i in range(4)])
+    store.close()
+
+    reopened = ReviewStore(tmp_path / 'reviews.db')
+    reviews = reopened.load_reviews('com.example.app')
+
+    assert [review['reviewId'] for review in reviews] == ['r3', 'r2', 'r1', 'r0']
+    assert reviews[0]['at'] == datetime(2024, 1, 1, 3)
+    assert reviews[0]['score'] == 4
+    assert reviews[0]['thumbsUpCount'] == 3
+    assert [len(batch) for batch in reopened.iter_reviews('com.example.app', batch_size=3)] == [3, 1]
+    reopened.close()
@@ -1,6 +1,14 @@
 import pytest
+import subprocess
+import sys
+import time
+from pathlib import Path
 import pandas as pd
+from src.services.fetch_scheduler import TruncatedWalkError
+from src.services.rate_limiter import HostRateLimiter
+from src.services.review_store import ReviewStore
 from src.services.scraper_service import GooglePlayScraper
+from src.services.sentiment_aggregator import SentimentAggregator
 
 def test_extract_app_id():
     scraper = GooglePlayScraper()
@@ -56,4 +64,137 @@ def test_empty_url_list():
     
     assert isinstance(reviews_df, pd.DataFrame)
     assert reviews_df.empty
-    assert insights == []
\ No newline at end of file
+    assert insights == []
+
+def test_scrape_reviews_with_fake_backend(fake_backend):
+    scraper = GooglePlayScraper(backend=fake_backend(reviews_per_app=4))
+    urls = [f"https://play.google.com/store/apps/details?id=com.example.app{i}" for i in range(3)]
+
+    reviews_df, insights = scraper.scrape_reviews(urls)
+
+    assert len(reviews_df) == 12
+    assert [insight['app_id'] for insight in insights] == [f"com.example.app{i}" for i in range(3)]
+    assert insights[0]['reviews_analyzed'] == 4
+
+def test_concurrent_scrape_matches_sequential_and_overlaps_requests(fake_backend):
+    urls = [f"https://play.google.com/store/apps/details?id=com.example.app{i}" for i in range(8)]
+
+    sequential_backend = fake_backend(latency=0.05)
+    seq_df, seq_insights = GooglePlayScraper(max_workers=1, backend=sequential_backend).scrape_reviews(urls)
+
+    concurrent_backend = fake_backend(latency=0.05)
+    par_df, par_insights = GooglePlayScraper(max_workers=8, backend=concurrent_backend).scrape_reviews(urls)
+
+    pd.testing.assert_frame_equal(seq_df, par_df)
+    assert seq_insights == par_insights
+    # Requests of different apps overlap instead of waiting on each other
+    assert sequential_backend.max_in_flight == 1
+    assert 1 < concurrent_backend.max_in_flight <= 8
+
+def test_rate_limiter_spaces_requests():
+    limiter = HostRateLimiter(requests_per_second=20)
+
+    start = time.perf_counter()
+    for _ in range(5):
+        limiter.acquire("play.google.com")
+    elapsed = time.perf_counter() - start
+
+    # First call is free, the next four wait 50ms each
+    assert elapsed >= 0.19
+
+def test_stream_reviews_yields_fixed_size_batches(fake_backend):
+    backend = fake_backend(reviews_per_app=7)
+    scraper = GooglePlayScraper(backend=backend)
+    urls = ["https://play.google.com/store/apps/details?id=com.example.app"]
+
+    batches = list(scraper.stream_reviews(urls, batch_size=3))
+
+    assert [len(df) for _, df in batches] == [3, 3, 1]
+    details, first = batches[0]
+    assert details['app_id'] == "com.example.app"
+    assert details['total_reviews'] == 7
+    assert set(first['app_id']) == {"com.example.app"}
+    # Batches cover every review exactly once
+    review_ids = pd.concat([df for _, df in batches])['reviewId']
+    assert sorted(review_ids) == sorted(r['reviewId'] for r in backend.reviews_all("com.example.app"))
+
+def test_incremental_scrape_fetches_only_new_reviews(fake_backend, tmp_path):
+    backend = fake_backend(reviews_per_app=5)
+    store = ReviewStore(tmp_path / 'reviews.db')
+    scraper = GooglePlayScraper(backend=backend, review_store=store)
+    url = "https://play.google.com/store/apps/details?id=com.example.app"
+
+    scraper.scrape_reviews([url])
+    assert store.count_reviews("com.example.app") == 5
+
+    # Three reviews get posted before the next run
+    backend.reviews_per_app = 8
+    backend.calls.clear()
+    new_reviews = scraper.fetch_new_reviews("com.example.app", batch_size=2)
+
+    assert sorted(review['reviewId'] for review in new_reviews) == [
+        "com.example.app-5", "com.example.app-6", "com.example.app-7"
+    ]
+    # Stops on the second page, which already contains a stored review
+    assert backend.calls.count(('reviews', "com.example.app")) == 2
+
+    reviews_df, insights = scraper.scrape_reviews([url])
+    assert len(reviews_df) == 8
+    assert insights[0]['reviews_analyzed'] == 8
+    assert 'reviews_all' not in {call[0] for call in backend.calls}
+
+    # A walk cut short before the stored reviews stores nothing, so the
+    # next run fetches the missed reviews instead of skipping them
+    backend.reviews_per_app = 10
+    backend.swallow_errors = True
+    backend.fail('reviews', times=1, after=1)
+    scraper.scheduler.max_retries = 0
+    with pytest.raises(TruncatedWalkError):
+        scraper.fetch_new_reviews("com.example.app", batch_size=1)
+    assert store.count_reviews("com.example.app") == 8
+    assert len(scraper.fetch_new_reviews("com.example.app", batch_size=1)) == 2
+    store.close()
+
+def test_scraped_reviews_use_compact_dtypes(fake_backend):
+    scraper = GooglePlayScraper(backend=fake_backend(reviews_per_app=3))
+    urls = [f"https://play.google.com/store/apps/details?id=com.example.app{i}" for i in range(3)]
+
+    reviews_df, _ = scraper.scrape_reviews(urls)
+
+    assert len(reviews_df) == 9
+    assert isinstance(reviews_df['app_id'].dtype, pd.CategoricalDtype)
+    assert list(reviews_df['app_id'].cat.categories) == [f"com.example.app{i}" for i in range(3)]
+    assert reviews_df['app_id'].tolist()[::3] == [f"com.example.app{i}" for i in range(3)]
+    assert reviews_df['content'].dtype.storage == 'pyarrow'
+    assert reviews_df['reviewId'].dtype.storage == 'pyarrow'
+
+def test_url_parsing_does_not_import_heavy_dependencies():
+    code = (
+        "import sys\n"
+        "from src.services.scraper_service import GooglePlayScraper\n"
+        "url = 'https://play.google.com/store/apps/details?id=com.example.app'\n"
+        "assert GooglePlayScraper()._extract_app_id(url) == 'com.example.app'\n"
+        "assert not {'pandas', 'numpy', 'google_play_scraper'} & set(sys.modules)\n"
+    )
+    root_dir = Path(__file__).resolve().parent.parent
+    subprocess.run([sys.executable, '-c', code], cwd=root_dir, check=True)
+
+def test_deduplicated_insights():
+    from src.services.review_deduplicator import ReviewDeduplicator
+
+    text = 'Crashes every single time I try to log in with my account'
+    reviews_df = pd.DataFrame({'content': [text, text.upper(), 'Works fine'], 'score': [1, 1, 5]})
+    details = {'app_name': 'App', 'app_url': 'url', 'app_id': 'app', 'total_reviews': 3, 'app_rating': 3.0}
+
+    scraper = GooglePlayScraper(deduplicator=ReviewDeduplicator(mode='weight'))
+    weighted_df, duplicates = scraper.deduplicate(reviews_df.copy())
+    insights = scraper.build_insights(details, weighted_df, duplicates)
+    assert insights['duplicate_reviews'] == 1
+    assert insights['reviews_analyzed'] == 3
+    assert insights['negative_reviews'] == 1
+    assert insights['average_rating'] == 3.0
+    # Same row from batch-by-batch aggregates
+    metrics = SentimentAggregator().update([0.0] * 3, weighted_df['score'], weights=weighted_df['weight']).result()
+    assert scraper.build_insights(details, None, duplicates, metrics) == insights
+
+    assert GooglePlayScraper().deduplicate(reviews_df) == (reviews_df, 0)
@@ -0,0 +1,40 @@
+import math
+import numpy as np
+from collections import Counter
+from src.services.sentiment_aggregator import SentimentAggregator, exact_sum
+
+def test_merged_aggregators_match_single_pass():
+    rng = np.random.default_rng(7)
+    sentiments = rng.uniform(-1, 1, 1000)
+    ratings = rng.integers(1, 6, 1000).astype(float)
+    ratings[::50] = np.nan
+
+    whole = SentimentAggregator().update(sentiments, ratings, Counter({'crash': 3, 'login': 2}))
+
+    merged = SentimentAggregator()
+    for start in (600, 0, 300):  # Out of order on purpose
+        part = SentimentAggregator().update(sentiments[start:start + 300], ratings[start:start + 300])
+        merged.merge(part)
+    merged.update(sentiments[900:], ratings[900:], Counter({'crash': 3, 'login': 2}))
+
+    assert merged.result() == whole.result()
+    assert whole.result()['negative_reviews'] == int((ratings[~np.isnan(ratings)] <= 3).sum())
+
+def test_distribution_uses_half_open_buckets():
+    aggregator = SentimentAggregator().update([-1.0, -0.6, -0.2, 0.0, 0.2, 0.6, 0.99, 1.0])
+
+    assert aggregator.result()['sentiment_distribution'] == {
+        'Very Negative': 1,
+        'Negative': 1,
+        'Neutral': 2,
+        'Positive': 1,
+        'Very Positive': 2,
+    }
+    # 1.0 is outside every [low, high) bucket but still counts as a review
+    assert aggregator.result()['total_reviews'] == 8
+
+def test_exact_sum_is_order_independent():
+    values = np.array([1e16, 1.0, -1e16, 0.1, 0.2, -0.3])
+
+    assert exact_sum(values) == exact_sum(values[::-1])
+    assert float(exact_sum(values)) == math.fsum(values)
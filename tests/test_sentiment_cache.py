@@ -0,0 +1,26 @@
+import pytest
+from src.services.sentiment_cache import SentimentCache
+
+def test_lru_evicts_least_recently_used():
+    cache = SentimentCache(max_entries=2)
+    cache.put_many({'a': (0.1, ('a',)), 'b': (0.2, ('b',))})
+    cache.get_many(['a'])  # 'b' is now the least recently used
+    cache.put_many({'c': (0.3, ('c',))})
+
+    assert set(cache.get_many(['a', 'b', 'c'])) == {'a', 'c'}
+    stats = cache.stats()
+    assert stats['memory_entries'] == 2
+    assert (stats['hits'], stats['misses']) == (3, 1)
+
+def test_disk_tier_persists_across_instances(tmp_path):
+    path = tmp_path / 'cache.db'
+    key = SentimentCache.key('Great app', namespace='stop words')
+    first = SentimentCache(path=path)
+    first.put_many({key: (0.8, ('great', 'app'))})
+    first.close()
+
+    second = SentimentCache(path=path)
+    assert second.get_many([key]) == {key: (0.8, ('great', 'app'))}
+    assert second.stats()['disk_hits'] == 1
+    assert key != SentimentCache.key('Great app', namespace='other stop words')
+    second.close()
@@ -0,0 +1,32 @@
+import re
+from src.services.text_normalizer import TextNormalizer
+
+STOP_WORDS = {'app', 'good', 'great'}
+
+def reference_clean(text):
+    """The original regex-based cleaning, kept as the expected behaviour"""
+    text = re.sub(r'[^a-zA-Z\s]', '', text.lower())
+    return [word for word in text.split() if word not in STOP_WORDS]
+
+def test_tokenize_matches_reference_cleaning():
+    normalizer = TextNormalizer(STOP_WORDS)
+    texts = [
+        "This APP is great!!! Don't change it :)",
+        'Crashes 3 times/day... login broken',
+        'Très bien, café ☕ works',
+        'tabs\tand\nnewlines\x0b too\xa0nbsp',
+        'Ünïcödé İstanbul Kelvin',
+        '',
+    ]
+    for text in texts:
+        assert normalizer.tokenize(text) == reference_clean(text), text
+
+    assert normalizer.tokenize_batch(texts) == [reference_clean(text) for text in texts]
+
+def test_count_keeps_first_seen_order():
+    normalizer = TextNormalizer(STOP_WORDS)
+    counts = normalizer.count(normalizer.tokenize_batch(['crash login', 'login battery', 'crash']))
+
+    assert list(counts) == ['crash', 'login', 'battery']
+    assert counts['crash'] == 2
+    assert normalizer.count_texts(['crash login', 'login battery', 'crash']) == counts
@@ -0,0 +1,55 @@
+import pandas as pd
+import pytest
+from src.services.text_normalizer import TextNormalizer
+from src.services.theme_extractor import Lemmatizer, ThemeExtractor, theme_counts, theme_names
+
+@pytest.fixture
+def reviews_df():
+    battery = ['Battery drains overnight', 'The battery drain is awful', 'Battery draining fast overnight']
+    dark_mode = ['Please add dark mode', 'Dark mode missing', 'Need a dark mode option']
+    return pd.DataFrame({
+        'app_id': ['app1'] * 30 + ['app2'] * 30 + ['app2'],
+        'content': battery * 10 + dark_mode * 10 + [None],
+        'sentiment': [-0.5] * 30 + [0.3] * 30 + [0.0],
+    })
+
+def test_lemmatizer_groups_inflections_without_wordnet():
+    lemmatize = Lemmatizer(use_wordnet=False)
+    assert lemmatize('crashes') == lemmatize('crashing') == lemmatize('crashed')
+    lemmatize('crash')
+    assert lemmatize.label(lemmatize('crashes')) == 'crash'
+
+def test_extract_separates_themes_with_phrases(reviews_df):
+    extractor = ThemeExtractor(TextNormalizer(set()), n_themes=2, lemmatizer=Lemmatizer(use_wordnet=False))
+    themes = extractor.extract(reviews_df['content'])
+
+    labels = [' '.join(theme['terms']) for theme in themes['themes']]
+    assert any('dark mode' in label for label in labels)
+    assert any('battery drain' in label for label in labels)
+    assignments = themes['assignments']
+    assert len(set(assignments[:30])) == 1 and len(set(assignments[30:60])) == 1
+    assert assignments[0] != assignments[30]
+    # No text, no theme
+    assert assignments[60] == -1
+    assert [theme['reviews'] for theme in themes['themes']] == [30, 30]
+
+def test_memory_budget_samples_and_counts_by_group(reviews_df):
+    # Room for about half of the 8-review batches: every other one is fitted on
+    extractor = ThemeExtractor(
+        TextNormalizer(set()), n_themes=2, batch_size=8, memory_mb=0.002, lemmatizer=Lemmatizer(use_wordnet=False)
+    )
+    themes = extractor.extract(reviews_df['content'])
+    assert (themes['assignments'][:60] >= 0).all()
+
+    by_app = theme_counts(reviews_df, themes, 'app_id')
+    assert list(by_app.index) == ['app1', 'app2']
+    assert by_app.to_numpy().sum() == 60
+    by_sentiment = theme_counts(reviews_df, themes, 'sentiment')
+    assert by_sentiment.loc['Negative'].sum() == 30
+    assert by_sentiment.loc['Very Positive'].sum() == 0
+
+    # Themes whose labels coincide keep separate columns
+    for theme in themes['themes']:
+        theme['label'] = 'app'
+    assert theme_names(themes) == ['app', 'app (2)']
+    assert list(theme_counts(reviews_df, themes, 'app_id').sum()) == [30, 30]
@@ -0,0 +1,72 @@
+import pandas as pd
+import pytest
+from src.services.text_normalizer import TextNormalizer
+from src.services.trend_rollup import TrendRollup
+
+def make_reviews(app_id, days, version, score, sentiment, content):
+    return pd.DataFrame({
+        'app_id': app_id,
+        'at': pd.to_datetime(days),
+        'appVersion': version,
+        'score': score,
+        'sentiment': sentiment,
+        'content': content,
+    })
+
+@pytest.fixture
+def rollup():
+    rollup = TrendRollup(TextNormalizer({'the'}))
+    rollup.update(make_reviews('app1', ['2024-01-01 08:00', '2024-01-01 20:00'], '1.0', [5, 3], [0.8, -0.4], 'great app'))
+    # Later batches fold into the existing cells
+    rollup.update(make_reviews('app1', ['2024-01-09 10:00', '2024-01-10 10:00'], '1.1', [1, 2], [-0.8, -0.3], 'the crash'))
+    rollup.update(make_reviews('app2', ['2024-01-01 09:00'], None, [4], [0.1], 'fine'))
+    return rollup
+
+def test_daily_and_weekly_trends(rollup):
+    daily = rollup.trend('app1')
+    assert list(daily['reviews']) == [2, 1, 1]
+    assert daily.loc['2024-01-01', 'average_rating'] == 4.0
+    assert daily.loc['2024-01-01', 'average_sentiment'] == pytest.approx(0.2)
+    assert daily.loc['2024-01-01', 'Very Positive'] == 1
+
+    weekly = rollup.trend(freq='W')
+    assert list(weekly.index) == list(pd.to_datetime(['2024-01-01', '2024-01-08']))
+    assert list(weekly['reviews']) == [3, 2]
+    assert list(weekly['negative_reviews']) == [1, 2]
+    assert list(rollup.trend(start='2024-01-09', end='2024-01-09')['reviews']) == [1]
+
+def test_release_comparison(rollup):
+    releases = rollup.releases('app1')
+    assert list(releases.index) == ['1.0', '1.1']
+    assert releases.loc['1.1', 'average_rating'] == 1.5
+    assert releases.loc['1.1', 'rating_change'] == -2.5
+    # Reviews without a version are left out
+    assert rollup.releases('app2').empty
+
+def test_top_terms_by_range(rollup):
+    assert rollup.top_terms('app1', n=3) == {'great': 2, 'app': 2, 'crash': 2}
+    assert rollup.top_terms(start='2024-01-09') == {'crash': 2}
+    assert rollup.app_ids == ['app1', 'app2']
+
+def test_stored_rollup_adds_only_new_reviews(tmp_path):
+    from src.services.review_store import ReviewStore
+
+    store = ReviewStore(tmp_path / 'reviews.db')
+    normalizer = TextNormalizer({'the'})
+    old = make_reviews('app1', ['2024-01-01 08:00', '2024-01-02 08:00'], '1.0', [5, 3], [0.8, -0.4], 'great app')
+    old['reviewId'] = ['a', 'b']
+    first = TrendRollup.load_or_build('app1', old, normalizer, store, settings='textblob')
+
+    new = make_reviews('app1', ['2024-01-02 08:00', '2024-01-03 08:00'], '1.1', [1, 2], [-0.8, -0.3], 'the crash')
+    new['reviewId'] = ['c', 'd']
+    # A later run sees every stored review again; only c and d are new
+    second = TrendRollup.load_or_build('app1', pd.concat([new, old], ignore_index=True), normalizer, store, settings='textblob')
+
+    assert first.trend('app1')['reviews'].sum() == 2
+    assert list(second.trend('app1')['reviews']) == [1, 2, 1]
+    assert second.top_terms('app1', n=2) == {'great': 2, 'app': 2}
+    assert second.latest_ids == {'d'}
+    # Other settings do not reuse the stored rollup
+    other = TrendRollup.load_or_build('app1', old, normalizer, store, settings='lexicon')
+    assert other.trend('app1')['reviews'].sum() == 2
+    store.close()
@@ -0,0 +1,24 @@
+from collections import Counter
+from src.services.wordcloud_renderer import WordCloudRenderer
+
+def test_render_caches_by_top_words_and_options():
+    renderer = WordCloudRenderer(width=200, height=100, max_words=3)
+    frequencies = Counter({'crash': 9, 'login': 7, 'battery': 5, 'dark': 1})
+
+    first = renderer.render(frequencies)
+    # A rarer word outside the top 3 does not change the picture
+    second = renderer.render(frequencies + Counter({'mode': 1}))
+
+    assert first and second == first
+    assert renderer.stats() == {'hits': 1, 'misses': 1, 'cached_images': 1}
+
+    other = WordCloudRenderer(width=200, height=100, max_words=3, colormap='magma')
+    assert other.fingerprint(other.top_words(frequencies)) != renderer.fingerprint(renderer.top_words(frequencies))
+
+def test_top_words_skip_filler_words():
+    renderer = WordCloudRenderer(max_words=2)
+
+    assert renderer.top_words({'the': 50, 'crash': 3, 'and': 20, 'login': 3, 'ads': 1}) == [
+        ('crash', 3), ('login', 3)
+    ]
+    assert renderer.render({'the': 5, 'and': 2}) == ''